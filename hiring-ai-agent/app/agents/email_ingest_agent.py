@@ -1,27 +1,259 @@
 """
 Email Ingest Agent - Automatically fetch and process resumes from email.
 """
+import base64
+import binascii
 import imaplib
 import email
+import email.utils
+import quopri
 from email.header import decode_header
+from email.parser import BytesHeaderParser, BytesParser
 import re
 import os
+import queue
+import select
+import ssl
 import tempfile
-from typing import List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, List, Optional, Tuple, Union
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
+from urllib.parse import unquote
+from datetime import datetime, timezone
 
 from app.utils.logger import get_logger
+from app.utils.regex_utils import compile_pattern
 
 logger = get_logger(__name__)
 
+# Servers may drop an IDLE session after 30 minutes (RFC 2177), so re-issue it before then
+IDLE_REFRESH_SECONDS = 29 * 60
+
+# Message ids per batched FETCH; keeps command lines well under server limits
+FETCH_BATCH_SIZE = 200
+
+_HEADER_FETCH_ITEMS = '(BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)])'
+
+# Tokens of an IMAP response: parens, quoted strings and atoms. Atoms may carry
+# a section spec such as BODY[HEADER.FIELDS (SUBJECT)] and a partial suffix <0>.
+_IMAP_TOKEN_RE = re.compile(
+    rb'\s*(?:(?P<open>\()|(?P<close>\))|"(?P<quoted>(?:[^"\\]|\\.)*)"'
+    rb'|(?P<atom>[^\s()"\[]+(?:\[[^\]]*\])?(?:<\d+>)?))'
+)
+_LITERAL_SUFFIX_RE = re.compile(rb'\{\d+\}$')
+_OPEN = object()
+_CLOSE = object()
+
+
+def _tokenize_imap(chunk: bytes, tokens: list) -> None:
+    """Append tokens from a raw response chunk; atoms become str, strings bytes."""
+    pos = 0
+    while pos < len(chunk):
+        match = _IMAP_TOKEN_RE.match(chunk, pos)
+        if not match:
+            break
+        pos = match.end()
+        if match.group('open'):
+            tokens.append(_OPEN)
+        elif match.group('close'):
+            tokens.append(_CLOSE)
+        elif match.group('quoted') is not None:
+            tokens.append(re.sub(rb'\\(.)', rb'\1', match.group('quoted')))
+        else:
+            atom = match.group('atom').decode('ascii', errors='replace')
+            tokens.append(None if atom.upper() == 'NIL' else atom)
+
+
+def _parse_fetch_response(data: list) -> List[Tuple[str, dict]]:
+    """
+    Parse the data returned by imaplib's fetch into (sequence number, items) pairs.
+    
+    imaplib hands back literals as (prefix, bytes) tuples, so the literal is
+    spliced into the token stream in place of its {n} marker.
+    
+    Args:
+        data: Raw data list from IMAP4.fetch
+        
+    Returns:
+        List of (sequence number, {ITEM NAME: value}) tuples
+    """
+    tokens = []
+    for item in data:
+        if isinstance(item, tuple):
+            _tokenize_imap(_LITERAL_SUFFIX_RE.sub(b'', item[0].rstrip()), tokens)
+            tokens.append(item[1])
+        elif isinstance(item, bytes):
+            _tokenize_imap(item, tokens)
+    
+    stack = [[]]
+    for token in tokens:
+        if token is _OPEN:
+            stack.append([])
+        elif token is _CLOSE:
+            if len(stack) > 1:
+                done = stack.pop()
+                stack[-1].append(done)
+        else:
+            stack[-1].append(token)
+    
+    top = stack[0]
+    results = []
+    for i in range(len(top) - 1):
+        seq, attrs = top[i], top[i + 1]
+        if isinstance(seq, str) and seq.isdigit() and isinstance(attrs, list):
+            items = {}
+            for j in range(0, len(attrs) - 1, 2):
+                if isinstance(attrs[j], str):
+                    items[attrs[j].upper()] = attrs[j + 1]
+            results.append((seq, items))
+    
+    return results
+
+
+@lru_cache(maxsize=4096)
+def _decode_header_value(header: str) -> str:
+    """
+    Decode an RFC 2047 header value, caching results for repeat senders/filenames.
+    
+    Args:
+        header: Raw header value
+        
+    Returns:
+        Decoded header text
+    """
+    # Plain ASCII headers carry no encoded-words; skip the decoder entirely
+    if '=?' not in header:
+        return header
+    
+    decoded_parts = decode_header(header)
+    result = []
+    
+    for part, encoding in decoded_parts:
+        if isinstance(part, bytes):
+            try:
+                result.append(part.decode(encoding or 'utf-8'))
+            except:
+                result.append(part.decode('utf-8', errors='ignore'))
+        else:
+            result.append(part)
+    
+    return ''.join(result)
+
+
+def _decode_transfer_encoding(raw: bytes, encoding: str) -> bytes:
+    """
+    Undo a part's Content-Transfer-Encoding without building an email.message.
+    
+    Args:
+        raw: Encoded part body as returned by BODY[n]
+        encoding: Transfer encoding from BODYSTRUCTURE (lowercase)
+        
+    Returns:
+        Decoded payload
+    """
+    if encoding == 'base64':
+        try:
+            return base64.b64decode(raw)
+        except binascii.Error:
+            # Tolerate missing padding / stray characters like the email package does
+            return base64.b64decode(re.sub(rb'[^A-Za-z0-9+/]', b'', raw) + b'==')
+    if encoding == 'quoted-printable':
+        return quopri.decodestring(raw)
+    return raw
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse an RFC 2822 Date header, memoizing results (failures included).
+    
+    Args:
+        date_str: Raw Date header value
+        
+    Returns:
+        Parsed datetime, or None if the header is missing or malformed
+    """
+    try:
+        return email.utils.parsedate_to_datetime(date_str)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _format_sender(from_values: List[str]) -> str:
+    """
+    Build a "Name <address>" sender string from raw From header values.
+    
+    Args:
+        from_values: Values of every From header (usually one)
+        
+    Returns:
+        Sender string, or just the address when there is no display name
+    """
+    name, addr = (email.utils.getaddresses([str(v) for v in from_values]) or [('', '')])[0]
+    if name:
+        name = _decode_header_value(name)
+        return f"{name} <{addr}>"
+    return addr
+
+
+def _is_pdf_filename(filename: str) -> bool:
+    """Check for a .pdf extension, lowercasing only the last four characters."""
+    return filename[-4:].lower() == '.pdf'
+
+
+def _imap_str(value) -> str:
+    """Coerce a parsed IMAP value (atom, string or NIL) to str."""
+    if value is None:
+        return ''
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return str(value)
+
+
+def _imap_params(value) -> dict:
+    """Turn an IMAP parameter list ("NAME" "value" ...) into a lowercase-keyed dict."""
+    if not isinstance(value, list):
+        return {}
+    return {
+        _imap_str(value[i]).lower(): _imap_str(value[i + 1])
+        for i in range(0, len(value) - 1, 2)
+    }
+
 
 @dataclass
 class EmailAttachment:
-    """Represents an email attachment."""
+    """
+    Represents an email attachment.
+    
+    The decoded payload is spooled to a temp file at `path` rather than held in
+    memory; consumers read the file (see ResumeIngestionWorkflow.process_resume_path).
+    """
     filename: str
-    content: bytes
     content_type: str
+    path: Optional[str] = None
+    
+    @classmethod
+    def spool(cls, filename: str, content: bytes, content_type: str) -> "EmailAttachment":
+        """Write a decoded payload to a temp file and return an attachment pointing at it."""
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        try:
+            os.write(fd, content)
+        finally:
+            os.close(fd)
+        return cls(filename=filename, content_type=content_type, path=path)
+    
+    def cleanup(self):
+        """Delete the temp file."""
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
 
 
 @dataclass
@@ -48,7 +280,11 @@ class EmailIngestAgent:
         email_address: Optional[str],
         email_password: Optional[str],
         folder: str = "INBOX",
-        subject_pattern: str = r"^JOB\s*-\s*(.+?)\s*-\s*APPLICATION$"
+        subject_pattern: Union[str, Any] = r"^JOB\s*-\s*(.+?)\s*-\s*APPLICATION$",
+        subject_search_terms: Tuple[str, ...] = ("JOB", "APPLICATION"),
+        pool_size: int = 3,
+        database=None,
+        processed_retention_days: int = 30
     ):
         """
         Initialize Email Ingest Agent.
@@ -58,15 +294,42 @@ class EmailIngestAgent:
             email_address: Email address to monitor
             email_password: Email password or app password
             folder: Email folder to monitor
-            subject_pattern: Regex pattern to match job application emails
+            subject_pattern: Regex pattern (or precompiled pattern) to match job
+                application emails; group 1 is the job title
+            subject_search_terms: Substrings passed to IMAP SEARCH SUBJECT so the
+                server pre-filters candidates; must be a superset of subject_pattern
+            pool_size: IMAP sessions used to download attachments in parallel
+                (1 downloads serially over the main session)
+            database: Optional DatabaseStore; its email_log remembers processed
+                Message-IDs across restarts
+            processed_retention_days: How long processed Message-IDs are remembered
         """
         self.imap_server = imap_server
         self.email_address = email_address
         self.email_password = email_password
         self.folder = folder
-        self.subject_pattern = re.compile(subject_pattern, re.IGNORECASE)
+        self.subject_pattern = (
+            compile_pattern(subject_pattern, ignore_case=True)
+            if isinstance(subject_pattern, str) else subject_pattern
+        )
+        self.subject_search_terms = tuple(subject_search_terms)
         
         self._connection = None
+        # Guards the shared IMAP session; imaplib connections are not thread-safe
+        self._lock = threading.RLock()
+        self._stop_idle = threading.Event()
+        
+        # Extra sessions for parallel attachment downloads, opened on demand
+        self.pool_size = max(1, pool_size)
+        self._pool: "queue.Queue[imaplib.IMAP4_SSL]" = queue.Queue()
+        self._pool_lock = threading.Lock()
+        self._pool_open = 0
+        
+        # The store's email_log (with its in-memory Message-ID set) remembers
+        # mail already handed to a callback, so re-exposed mail is skipped
+        self.db = database
+        self.processed_retention_days = processed_retention_days
+        self._last_prune = 0.0
     
     def is_configured(self) -> bool:
         """Check if email ingestion is properly configured."""
@@ -83,25 +346,101 @@ class EmailIngestAgent:
             logger.warning("Email ingestion not configured")
             return False
         
-        try:
-            self._connection = imaplib.IMAP4_SSL(self.imap_server)
-            self._connection.login(self.email_address, self.email_password)
-            self._connection.select(self.folder)
-            logger.info(f"Connected to {self.imap_server}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to email: {e}")
-            self._connection = None
-            return False
+        with self._lock:
+            try:
+                self._connection = self._open_connection()
+                logger.info(f"Connected to {self.imap_server}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to connect to email: {e}")
+                self._connection = None
+                return False
     
     def disconnect(self):
         """Disconnect from the IMAP server."""
-        if self._connection:
+        with self._lock:
+            if self._connection:
+                try:
+                    self._connection.logout()
+                except:
+                    pass
+                self._connection = None
+        
+        with self._pool_lock:
+            while True:
+                try:
+                    conn = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    conn.logout()
+                except:
+                    pass
+                self._pool_open -= 1
+    
+    def _open_connection(self) -> imaplib.IMAP4_SSL:
+        """Open a logged-in IMAP session with the monitored folder selected."""
+        conn = imaplib.IMAP4_SSL(self.imap_server)
+        conn.login(self.email_address, self.email_password)
+        conn.select(self.folder)
+        return conn
+    
+    @contextmanager
+    def _borrow(self):
+        """
+        Borrow a pooled IMAP session, opening one if the pool is not yet full.
+        
+        Sessions that fail with a connection error are discarded instead of
+        being returned to the pool.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._pool_open < self.pool_size
+                if create:
+                    self._pool_open += 1
+            
+            if create:
+                try:
+                    conn = self._open_connection()
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_open -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        
+        try:
+            yield conn
+        except (imaplib.IMAP4.abort, OSError):
+            with self._pool_lock:
+                self._pool_open -= 1
             try:
-                self._connection.logout()
-            except:
+                conn.shutdown()
+            except Exception:
                 pass
-            self._connection = None
+            raise
+        else:
+            self._pool.put(conn)
+    
+    def _ensure_connection(self) -> bool:
+        """
+        Reuse the open IMAP session, reconnecting once if the server dropped it.
+        
+        Returns:
+            True if a usable connection is available
+        """
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._connection.noop()
+                    return True
+                except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError) as e:
+                    logger.info(f"IMAP session lost ({e}), reconnecting")
+                    self._connection = None
+            
+            return self.connect()
     
     def fetch_unread_applications(self) -> List[ProcessedEmail]:
         """
@@ -110,75 +449,357 @@ class EmailIngestAgent:
         Returns:
             List of ProcessedEmail objects
         """
-        if not self._connection:
-            if not self.connect():
+        with self._lock:
+            if not self._ensure_connection():
                 return []
-        
-        try:
-            # Search for unread emails
-            status, messages = self._connection.search(None, 'UNSEEN')
-            if status != 'OK':
-                logger.warning("Failed to search emails")
+            
+            try:
+                # Let the server pre-filter unread mail by subject so unrelated
+                # messages are never downloaded
+                status, messages = self._connection.uid(
+                    'SEARCH', None, *self._build_search_criteria()
+                )
+                if status != 'OK':
+                    logger.warning("Failed to search emails")
+                    return []
+                
+                # UIDs rather than sequence numbers, since the pooled sessions
+                # need stable message identifiers
+                email_ids = messages[0].split()
+                processed_emails = []
+                
+                for start in range(0, len(email_ids), FETCH_BATCH_SIZE):
+                    processed_emails.extend(
+                        self._fetch_batch(email_ids[start:start + FETCH_BATCH_SIZE])
+                    )
+                
+                logger.info(f"Found {len(processed_emails)} job application emails")
+                return processed_emails
+                
+            except (imaplib.IMAP4.abort, OSError) as e:
+                # Drop the broken session so the next poll reconnects
+                logger.error(f"IMAP connection lost while fetching emails: {e}")
+                self._connection = None
                 return []
+            except Exception as e:
+                logger.error(f"Error fetching emails: {e}")
+                return []
+    
+    def _build_search_criteria(self) -> List[str]:
+        """Build IMAP SEARCH criteria for unread application emails."""
+        criteria = ['UNSEEN']
+        for term in self.subject_search_terms:
+            escaped = term.replace('\\', '\\\\').replace('"', '\\"')
+            criteria.extend(['SUBJECT', f'"{escaped}"'])
+        return criteria
+    
+    def _fetch_batch(self, email_ids: List[bytes]) -> List[ProcessedEmail]:
+        """
+        Fetch headers and MIME structure for many emails in one round-trip,
+        then download only the PDF parts of matching applications.
+        
+        Attachment downloads are spread across the session pool when
+        pool_size > 1.
+        
+        Args:
+            email_ids: Email UIDs from IMAP SEARCH
             
-            email_ids = messages[0].split()
-            processed_emails = []
+        Returns:
+            List of ProcessedEmail objects
+        """
+        status, data = self._connection.uid(
+            'FETCH', b','.join(email_ids).decode(), _HEADER_FETCH_ITEMS
+        )
+        if status != 'OK':
+            logger.warning("Failed to fetch email headers")
+            return []
+        
+        jobs = []
+        for _, items in _parse_fetch_response(data):
+            uid = _imap_str(items.get('UID'))
+            if not uid:
+                continue
+            header_bytes = next(
+                (v for k, v in items.items() if k.startswith('BODY[HEADER')), None
+            )
+            jobs.append((uid, items.get('BODYSTRUCTURE'), header_bytes))
+        
+        if self.pool_size <= 1 or len(jobs) <= 1:
+            results = [self._process_fetched(self._connection, *job) for job in jobs]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(jobs))) as executor:
+                results = list(executor.map(lambda job: self._process_pooled(*job), jobs))
+        
+        return [processed for processed in results if processed]
+    
+    def _process_pooled(
+        self,
+        uid: str,
+        structure: Optional[list],
+        header_bytes: Optional[bytes]
+    ) -> Optional[ProcessedEmail]:
+        """Process one email on a borrowed session, retrying once on a dropped connection."""
+        for attempt in range(2):
+            try:
+                with self._borrow() as conn:
+                    return self._process_fetched(conn, uid, structure, header_bytes)
+            except (imaplib.IMAP4.abort, OSError) as e:
+                if attempt:
+                    logger.error(f"Error processing email {uid}: {e}")
+            except Exception as e:
+                logger.error(f"Error processing email {uid}: {e}")
+                return None
+        return None
+    
+    def _process_fetched(
+        self,
+        conn: imaplib.IMAP4,
+        uid: str,
+        structure: Optional[list],
+        header_bytes: Optional[bytes]
+    ) -> Optional[ProcessedEmail]:
+        """
+        Process one email from its pre-fetched headers and BODYSTRUCTURE.
+        
+        Args:
+            conn: IMAP session to download attachments with
+            uid: Message UID
+            structure: Parsed BODYSTRUCTURE, if the server returned one
+            header_bytes: Raw header block, if the server returned one
             
-            for email_id in email_ids:
-                processed = self._process_email(email_id)
-                if processed:
-                    processed_emails.append(processed)
+        Returns:
+            ProcessedEmail or None if not a job application
+        """
+        try:
+            if not isinstance(structure, list) or header_bytes is None:
+                # Unexpected server reply; fall back to a full download
+                return self._process_email(conn, uid)
+            return self._process_structure(conn, uid, structure, header_bytes)
+        except (imaplib.IMAP4.abort, OSError):
+            raise
+        except Exception as e:
+            logger.error(f"Error processing email {uid}: {e}")
+            return None
+    
+    def _process_structure(
+        self,
+        conn: imaplib.IMAP4,
+        uid: str,
+        structure: list,
+        header_bytes: Optional[bytes]
+    ) -> Optional[ProcessedEmail]:
+        """
+        Build a ProcessedEmail from pre-fetched headers and BODYSTRUCTURE.
+        
+        Args:
+            conn: IMAP session to download attachments with
+            uid: Message UID
+            structure: Parsed BODYSTRUCTURE
+            header_bytes: Raw Subject/From/Date/Message-ID header block
             
-            logger.info(f"Found {len(processed_emails)} job application emails")
-            return processed_emails
+        Returns:
+            ProcessedEmail or None if not a job application
+        """
+        headers = BytesHeaderParser().parsebytes(header_bytes or b'')
+        
+        subject = self._decode_header(headers['Subject'])
+        match = self.subject_pattern.match(subject.strip())
+        if not match:
+            logger.debug(f"Email '{subject}' doesn't match application pattern")
+            return None
+        
+        if self._is_processed(headers.get('Message-ID')):
+            # Re-exposed as UNSEEN (e.g. after a failed run); don't ingest twice
+            conn.uid('STORE', uid, '+FLAGS', '(\\Seen)')
+            logger.info(f"Skipping already processed email {headers.get('Message-ID')}")
+            return None
+        
+        job_title = match.group(1).strip()
+        message_id = headers.get('Message-ID', uid)
+        sender = _format_sender(headers.get_all('From', []))
+        
+        received_at = _parse_date(headers.get('Date', '')) or datetime.now(timezone.utc)
+        
+        pdf_parts = self._find_pdf_parts(structure)
+        if not pdf_parts:
+            # Flag it so the same application is not re-inspected every poll
+            conn.uid('STORE', uid, '+FLAGS', '(\\Seen)')
+            logger.warning(f"No PDF attachments in email from {sender}")
+            return None
+        
+        attachments = self._extract_attachments_from_structure(conn, uid, pdf_parts)
+        if not attachments:
+            logger.warning(f"No PDF attachments in email from {sender}")
+            return None
+        
+        return ProcessedEmail(
+            message_id=message_id,
+            subject=subject,
+            sender=sender,
+            job_title=job_title,
+            attachments=attachments,
+            received_at=received_at
+        )
+    
+    def _find_pdf_parts(self, structure: list, section: str = '') -> List[Tuple[str, str, str, str]]:
+        """
+        Walk a parsed BODYSTRUCTURE and locate PDF attachments.
+        
+        Args:
+            structure: Parsed BODYSTRUCTURE (sub)tree
+            section: IMAP part number of this body ('' for the message root)
             
-        except Exception as e:
-            logger.error(f"Error fetching emails: {e}")
+        Returns:
+            List of (part number, filename, content type, transfer encoding)
+        """
+        if structure and isinstance(structure[0], list):
+            # multipart: children first, then the subtype and extension data
+            parts = []
+            for index, child in enumerate(structure, start=1):
+                if not isinstance(child, list):
+                    break
+                child_section = f"{section}.{index}" if section else str(index)
+                parts.extend(self._find_pdf_parts(child, child_section))
+            return parts
+        
+        if len(structure) < 7:
+            return []
+        
+        part = section or '1'
+        content_type = f"{_imap_str(structure[0])}/{_imap_str(structure[1])}".lower()
+        
+        if content_type == 'message/rfc822' and len(structure) > 8 and isinstance(structure[8], list):
+            inner = structure[8]
+            inner_section = part if inner and isinstance(inner[0], list) else f"{part}.1"
+            return self._find_pdf_parts(inner, inner_section)
+        
+        params = _imap_params(structure[2])
+        encoding = _imap_str(structure[5]).lower()
+        
+        disposition, disposition_params = '', {}
+        for ext in structure[7:]:
+            if isinstance(ext, list) and len(ext) == 2 and isinstance(ext[0], (str, bytes)):
+                disposition = _imap_str(ext[0]).lower()
+                disposition_params = _imap_params(ext[1])
+                break
+        
+        if 'attachment' not in disposition and content_type != 'application/pdf':
+            return []
+        
+        if 'filename*' in disposition_params:
+            # charset'language'percent-encoded-value (RFC 2231)
+            charset, _, value = email.utils.decode_rfc2231(disposition_params['filename*'])
+            try:
+                filename = unquote(value, encoding=charset or 'utf-8', errors='replace')
+            except LookupError:
+                filename = unquote(value, errors='replace')
+        else:
+            # Plain parameters may still carry RFC 2047 encoded-words (Outlook does this)
+            filename = self._decode_header(
+                disposition_params.get('filename') or params.get('name', '')
+            )
+        
+        if not filename or not _is_pdf_filename(filename):
             return []
+        
+        return [(part, filename, content_type, encoding)]
     
-    def _process_email(self, email_id: bytes) -> Optional[ProcessedEmail]:
+    def _extract_attachments_from_structure(
+        self,
+        conn: imaplib.IMAP4,
+        uid: str,
+        pdf_parts: List[Tuple[str, str, str, str]]
+    ) -> List[EmailAttachment]:
         """
-        Process a single email.
+        Download only the given MIME parts of a message in a single FETCH.
+        
+        Uses BODY[] rather than BODY.PEEK[] so the message is flagged as seen.
+        Payloads are decoded directly, so the message is never parsed with the
+        email package; _extract_attachments remains for the full-download fallback.
         
         Args:
-            email_id: Email ID from IMAP
+            conn: IMAP session to download with
+            uid: Message UID
+            pdf_parts: Output of _find_pdf_parts
             
         Returns:
-            ProcessedEmail or None if not a job application
+            List of EmailAttachment objects
         """
-        try:
-            status, msg_data = self._connection.fetch(email_id, '(RFC822)')
-            if status != 'OK':
-                return None
+        sections = ' '.join(f'BODY[{part}]' for part, _, _, _ in pdf_parts)
+        status, data = conn.uid('FETCH', uid, f'({sections})')
+        if status != 'OK':
+            return []
+        
+        items = {}
+        for _, fetched in _parse_fetch_response(data):
+            items.update(fetched)
+        
+        attachments = []
+        for part, filename, content_type, encoding in pdf_parts:
+            raw = items.get(f'BODY[{part}]')
+            if not raw:
+                continue
             
-            raw_email = msg_data[0][1]
-            msg = email.message_from_bytes(raw_email)
+            content = _decode_transfer_encoding(raw, encoding)
             
-            # Get message ID
-            message_id = msg.get('Message-ID', str(email_id))
+            if content:
+                attachments.append(EmailAttachment.spool(filename, content, content_type))
+        
+        return attachments
+    
+    def _process_email(self, conn: imaplib.IMAP4, uid: str) -> Optional[ProcessedEmail]:
+        """
+        Process a single email by downloading it in full.
+        
+        Fallback for messages whose BODYSTRUCTURE could not be parsed.
+        
+        Args:
+            conn: IMAP session to download with
+            uid: Message UID
             
-            # Decode subject
-            subject = self._decode_header(msg['Subject'])
+        Returns:
+            ProcessedEmail or None if not a job application
+        """
+        try:
+            # Confirm the subject from headers alone before downloading the body;
+            # PEEK keeps non-matching mail unread
+            status, header_data = conn.uid(
+                'FETCH', uid, '(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)])'
+            )
+            if status != 'OK' or not header_data or not isinstance(header_data[0], tuple):
+                return None
             
-            # Check if subject matches our pattern
+            headers = BytesHeaderParser().parsebytes(header_data[0][1])
+            subject = self._decode_header(headers['Subject'])
             match = self.subject_pattern.match(subject.strip())
             if not match:
                 logger.debug(f"Email '{subject}' doesn't match application pattern")
                 return None
             
+            if self._is_processed(headers.get('Message-ID')):
+                conn.uid('STORE', uid, '+FLAGS', '(\\Seen)')
+                logger.info(f"Skipping already processed email {headers.get('Message-ID')}")
+                return None
+            
+            status, msg_data = conn.uid('FETCH', uid, '(RFC822)')
+            if status != 'OK':
+                return None
+            
+            raw_email = msg_data[0][1]
+            
+            # The peeked headers already hold everything needed besides the body
+            message_id = headers.get('Message-ID', uid)
+            
             job_title = match.group(1).strip()
             
             # Get sender
-            sender = self._decode_header(msg['From'])
+            sender = _format_sender(headers.get_all('From', []))
             
             # Get date
-            date_str = msg.get('Date', '')
-            try:
-                received_at = email.utils.parsedate_to_datetime(date_str)
-            except:
-                received_at = datetime.utcnow()
+            received_at = _parse_date(headers.get('Date', '')) or datetime.now(timezone.utc)
             
             # Extract PDF attachments
+            msg = BytesParser().parsebytes(raw_email)
             attachments = self._extract_attachments(msg)
             
             if not attachments:
@@ -194,8 +815,10 @@ class EmailIngestAgent:
                 received_at=received_at
             )
             
+        except (imaplib.IMAP4.abort, OSError):
+            raise
         except Exception as e:
-            logger.error(f"Error processing email {email_id}: {e}")
+            logger.error(f"Error processing email {uid}: {e}")
             return None
     
     def _decode_header(self, header: str) -> str:
@@ -203,19 +826,7 @@ class EmailIngestAgent:
         if not header:
             return ""
         
-        decoded_parts = decode_header(header)
-        result = []
-        
-        for part, encoding in decoded_parts:
-            if isinstance(part, bytes):
-                try:
-                    result.append(part.decode(encoding or 'utf-8'))
-                except:
-                    result.append(part.decode('utf-8', errors='ignore'))
-            else:
-                result.append(part)
-        
-        return ''.join(result)
+        return _decode_header_value(str(header))
     
     def _extract_attachments(self, msg: email.message.Message) -> List[EmailAttachment]:
         """
@@ -235,27 +846,27 @@ class EmailIngestAgent:
             
             # Check for PDF attachment
             if 'attachment' in content_disposition or content_type == 'application/pdf':
+                # get_filename() already collapses RFC 2231 values
                 filename = part.get_filename()
                 
                 if filename:
-                    filename = self._decode_header(filename)
+                    if '=?' in filename:
+                        filename = self._decode_header(filename)
                     
                     # Only process PDF files
-                    if filename.lower().endswith('.pdf'):
+                    if _is_pdf_filename(filename):
                         content = part.get_payload(decode=True)
                         
                         if content:
-                            attachments.append(EmailAttachment(
-                                filename=filename,
-                                content=content,
-                                content_type=content_type
-                            ))
+                            attachments.append(
+                                EmailAttachment.spool(filename, content, content_type)
+                            )
         
         return attachments
     
     def save_attachment_temp(self, attachment: EmailAttachment) -> str:
         """
-        Save attachment to a temporary file.
+        Get the temporary file holding an attachment.
         
         Args:
             attachment: EmailAttachment object
@@ -263,13 +874,7 @@ class EmailIngestAgent:
         Returns:
             Path to temporary file
         """
-        fd, path = tempfile.mkstemp(suffix='.pdf')
-        try:
-            os.write(fd, attachment.content)
-        finally:
-            os.close(fd)
-        
-        return path
+        return attachment.path
     
     def mark_as_read(self, message_id: str):
         """
@@ -286,7 +891,8 @@ class EmailIngestAgent:
         Poll for new emails and process them with a callback.
         
         Args:
-            callback: Function to call for each (job_title, pdf_bytes) pair
+            callback: Called with job_title, pdf_path (the spooled attachment,
+                deleted once the callback returns), filename, sender and message_id
             
         Returns:
             Number of resumes processed
@@ -295,22 +901,200 @@ class EmailIngestAgent:
             logger.info("Email ingestion not configured, skipping poll")
             return 0
         
+        self._prune_processed()
+        
         emails = self.fetch_unread_applications()
         processed_count = 0
         
         for email_data in emails:
+            delivered = False
             for attachment in email_data.attachments:
                 try:
                     callback(
                         job_title=email_data.job_title,
-                        pdf_bytes=attachment.content,
+                        pdf_path=attachment.path,
                         filename=attachment.filename,
                         sender=email_data.sender,
                         message_id=email_data.message_id
                     )
                     processed_count += 1
+                    delivered = True
                 except Exception as e:
                     logger.error(f"Error processing attachment {attachment.filename}: {e}")
+                finally:
+                    attachment.cleanup()
+            
+            if delivered:
+                self._mark_processed(email_data)
         
-        self.disconnect()
+        # The session is kept open so the next poll skips the TLS handshake and LOGIN
         return processed_count
+    
+    def _is_processed(self, message_id: Optional[str]) -> bool:
+        """Check whether a Message-ID was already delivered to a callback."""
+        if not message_id or self.db is None:
+            return False
+        return self.db.is_email_processed(message_id)
+    
+    def _mark_processed(self, email_data: ProcessedEmail):
+        """Remember a delivered email in the email log."""
+        if self.db is None:
+            return
+        try:
+            self.db.log_email(
+                message_id=email_data.message_id,
+                subject=email_data.subject,
+                sender=email_data.sender,
+                status="processed"
+            )
+        except Exception as e:
+            logger.warning(f"Failed to log processed email {email_data.message_id}: {e}")
+    
+    def _prune_processed(self):
+        """Forget processed Message-IDs past the retention window, at most once a day."""
+        if time.monotonic() - self._last_prune < 24 * 3600 and self._last_prune:
+            return
+        self._last_prune = time.monotonic()
+        
+        if self.db is not None:
+            try:
+                removed = self.db.prune_email_log(self.processed_retention_days)
+                if removed:
+                    logger.info(f"Pruned {removed} old email log entries")
+            except Exception as e:
+                logger.warning(f"Failed to prune email log: {e}")
+    
+    def idle_loop(self, callback, timeout: int = IDLE_REFRESH_SECONDS) -> None:
+        """
+        Process new applications as the server announces them via IMAP IDLE.
+        
+        Blocks until stop_idle() is called. IDLE runs on a dedicated IMAP
+        session, so fetches over the shared session are not held up meanwhile.
+        The IDLE command is refreshed every `timeout` seconds so the server
+        does not drop the session.
+        
+        Args:
+            callback: Same callback accepted by poll_and_process
+            timeout: Seconds to wait before re-issuing IDLE
+        """
+        if not self.is_configured():
+            logger.info("Email ingestion not configured, skipping IDLE")
+            return
+        
+        self._stop_idle.clear()
+        
+        # Pick up anything that arrived before we started listening
+        self.poll_and_process(callback)
+        
+        # IDLE runs on its own session so the shared one (and its lock) stays
+        # free for fetch_unread_applications while we wait
+        conn = None
+        try:
+            while not self._stop_idle.is_set():
+                try:
+                    if conn is None:
+                        conn = self._open_connection()
+                    
+                    if self._idle_wait(conn, timeout):
+                        self.poll_and_process(callback)
+                        
+                except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError) as e:
+                    connected = conn is not None
+                    logger.warning(f"IMAP IDLE interrupted: {e}")
+                    if conn is not None:
+                        try:
+                            conn.shutdown()
+                        except Exception:
+                            pass
+                        conn = None
+                    # Back off longer when the session could not be opened at all
+                    self._stop_idle.wait(5 if connected else 30)
+        finally:
+            if conn is not None:
+                try:
+                    conn.logout()
+                except Exception:
+                    pass
+    
+    def stop_idle(self):
+        """Ask a running idle_loop to return."""
+        self._stop_idle.set()
+    
+    def _idle_wait(self, conn: imaplib.IMAP4, timeout: float) -> bool:
+        """
+        Issue IDLE and wait until the server reports new mail or the timeout expires.
+        
+        Args:
+            conn: IMAP session to idle on (not shared with other threads)
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if new messages were announced
+        """
+        # Python 3.14+ ships native IDLE support
+        if hasattr(conn, 'idle'):
+            with conn.idle(duration=timeout) as responses:
+                for typ, _ in responses:
+                    if typ in ('EXISTS', 'RECENT'):
+                        return True
+                    if self._stop_idle.is_set():
+                        break
+            return False
+        
+        tag = conn._new_tag()
+        conn.send(tag + b' IDLE\r\n')
+        if not conn.readline().startswith(b'+'):
+            raise imaplib.IMAP4.error("Server rejected IDLE")
+        
+        has_new = False
+        deadline = time.monotonic() + timeout
+        try:
+            while not self._stop_idle.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                # Short select slices keep stop_idle() responsive
+                if not self._has_pending_input(conn):
+                    readable, _, _ = select.select([conn.sock], [], [], min(remaining, 1.0))
+                    if not readable:
+                        continue
+                
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                if line.rstrip().endswith((b'EXISTS', b'RECENT')):
+                    has_new = True
+                    break
+        finally:
+            conn.send(b'DONE\r\n')
+            # Drain until the tagged completion of the IDLE command
+            while True:
+                line = conn.readline()
+                if not line or line.startswith(tag):
+                    break
+        
+        return has_new
+    
+    @staticmethod
+    def _has_pending_input(conn: imaplib.IMAP4) -> bool:
+        """
+        Check, without blocking, whether a response line can be read already.
+        
+        readline() may pull several untagged responses into imaplib's file
+        buffer at once, and TLS may hold decrypted bytes, neither of which
+        select() on the socket sees.
+        """
+        sock = conn.sock
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            # Returns buffered bytes, or reads whatever the socket has ready
+            return bool(conn.file.peek(1))
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return False
+        finally:
+            sock.settimeout(timeout)
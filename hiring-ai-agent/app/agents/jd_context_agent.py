@@ -11,6 +11,51 @@ from app.utils.text_cleaner import TextCleaner
 
 logger = get_logger(__name__)
 
+# Static prompt text is built once at import; only the JD text and hint vary per call
+EXTRACTION_PROMPT_TEMPLATE = """Analyze this job description and extract structured information.
+{hint}
+JOB DESCRIPTION TEXT:
+{text}
+
+Extract the following information:
+
+1. **Job Title**: The exact role name (e.g., "Senior AI Engineer", "Backend Developer")
+
+2. **Seniority Level**: One of: Junior, Mid, Senior, Lead, Principal, Staff, or null if unclear
+
+3. **Required Skills** (must-have): Technical skills explicitly marked as required or mandatory.
+   - Normalize skill names (e.g., "JS" -> "JavaScript")
+   - Include both technical and soft skills if marked as required
+
+4. **Preferred Skills** (nice-to-have): Skills mentioned as preferred, bonus, or plus
+
+5. **Experience Required**: The stated experience requirement as text (e.g., "3-5 years")
+   - Also extract as numbers: experience_min_years and experience_max_years
+
+6. **Responsibilities**: Key job duties and responsibilities as a list
+
+7. **Domain**: The industry or technical domain (e.g., "Fintech", "Healthcare AI", "E-commerce")
+
+8. **Job Summary**: Write a 2-3 sentence summary of the role
+
+9. **Location**: Job location if mentioned
+
+10. **Remote Policy**: One of: Remote, Hybrid, Onsite, or null if not mentioned
+
+Be thorough but accurate. Only include information that is clearly stated or strongly implied.
+If something is not mentioned, use null instead of guessing."""
+
+EXTRACTION_SYSTEM_INSTRUCTION = """You are an expert HR analyst specializing in technical job descriptions.
+Your task is to extract structured information from job descriptions accurately.
+
+Guidelines:
+- Be precise with skill names - normalize common abbreviations
+- Distinguish clearly between required and preferred skills
+- If experience is mentioned as "X+ years", set min to X and max to X+3
+- For seniority, infer from title and experience requirements if not explicit
+- Keep responsibilities concise and actionable
+- Domain should be the business/technical domain, not generic terms"""
+
 
 class ExtractedJobData(BaseModel):
     """Intermediate model for LLM extraction."""
@@ -100,51 +145,11 @@ class JDContextAgent:
         if title_hint:
             hint_section = f"\nNote: The job title is likely '{title_hint}'.\n"
         
-        return f"""Analyze this job description and extract structured information.
-{hint_section}
-JOB DESCRIPTION TEXT:
-{text}
-
-Extract the following information:
-
-1. **Job Title**: The exact role name (e.g., "Senior AI Engineer", "Backend Developer")
-
-2. **Seniority Level**: One of: Junior, Mid, Senior, Lead, Principal, Staff, or null if unclear
-
-3. **Required Skills** (must-have): Technical skills explicitly marked as required or mandatory.
-   - Normalize skill names (e.g., "JS" -> "JavaScript")
-   - Include both technical and soft skills if marked as required
-
-4. **Preferred Skills** (nice-to-have): Skills mentioned as preferred, bonus, or plus
-
-5. **Experience Required**: The stated experience requirement as text (e.g., "3-5 years")
-   - Also extract as numbers: experience_min_years and experience_max_years
-
-6. **Responsibilities**: Key job duties and responsibilities as a list
-
-7. **Domain**: The industry or technical domain (e.g., "Fintech", "Healthcare AI", "E-commerce")
-
-8. **Job Summary**: Write a 2-3 sentence summary of the role
-
-9. **Location**: Job location if mentioned
-
-10. **Remote Policy**: One of: Remote, Hybrid, Onsite, or null if not mentioned
-
-Be thorough but accurate. Only include information that is clearly stated or strongly implied.
-If something is not mentioned, use null instead of guessing."""
+        return EXTRACTION_PROMPT_TEMPLATE.format(hint=hint_section, text=text)
 
     def _get_system_instruction(self) -> str:
         """Get the system instruction for the LLM."""
-        return """You are an expert HR analyst specializing in technical job descriptions.
-Your task is to extract structured information from job descriptions accurately.
-
-Guidelines:
-- Be precise with skill names - normalize common abbreviations
-- Distinguish clearly between required and preferred skills
-- If experience is mentioned as "X+ years", set min to X and max to X+3
-- For seniority, infer from title and experience requirements if not explicit
-- Keep responsibilities concise and actionable
-- Domain should be the business/technical domain, not generic terms"""
+        return EXTRACTION_SYSTEM_INSTRUCTION
 
     def _normalize_skills(self, skills: List[str]) -> List[str]:
         """Normalize skill names for consistency."""
@@ -152,16 +157,42 @@ Guidelines:
         seen = set()
         
         for skill in skills:
-            # Use text cleaner's normalize function
+            # Use text cleaner's normalize function (memoized process-wide)
             norm_skill = self.text_cleaner.normalize_skill(skill.strip())
             
-            # Deduplicate
-            if norm_skill.lower() not in seen:
-                seen.add(norm_skill.lower())
+            # Deduplicate case-insensitively
+            key = norm_skill.casefold()
+            if key not in seen:
+                seen.add(key)
                 normalized.append(norm_skill)
         
         return normalized
     
+    def _merge_unique(self, existing: List[str], new: List[str]) -> List[str]:
+        """
+        Append items from `new` that are not already in `existing`.
+        
+        Comparison is case-insensitive and order is preserved, so refinements
+        are deterministic.
+        
+        Args:
+            existing: Current items
+            new: Items to merge in
+            
+        Returns:
+            Merged list
+        """
+        seen = {item.casefold() for item in existing}
+        merged = list(existing)
+        
+        for item in new:
+            key = item.casefold()
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+        
+        return merged
+    
     def refine_job_context(
         self,
         job_context: JobContext,
@@ -210,20 +241,24 @@ Return the complete updated job context."""
                 job_title=extracted.job_title or job_context.job_title,
                 seniority=extracted.seniority or job_context.seniority,
                 required_skills=self._normalize_skills(
-                    list(set(job_context.required_skills + extracted.required_skills))
+                    self._merge_unique(job_context.required_skills, extracted.required_skills)
                 ),
                 preferred_skills=self._normalize_skills(
-                    list(set(job_context.preferred_skills + extracted.preferred_skills))
+                    self._merge_unique(job_context.preferred_skills, extracted.preferred_skills)
                 ),
                 experience_required=extracted.experience_required or job_context.experience_required,
                 experience_min_years=extracted.experience_min_years or job_context.experience_min_years,
                 experience_max_years=extracted.experience_max_years or job_context.experience_max_years,
-                responsibilities=list(set(job_context.responsibilities + extracted.responsibilities)),
+                responsibilities=self._merge_unique(
+                    job_context.responsibilities, extracted.responsibilities
+                ),
                 domain=extracted.domain or job_context.domain,
                 job_summary=extracted.job_summary or job_context.job_summary,
                 location=extracted.location or job_context.location,
                 remote_policy=extracted.remote_policy or job_context.remote_policy,
-                raw_text=job_context.raw_text
+                raw_text=job_context.raw_text,
+                raw_text_hash=job_context.raw_text_hash,
+                raw_text_len=job_context.raw_text_len
             )
             
             return updated
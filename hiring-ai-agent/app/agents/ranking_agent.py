@@ -1,6 +1,8 @@
 """
 Ranking Agent - Score and rank candidates against job requirements.
 """
+import asyncio
+import heapq
 from typing import List, Optional
 from pydantic import BaseModel
 
@@ -8,10 +10,75 @@ from app.models.job_context import JobContext
 from app.models.candidate import Candidate
 from app.models.score_report import ScoreReport
 from app.services.scoring_utils import ScoringUtils
+from app.services.evaluation_cache import EvaluationCache, hash_key
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Job section of the evaluation prompt; constant for every candidate of a job
+JOB_FRAGMENT_TEMPLATE = """JOB REQUIREMENTS:
+- Title: {job_title}
+- Seniority: {seniority}
+- Required Skills: {required_skills}
+- Preferred Skills: {preferred_skills}
+- Experience: {experience_required}
+- Domain: {domain}"""
+
+# Per-candidate section shared by the single and batched evaluation prompts
+CANDIDATE_SECTION_TEMPLATE = """CANDIDATE PROFILE:
+- Name: {candidate_name}
+- Headline: {headline}
+- Experience: {experience_years} years
+- Skills: {skills}
+- Summary: {summary}
+
+SCORING RESULTS:
+- Overall Score: {overall_score:.1f}/100
+- Skill Match: {skill_score:.1f}/100
+  - Matched Required: {matched_required}
+  - Missing Required: {missing_required}
+- Experience Match: {experience_score:.1f}/100 ({experience_status})"""
+
+EVALUATION_GUIDELINES = """1. **Strengths** (3-5 bullet points): What makes this candidate a good fit?
+
+2. **Weaknesses** (2-4 bullet points): What gaps or concerns exist?
+
+3. **Reasoning**: A 2-3 sentence explanation of the overall assessment.
+
+4. **Recommendation**: One of:
+   - "Strong Interview" (score 85+, excellent fit)
+   - "Interview" (score 70-84, good potential)
+   - "Maybe" (score 55-69, some concerns)
+   - "Reject" (score <55, significant gaps)"""
+
+# Static evaluation prompt, built once at import and filled per candidate
+EVALUATION_PROMPT_TEMPLATE = """Evaluate this candidate for the job role.
+
+{job_fragment}
+
+{candidate_section}
+
+Based on this analysis, provide:
+
+""" + EVALUATION_GUIDELINES + """
+
+Be objective and specific. Reference actual skills and experience."""
+
+# Several candidates per LLM call so the job section is sent once per batch
+BATCH_EVALUATION_PROMPT_TEMPLATE = """Evaluate each of the following {count} candidates for the job role.
+Assess every candidate independently of the others.
+
+{job_fragment}
+
+{candidate_sections}
+
+For each candidate, based on their analysis, provide:
+
+""" + EVALUATION_GUIDELINES + """
+
+Return exactly {count} entries in "results", in the same order as the numbered candidates.
+Be objective and specific. Reference actual skills and experience."""
+
 
 class LLMEvaluation(BaseModel):
     """LLM-generated evaluation output."""
@@ -21,28 +88,51 @@ class LLMEvaluation(BaseModel):
     recommendation: str = ""  # Strong Interview, Interview, Maybe, Reject
 
 
+class LLMEvaluationBatch(BaseModel):
+    """LLM-generated evaluations for several candidates, in prompt order."""
+    results: List[LLMEvaluation] = []
+
+
 class RankingAgent:
     """
     Agent that evaluates candidates and generates rankings with detailed analysis.
     """
     
-    def __init__(self, llm, scoring_utils: ScoringUtils):
+    def __init__(
+        self,
+        llm,
+        scoring_utils: ScoringUtils,
+        eval_batch_size: int = 5,
+        max_concurrency: int = 8,
+        llm_eval_always: bool = False,
+        evaluation_cache: Optional[EvaluationCache] = None
+    ):
         """
         Initialize Ranking Agent.
         
         Args:
             llm: GeminiLLM instance
             scoring_utils: ScoringUtils instance
+            eval_batch_size: Candidates evaluated per LLM call in rank_candidates
+            max_concurrency: Maximum concurrent LLM calls in rank_candidates_async
+            llm_eval_always: Call the LLM even for clear-cut scores instead of
+                synthesizing the evaluation
+            evaluation_cache: Optional cache of LLM evaluations shared across requests
         """
         self.llm = llm
         self.scoring_utils = scoring_utils
+        self.eval_batch_size = max(1, eval_batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.llm_eval_always = llm_eval_always
+        self.evaluation_cache = evaluation_cache
     
     def generate_candidate_rank(
         self,
         candidate: Candidate,
         job: JobContext,
         candidate_embedding: Optional[List[float]] = None,
-        job_embedding: Optional[List[float]] = None
+        job_embedding: Optional[List[float]] = None,
+        job_fragment: Optional[str] = None
     ) -> ScoreReport:
         """
         Generate a complete ranking report for a candidate.
@@ -52,6 +142,7 @@ class RankingAgent:
             job: JobContext model
             candidate_embedding: Pre-computed candidate embedding
             job_embedding: Pre-computed job embedding
+            job_fragment: Pre-built job section of the prompt (see _build_job_fragment)
             
         Returns:
             ScoreReport with scores and analysis
@@ -67,9 +158,37 @@ class RankingAgent:
         )
         
         # Get LLM evaluation (strengths, weaknesses, reasoning)
-        evaluation = self._get_llm_evaluation(candidate, job, scores)
+        evaluation = self._get_llm_evaluation(
+            candidate, job, scores, job_fragment, candidate_embedding, job_embedding
+        )
+        
+        report = self._build_report(candidate, job, scores, evaluation)
+        
+        logger.info(
+            f"Ranked {candidate.name}: {report.overall_score:.1f} - {report.recommendation}"
+        )
+        
+        return report
+    
+    def _build_report(
+        self,
+        candidate: Candidate,
+        job: JobContext,
+        scores: dict,
+        evaluation: LLMEvaluation
+    ) -> ScoreReport:
+        """
+        Combine numerical scores and the LLM evaluation into a ScoreReport.
         
-        # Build score report
+        Args:
+            candidate: Candidate model
+            job: JobContext model
+            scores: Calculated scores dict
+            evaluation: LLM evaluation for the candidate
+            
+        Returns:
+            ScoreReport
+        """
         skill_result = scores["skill_match"]
         
         report = ScoreReport(
@@ -89,17 +208,16 @@ class RankingAgent:
             recommendation=evaluation.recommendation
         )
         
-        logger.info(
-            f"Ranked {candidate.name}: {report.overall_score:.1f} - {report.recommendation}"
-        )
-        
         return report
     
     def _get_llm_evaluation(
         self,
         candidate: Candidate,
         job: JobContext,
-        scores: dict
+        scores: dict,
+        job_fragment: Optional[str] = None,
+        candidate_embedding: Optional[List[float]] = None,
+        job_embedding: Optional[List[float]] = None
     ) -> LLMEvaluation:
         """
         Get LLM-generated evaluation of candidate.
@@ -108,52 +226,30 @@ class RankingAgent:
             candidate: Candidate model
             job: JobContext model
             scores: Calculated scores dict
+            job_fragment: Pre-built job section of the prompt
+            candidate_embedding: Candidate embedding, for semantic cache lookups
+            job_embedding: Job embedding, for semantic cache lookups
             
         Returns:
             LLMEvaluation with strengths, weaknesses, reasoning
         """
-        skill_result = scores["skill_match"]
-        exp_result = scores["experience_match"]
+        if self._is_clear_cut(scores["overall_score"]):
+            return self._synthesize_evaluation(scores)
         
-        prompt = f"""Evaluate this candidate for the job role.
-
-JOB REQUIREMENTS:
-- Title: {job.job_title}
-- Seniority: {job.seniority or 'Not specified'}
-- Required Skills: {', '.join(job.required_skills)}
-- Preferred Skills: {', '.join(job.preferred_skills)}
-- Experience: {job.experience_required or 'Not specified'}
-- Domain: {job.domain or 'Not specified'}
-
-CANDIDATE PROFILE:
-- Name: {candidate.name}
-- Headline: {candidate.headline or 'Not specified'}
-- Experience: {candidate.total_experience_years or 'Unknown'} years
-- Skills: {', '.join(candidate.skills[:20])}
-- Summary: {candidate.summary or 'Not available'}
-
-SCORING RESULTS:
-- Overall Score: {scores['overall_score']:.1f}/100
-- Skill Match: {skill_result['score']:.1f}/100
-  - Matched Required: {skill_result['matched_required']}
-  - Missing Required: {skill_result['missing_required']}
-- Experience Match: {exp_result['score']:.1f}/100 ({exp_result['status']})
-
-Based on this analysis, provide:
-
-1. **Strengths** (3-5 bullet points): What makes this candidate a good fit?
-
-2. **Weaknesses** (2-4 bullet points): What gaps or concerns exist?
-
-3. **Reasoning**: A 2-3 sentence explanation of the overall assessment.
-
-4. **Recommendation**: One of:
-   - "Strong Interview" (score 85+, excellent fit)
-   - "Interview" (score 70-84, good potential)
-   - "Maybe" (score 55-69, some concerns)
-   - "Reject" (score <55, significant gaps)
-
-Be objective and specific. Reference actual skills and experience."""
+        prompt = EVALUATION_PROMPT_TEMPLATE.format(
+            job_fragment=job_fragment or self._build_job_fragment(job),
+            candidate_section=self._build_candidate_section(candidate, scores)
+        )
+        
+        cache_key = None
+        if self.evaluation_cache is not None:
+            cache_key = hash_key(prompt, self.llm.model_name)
+            cached = self.evaluation_cache.get(
+                cache_key, scores["overall_score"], candidate_embedding, job_embedding,
+                owner=candidate.id
+            )
+            if cached is not None:
+                return cached.model_copy(deep=True)
 
         try:
             evaluation = self.llm.generate_structured(
@@ -161,59 +257,375 @@ Be objective and specific. Reference actual skills and experience."""
                 output_model=LLMEvaluation,
                 temperature=0.3
             )
+            if cache_key is not None:
+                self.evaluation_cache.put(
+                    cache_key, scores["overall_score"], evaluation.model_copy(deep=True),
+                    candidate_embedding, job_embedding, owner=candidate.id
+                )
             return evaluation
             
         except Exception as e:
             logger.error(f"LLM evaluation failed: {e}")
-            # Return default evaluation based on score
-            score = scores["overall_score"]
-            if score >= 85:
-                rec = "Strong Interview"
-            elif score >= 70:
-                rec = "Interview"
-            elif score >= 55:
-                rec = "Maybe"
-            else:
-                rec = "Reject"
+            return self._fallback_evaluation(scores["overall_score"])
+    
+    def _get_llm_evaluations_batch(
+        self,
+        scored: List[tuple],
+        job_fragment: str
+    ) -> Optional[List[LLMEvaluation]]:
+        """
+        Evaluate several candidates with a single LLM call.
+        
+        Args:
+            scored: List of (candidate, scores) pairs
+            job_fragment: Pre-built job section of the prompt
+            
+        Returns:
+            One LLMEvaluation per candidate in order, or None if the call
+            failed or returned the wrong number of results
+        """
+        candidate_sections = "\n\n".join(
+            f"### CANDIDATE {i}\n{self._build_candidate_section(candidate, scores)}"
+            for i, (candidate, scores) in enumerate(scored, start=1)
+        )
+        
+        prompt = BATCH_EVALUATION_PROMPT_TEMPLATE.format(
+            count=len(scored),
+            job_fragment=job_fragment,
+            candidate_sections=candidate_sections
+        )
+        
+        try:
+            batch = self.llm.generate_structured(
+                prompt=prompt,
+                output_model=LLMEvaluationBatch,
+                temperature=0.3
+            )
+        except Exception as e:
+            logger.warning(f"Batched LLM evaluation failed: {e}")
+            return None
+        
+        if len(batch.results) != len(scored):
+            logger.warning(
+                f"Batched LLM evaluation returned {len(batch.results)} results "
+                f"for {len(scored)} candidates"
+            )
+            return None
+        
+        return batch.results
+    
+    def _build_candidate_section(self, candidate: Candidate, scores: dict) -> str:
+        """
+        Build the candidate profile and scoring section of the evaluation prompt.
+        
+        Args:
+            candidate: Candidate model
+            scores: Calculated scores dict
             
-            return LLMEvaluation(
-                strengths=["Analysis unavailable"],
-                weaknesses=["Analysis unavailable"],
-                reasoning=f"Score-based recommendation: {score:.1f}/100",
-                recommendation=rec
+        Returns:
+            Formatted candidate section
+        """
+        skill_result = scores["skill_match"]
+        exp_result = scores["experience_match"]
+        
+        return CANDIDATE_SECTION_TEMPLATE.format(
+            candidate_name=candidate.name,
+            headline=candidate.headline or 'Not specified',
+            experience_years=candidate.total_experience_years or 'Unknown',
+            skills=', '.join(candidate.skills[:20]),
+            summary=candidate.summary or 'Not available',
+            overall_score=scores['overall_score'],
+            skill_score=skill_result['score'],
+            matched_required=skill_result['matched_required'],
+            missing_required=skill_result['missing_required'],
+            experience_score=exp_result['score'],
+            experience_status=exp_result['status']
+        )
+    
+    def _is_clear_cut(self, score: float) -> bool:
+        """Whether a score is extreme enough that the LLM would not change the outcome."""
+        return not self.llm_eval_always and (score >= 95 or score < 30)
+    
+    def _synthesize_evaluation(self, scores: dict) -> LLMEvaluation:
+        """
+        Build an evaluation from the skill and experience analysis without the LLM.
+        
+        Args:
+            scores: Calculated scores dict
+            
+        Returns:
+            LLMEvaluation
+        """
+        skill_result = scores["skill_match"]
+        exp_result = scores["experience_match"]
+        score = scores["overall_score"]
+        
+        strengths = []
+        weaknesses = []
+        
+        if skill_result["matched_required"]:
+            strengths.append(
+                f"Has required skills: {', '.join(skill_result['matched_required'][:8])}"
             )
+        if skill_result["matched_preferred"]:
+            strengths.append(
+                f"Has preferred skills: {', '.join(skill_result['matched_preferred'][:8])}"
+            )
+        if skill_result["missing_required"]:
+            weaknesses.append(
+                f"Missing required skills: {', '.join(skill_result['missing_required'][:8])}"
+            )
+        
+        exp_message = exp_result.get("message")
+        if exp_message:
+            if exp_result["status"] in ("match", "over"):
+                strengths.append(exp_message)
+            else:
+                weaknesses.append(exp_message)
+        
+        recommendation = self._fallback_evaluation(score).recommendation
+        
+        return LLMEvaluation(
+            strengths=strengths or ["No notable strengths identified"],
+            weaknesses=weaknesses or ["No significant gaps identified"],
+            reasoning=(
+                f"Overall score {score:.1f}/100 with skill match {skill_result['score']:.1f}/100 "
+                f"and experience match {exp_result['score']:.1f}/100 puts this candidate "
+                f"clearly in the '{recommendation}' band."
+            ),
+            recommendation=recommendation
+        )
+    
+    def _fallback_evaluation(self, score: float) -> LLMEvaluation:
+        """Build a score-based evaluation for when the LLM is unavailable."""
+        if score >= 85:
+            rec = "Strong Interview"
+        elif score >= 70:
+            rec = "Interview"
+        elif score >= 55:
+            rec = "Maybe"
+        else:
+            rec = "Reject"
+        
+        return LLMEvaluation(
+            strengths=["Analysis unavailable"],
+            weaknesses=["Analysis unavailable"],
+            reasoning=f"Score-based recommendation: {score:.1f}/100",
+            recommendation=rec
+        )
+    
+    def _build_job_fragment(self, job: JobContext) -> str:
+        """
+        Build the JOB REQUIREMENTS section of the evaluation prompt.
+        
+        Args:
+            job: JobContext model
+            
+        Returns:
+            Formatted job section
+        """
+        return JOB_FRAGMENT_TEMPLATE.format(
+            job_title=job.job_title,
+            seniority=job.seniority or 'Not specified',
+            required_skills=', '.join(job.required_skills),
+            preferred_skills=', '.join(job.preferred_skills),
+            experience_required=job.experience_required or 'Not specified',
+            domain=job.domain or 'Not specified'
+        )
+    
+    async def generate_candidate_rank_async(
+        self,
+        candidate: Candidate,
+        job: JobContext,
+        candidate_embedding: Optional[List[float]] = None,
+        job_embedding: Optional[List[float]] = None,
+        job_fragment: Optional[str] = None
+    ) -> ScoreReport:
+        """
+        Async variant of generate_candidate_rank.
+        
+        The LLM client is synchronous, so the work runs in a worker thread.
+        """
+        return await asyncio.to_thread(
+            self.generate_candidate_rank,
+            candidate,
+            job,
+            candidate_embedding,
+            job_embedding,
+            job_fragment
+        )
     
     def rank_candidates(
         self,
         candidates: List[Candidate],
         job: JobContext,
         candidate_embeddings: Optional[dict] = None,
-        job_embedding: Optional[List[float]] = None
+        job_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None
     ) -> List[ScoreReport]:
         """
         Rank multiple candidates for a job.
         
+        Runs the LLM evaluations concurrently via rank_candidates_async, or
+        serially when called from inside a running event loop.
+        
         Args:
             candidates: List of candidates
             job: Job context
             candidate_embeddings: Dict of candidate_id -> embedding
             job_embedding: Job embedding
+            top_k: Only return the best K reports
             
         Returns:
             List of ScoreReports sorted by score (descending)
         """
-        candidate_embeddings = candidate_embeddings or {}
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.rank_candidates_async(
+                candidates, job, candidate_embeddings, job_embedding, top_k
+            ))
         
-        reports = []
+        # Cannot block a running loop on asyncio.run; evaluate serially instead
+        job_fragment = self._build_job_fragment(job)
+        chunks = self._score_chunks(candidates, job, candidate_embeddings, job_embedding)
+        evaluations = [
+            self._evaluate_chunk(chunk, job, job_fragment, candidate_embeddings, job_embedding)
+            for chunk in chunks
+        ]
+        
+        return self._collect_reports(chunks, evaluations, job, top_k)
+    
+    async def rank_candidates_async(
+        self,
+        candidates: List[Candidate],
+        job: JobContext,
+        candidate_embeddings: Optional[dict] = None,
+        job_embedding: Optional[List[float]] = None,
+        top_k: Optional[int] = None
+    ) -> List[ScoreReport]:
+        """
+        Rank multiple candidates for a job, overlapping LLM calls.
+        
+        At most max_concurrency evaluation calls are in flight at once.
+        
+        Args:
+            candidates: List of candidates
+            job: Job context
+            candidate_embeddings: Dict of candidate_id -> embedding
+            job_embedding: Job embedding
+            top_k: Only return the best K reports
+            
+        Returns:
+            List of ScoreReports sorted by score (descending)
+        """
+        job_fragment = self._build_job_fragment(job)
+        chunks = self._score_chunks(candidates, job, candidate_embeddings, job_embedding)
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def evaluate(chunk: List[tuple]) -> List[LLMEvaluation]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._evaluate_chunk, chunk, job, job_fragment, candidate_embeddings, job_embedding
+                )
+        
+        evaluations = await asyncio.gather(*(evaluate(chunk) for chunk in chunks))
+        
+        return self._collect_reports(chunks, evaluations, job, top_k)
+    
+    def _score_chunks(
+        self,
+        candidates: List[Candidate],
+        job: JobContext,
+        candidate_embeddings: Optional[dict],
+        job_embedding: Optional[List[float]]
+    ) -> List[List[tuple]]:
+        """
+        Compute numerical scores and group candidates into LLM evaluation batches.
+        
+        Returns:
+            List of chunks, each a list of (candidate, scores) pairs
+        """
+        # Numerical scores are local; only the LLM evaluation is batched
+        scored = []
         for candidate in candidates:
-            cand_embedding = candidate_embeddings.get(candidate.id)
-            report = self.generate_candidate_rank(
+            logger.info(f"Ranking candidate {candidate.name} for {job.job_title}")
+            scores = self.scoring_utils.score_candidate(
                 candidate=candidate,
                 job=job,
-                candidate_embedding=cand_embedding,
+                candidate_embedding=(
+                    candidate_embeddings.get(candidate.id) if candidate_embeddings else None
+                ),
                 job_embedding=job_embedding
             )
-            reports.append(report)
+            scored.append((candidate, scores))
+        
+        return [
+            scored[start:start + self.eval_batch_size]
+            for start in range(0, len(scored), self.eval_batch_size)
+        ]
+    
+    def _evaluate_chunk(
+        self,
+        chunk: List[tuple],
+        job: JobContext,
+        job_fragment: str,
+        candidate_embeddings: Optional[dict] = None,
+        job_embedding: Optional[List[float]] = None
+    ) -> List[LLMEvaluation]:
+        """
+        Evaluate a chunk with one batched call, falling back to per-candidate calls.
+        
+        The fallback goes through _get_llm_evaluation with the embeddings, so it
+        uses (and fills) the evaluation cache like single assessments do.
+        """
+        evaluations: List[Optional[LLMEvaluation]] = [
+            self._synthesize_evaluation(scores)
+            if self._is_clear_cut(scores["overall_score"]) else None
+            for _, scores in chunk
+        ]
+        
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        
+        batch = None
+        if len(pending) > 1:
+            batch = self._get_llm_evaluations_batch([chunk[i] for i in pending], job_fragment)
+        if batch is None:
+            # Batch unavailable or malformed; evaluate one at a time
+            batch = [
+                self._get_llm_evaluation(
+                    chunk[i][0], job, chunk[i][1], job_fragment,
+                    candidate_embeddings.get(chunk[i][0].id) if candidate_embeddings else None,
+                    job_embedding
+                )
+                for i in pending
+            ]
+        
+        for i, evaluation in zip(pending, batch):
+            evaluations[i] = evaluation
+        return evaluations
+    
+    def _collect_reports(
+        self,
+        chunks: List[List[tuple]],
+        evaluations: List[List[LLMEvaluation]],
+        job: JobContext,
+        top_k: Optional[int] = None
+    ) -> List[ScoreReport]:
+        """Build score reports from scored chunks and their evaluations, sorted by score."""
+        reports = []
+        for chunk, chunk_evaluations in zip(chunks, evaluations):
+            for (candidate, scores), evaluation in zip(chunk, chunk_evaluations):
+                report = self._build_report(candidate, job, scores, evaluation)
+                logger.info(
+                    f"Ranked {candidate.name}: {report.overall_score:.1f} - {report.recommendation}"
+                )
+                reports.append(report)
+        
+        if top_k is not None:
+            # O(C log K) partial selection; nlargest returns descending order
+            return heapq.nlargest(top_k, reports, key=lambda r: r.overall_score)
         
         # Sort by overall score (descending)
         reports.sort(key=lambda r: r.overall_score, reverse=True)
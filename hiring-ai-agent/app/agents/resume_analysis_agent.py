@@ -2,32 +2,214 @@
 Resume Analysis Agent - Parse and extract structured information from resumes.
 Includes GitHub profile analysis.
 """
-import re
-import urllib.request
-import json
-from typing import Optional, Dict, List, Any
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional, Dict, List, Any, NamedTuple, Tuple
 
-from app.models.candidate import Candidate
+import httpx
+import orjson
+
+from app.models.candidate import Candidate, Project
 from app.services.resume_extractor import ResumeExtractor
 from app.utils.logger import get_logger
+from app.utils.regex_utils import compile_pattern
 
 logger = get_logger(__name__)
 
+# GitHub profile references found in resumes ("github.com/user" or "GitHub: @user").
+# A profile URL takes priority over a label, which would otherwise read the URL
+# after "GitHub:" as the username. Resume text is untrusted, so the patterns
+# avoid lookarounds and compile under linear-time RE2 when it is installed.
+_GITHUB_URL_RE = compile_pattern(
+    r'github\.com/([a-zA-Z0-9](?:-?[a-zA-Z0-9]){0,38})',
+    ignore_case=True
+)
+_GITHUB_LABEL_RE = compile_pattern(r'github:\s*@?([a-zA-Z0-9_-]+)', ignore_case=True)
+_GITHUB_USER_RE = compile_pattern(r'github\.com/([a-zA-Z0-9_-]+)')
+# GitHub's own username rule: alphanumerics and single inner hyphens, max 39 chars
+GITHUB_USERNAME_MAX_LENGTH = 39
+_GITHUB_USER_VALID = compile_pattern(r'[A-Za-z0-9](?:-?[A-Za-z0-9])*')
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_ETAG_CACHE_SIZE = 1024
+GITHUB_ANALYSIS_TTL_SECONDS = 24 * 3600
+GITHUB_ANALYSIS_CACHE_SIZE = 4096
+
+# Shared keep-alive client so repeat lookups skip DNS/TCP/TLS setup
+_github_client = httpx.Client(
+    base_url=GITHUB_API_URL,
+    headers={'User-Agent': 'HiringAIAgent/1.0'},
+    timeout=10
+)
+
+# (path, params) -> (etag, payload); conditional requests answered with
+# 304 Not Modified reuse the payload and don't count against the rate limit
+_github_etag_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_github_etag_lock = threading.Lock()
+
+
+def _github_get(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    GET a GitHub API resource, revalidating cached responses by ETag.
+    
+    Args:
+        path: API path, e.g. "/users/octocat"
+        params: Optional query parameters
+        
+    Returns:
+        Decoded JSON payload
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    with _github_etag_lock:
+        cached = _github_etag_cache.get(key)
+    
+    headers = {'If-None-Match': cached[0]} if cached else None
+    response = _github_client.get(path, params=params, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        with _github_etag_lock:
+            _github_etag_cache.move_to_end(key)
+        return cached[1]
+    
+    response.raise_for_status()
+    # Parse the raw bytes directly instead of decoding to str first
+    payload = orjson.loads(response.content)
+    
+    etag = response.headers.get('ETag')
+    if etag:
+        with _github_etag_lock:
+            _github_etag_cache[key] = (etag, payload)
+            _github_etag_cache.move_to_end(key)
+            while len(_github_etag_cache) > GITHUB_ETAG_CACHE_SIZE:
+                _github_etag_cache.popitem(last=False)
+    
+    return payload
+
+
+class _PromptContext(NamedTuple):
+    """Candidate fields pre-formatted for prompts (empty string when missing)."""
+    top_skills: str      # first 10 skills
+    all_skills: str      # first 15 skills
+    experience: str      # "N years"
+    recent_roles: str    # "Role at Company; ..."
+
+
+@lru_cache(maxsize=1024)
+def _build_prompt_context(
+    skills: Tuple[str, ...],
+    experience_years: Optional[float],
+    roles: Tuple[str, ...]
+) -> _PromptContext:
+    """Format candidate prompt fields once per distinct candidate projection."""
+    return _PromptContext(
+        top_skills=", ".join(skills[:10]),
+        all_skills=", ".join(skills),
+        experience=f"{experience_years} years" if experience_years else "",
+        recent_roles="; ".join(roles)
+    )
+
+
+# Seniority word for the template summary by total years of experience,
+# most senior first (the JD agent's levels; all take "a")
+_SENIORITY_BY_YEARS = ((10, "seasoned"), (5, "senior"), (2, "mid-level"), (0, "junior"))
+
+
+def _seniority(experience_years: float) -> str:
+    """Seniority word for a candidate's total years of experience."""
+    return next(word for min_years, word in _SENIORITY_BY_YEARS if experience_years >= min_years)
+
+
+def _candidate_prompt_context(candidate: Candidate) -> _PromptContext:
+    """Prompt context for a candidate, shared by the summary and fit prompts."""
+    roles = tuple(
+        f"{exp.role} at {exp.company}"
+        for exp in candidate.experience[:2]
+        if exp.role and exp.company
+    )
+    return _build_prompt_context(
+        tuple(candidate.skills[:15]),
+        candidate.total_experience_years,
+        roles
+    )
+
+
+# One GraphQL round-trip for the profile plus owned, non-fork repos, asking only
+# for the fields the analysis reads (REST returns ~80 fields per repo)
+GITHUB_PROFILE_QUERY = """
+query($login: String!, $first: Int!) {
+  user(login: $login) {
+    name
+    bio
+    company
+    location
+    createdAt
+    followers { totalCount }
+    following { totalCount }
+    publicRepos: repositories(privacy: PUBLIC) { totalCount }
+    repositories(
+      first: $first, privacy: PUBLIC, ownerAffiliations: OWNER, isFork: false,
+      orderBy: {field: PUSHED_AT, direction: DESC}
+    ) {
+      nodes { name description url stargazerCount primaryLanguage { name } }
+    }
+  }
+}
+"""
+
+# Repo fields used by the analysis, projected in one C-level call per repo
+_REPO_FIELDS = itemgetter('name', 'description', 'language', 'stargazers_count', 'html_url')
+
+
+# username (lowercase) -> (fetched_at, analysis); the same candidate is often
+# re-processed for several jobs within a day
+_github_analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_github_analysis_lock = threading.Lock()
+
+
+def _get_cached_analysis(username: str) -> Optional[Dict[str, Any]]:
+    """Return a fresh cached GitHub analysis for a username, if any."""
+    key = username.lower()
+    with _github_analysis_lock:
+        cached = _github_analysis_cache.get(key)
+        if not cached:
+            return None
+        if time.monotonic() - cached[0] > GITHUB_ANALYSIS_TTL_SECONDS:
+            del _github_analysis_cache[key]
+            return None
+        _github_analysis_cache.move_to_end(key)
+        return cached[1]
+
+
+def _cache_analysis(username: str, analysis: Dict[str, Any]):
+    """Store a successful GitHub analysis, evicting the least recently used."""
+    with _github_analysis_lock:
+        _github_analysis_cache[username.lower()] = (time.monotonic(), analysis)
+        _github_analysis_cache.move_to_end(username.lower())
+        while len(_github_analysis_cache) > GITHUB_ANALYSIS_CACHE_SIZE:
+            _github_analysis_cache.popitem(last=False)
+
 
 class ResumeAnalysisAgent:
     """
     Agent that parses resumes and extracts structured candidate information.
     """
     
-    def __init__(self, llm):
+    def __init__(self, llm, github_token: Optional[str] = None):
         """
         Initialize Resume Analysis Agent.
         
         Args:
             llm: GeminiLLM instance
+            github_token: Optional GitHub token; enables the single-request
+                GraphQL profile lookup (the GraphQL API requires auth)
         """
         self.llm = llm
         self.extractor = ResumeExtractor(llm)
+        self.github_token = github_token
     
     def parse_resume(
         self,
@@ -74,17 +256,54 @@ class ResumeAnalysisAgent:
         Returns:
             Generated summary text
         """
-        # Build context for summary generation
-        skills_str = ", ".join(candidate.skills[:10]) if candidate.skills else "not specified"
-        exp_str = f"{candidate.total_experience_years} years" if candidate.total_experience_years else "experience not specified"
+        template = self._template_summary(candidate)
+        if template:
+            return template
         
-        recent_roles = []
-        for exp in candidate.experience[:2]:
-            if exp.role and exp.company:
-                recent_roles.append(f"{exp.role} at {exp.company}")
-        roles_str = "; ".join(recent_roles) if recent_roles else "roles not specified"
+        try:
+            summary = self.llm.generate_text(
+                prompt=self._build_summary_prompt(candidate),
+                temperature=0.5,
+                max_tokens=150
+            )
+            return summary.strip()
+        except Exception as e:
+            logger.warning(f"Failed to generate summary: {e}")
+            return ""
+    
+    def _template_summary(self, candidate: Candidate) -> Optional[str]:
+        """
+        Render a summary locally when the structured data is rich enough.
         
-        prompt = f"""Write a brief 2-3 sentence professional summary for this candidate:
+        Args:
+            candidate: Partially parsed candidate
+            
+        Returns:
+            Summary text, or None if roles, skills or experience are missing
+        """
+        ctx = _candidate_prompt_context(candidate)
+        if not (ctx.recent_roles and ctx.top_skills and ctx.experience):
+            return None
+        
+        name = candidate.name or "The candidate"
+        years = candidate.total_experience_years
+        experience = f"{years:g} year" if years == 1 else f"{years:g} years"
+        latest_role = ctx.recent_roles.split("; ", 1)[0]
+        skills = ", ".join(candidate.skills[:5])
+        return (
+            f"{name} is a {_seniority(years)} professional with {experience} of experience, "
+            f"most recently as {latest_role}. Key skills include {skills}."
+        )
+    
+    def _build_summary_prompt(self, candidate: Candidate) -> str:
+        """Build the summary generation prompt for a candidate."""
+        # Build context for summary generation
+        ctx = _candidate_prompt_context(candidate)
+        skills_str = ctx.top_skills or "not specified"
+        exp_str = ctx.experience or "experience not specified"
+        roles_str = ctx.recent_roles or "roles not specified"
+        
+        return f"""Write a brief 2-3 sentence professional summary for this candidate:
 
 Name: {candidate.name or 'Unknown'}
 Headline: {candidate.headline or 'Not specified'}
@@ -94,17 +313,6 @@ Key Skills: {skills_str}
 
 Write in third person. Focus on their experience level, main skills, and career focus.
 Be professional and concise."""
-
-        try:
-            summary = self.llm.generate_text(
-                prompt=prompt,
-                temperature=0.5,
-                max_tokens=150
-            )
-            return summary.strip()
-        except Exception as e:
-            logger.warning(f"Failed to generate summary: {e}")
-            return ""
     
     def analyze_fit(self, candidate: Candidate, job_title: str) -> str:
         """
@@ -117,8 +325,9 @@ Be professional and concise."""
         Returns:
             Fit analysis text
         """
-        skills_str = ", ".join(candidate.skills[:15]) if candidate.skills else "none listed"
-        exp_str = f"{candidate.total_experience_years} years" if candidate.total_experience_years else "unknown"
+        ctx = _candidate_prompt_context(candidate)
+        skills_str = ctx.all_skills or "none listed"
+        exp_str = ctx.experience or "unknown"
         
         prompt = f"""Briefly analyze this candidate's fit for a {job_title} role:
 
@@ -198,26 +407,19 @@ Return only the NEW information found, not duplicates."""
         Returns:
             GitHub profile URL or None
         """
-        # Match various GitHub URL formats
-        patterns = [
-            r'github\.com/([a-zA-Z0-9](?:[a-zA-Z0-9]|-(?=[a-zA-Z0-9])){0,38})',
-            r'https?://github\.com/([a-zA-Z0-9_-]+)',
-            r'github:\s*@?([a-zA-Z0-9_-]+)',
-            r'GitHub:\s*([a-zA-Z0-9_-]+)',
-        ]
+        match = _GITHUB_URL_RE.search(text) or _GITHUB_LABEL_RE.search(text)
+        if not match:
+            return None
         
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                username = match.group(1)
-                # Clean up username
-                username = username.strip('/')
-                if username and len(username) > 0:
-                    url = f"https://github.com/{username}"
-                    logger.info(f"Found GitHub URL: {url}")
-                    return url
+        username = match.group(1)
+        # Clean up username
+        username = username.strip('/')
+        if not username:
+            return None
         
-        return None
+        url = f"https://github.com/{username}"
+        logger.info(f"Found GitHub URL: {url}")
+        return url
     
     def extract_github_username(self, github_url: str) -> Optional[str]:
         """
@@ -229,7 +431,7 @@ Return only the NEW information found, not duplicates."""
         Returns:
             Username string
         """
-        match = re.search(r'github\.com/([a-zA-Z0-9_-]+)', github_url)
+        match = _GITHUB_USER_RE.search(github_url)
         if match:
             return match.group(1)
         return None
@@ -245,24 +447,87 @@ Return only the NEW information found, not duplicates."""
             User profile dict or None
         """
         try:
-            url = f"https://api.github.com/users/{username}"
-            req = urllib.request.Request(
-                url,
-                headers={'User-Agent': 'HiringAIAgent/1.0'}
-            )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode())
-                logger.info(f"Fetched GitHub profile for {username}")
-                return data
+            data = _github_get(f"/users/{username}")
+            logger.info(f"Fetched GitHub profile for {username}")
+            return data
                 
         except Exception as e:
             logger.warning(f"Failed to fetch GitHub profile for {username}: {e}")
             return None
     
+    def fetch_github_graphql(
+        self,
+        username: str,
+        limit: int = 15
+    ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Fetch profile and repositories in one GraphQL request.
+        
+        Results are shaped like the REST responses so the analysis code is
+        shared between both paths.
+        
+        Args:
+            username: GitHub username
+            limit: Max number of repos to fetch
+            
+        Returns:
+            (profile, repos) tuple, or None if unavailable
+        """
+        if not self.github_token:
+            return None
+        
+        try:
+            response = _github_client.post(
+                "/graphql",
+                content=orjson.dumps({
+                    'query': GITHUB_PROFILE_QUERY,
+                    'variables': {'login': username, 'first': limit}
+                }),
+                headers={
+                    'Authorization': f"bearer {self.github_token}",
+                    'Content-Type': 'application/json'
+                }
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            
+            user = (data.get('data') or {}).get('user')
+            if not user:
+                logger.warning(f"GraphQL lookup failed for {username}: {data.get('errors')}")
+                return None
+            
+            profile = {
+                'name': user.get('name'),
+                'bio': user.get('bio'),
+                'company': user.get('company'),
+                'location': user.get('location'),
+                'public_repos': user['publicRepos']['totalCount'],
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+                'created_at': user.get('createdAt'),
+            }
+            repos = [
+                {
+                    'name': node.get('name'),
+                    'description': node.get('description'),
+                    'language': (node.get('primaryLanguage') or {}).get('name'),
+                    'stargazers_count': node.get('stargazerCount', 0),
+                    'html_url': node.get('url'),
+                    'fork': False
+                }
+                for node in user['repositories']['nodes']
+            ]
+            
+            logger.info(f"Fetched GitHub profile and {len(repos)} repos for {username} via GraphQL")
+            return profile, repos
+            
+        except Exception as e:
+            logger.warning(f"GraphQL fetch failed for {username}: {e}")
+            return None
+    
     def fetch_github_repos(self, username: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        Fetch user's public repositories.
+        Fetch the user's own public repositories, most recently pushed first.
         
         Args:
             username: GitHub username
@@ -272,16 +537,12 @@ Return only the NEW information found, not duplicates."""
             List of repository data
         """
         try:
-            url = f"https://api.github.com/users/{username}/repos?sort=updated&per_page={limit}"
-            req = urllib.request.Request(
-                url,
-                headers={'User-Agent': 'HiringAIAgent/1.0'}
+            repos = _github_get(
+                f"/users/{username}/repos",
+                params={'type': 'owner', 'sort': 'pushed', 'per_page': limit}
             )
-            
-            with urllib.request.urlopen(req, timeout=10) as response:
-                repos = json.loads(response.read().decode())
-                logger.info(f"Fetched {len(repos)} repos for {username}")
-                return repos
+            logger.info(f"Fetched {len(repos)} repos for {username}")
+            return repos
                 
         except Exception as e:
             logger.warning(f"Failed to fetch repos for {username}: {e}")
@@ -302,39 +563,54 @@ Return only the NEW information found, not duplicates."""
             logger.warning(f"Could not extract username from {github_url}")
             return {"error": "Invalid GitHub URL"}
         
-        # Fetch profile and repos
-        profile = self.fetch_github_profile(username)
-        repos = self.fetch_github_repos(username, limit=15)
+        # Don't spend a round-trip on a handle GitHub would answer with 404
+        if len(username) > GITHUB_USERNAME_MAX_LENGTH or not _GITHUB_USER_VALID.fullmatch(username):
+            logger.warning(f"Invalid GitHub username: {username}")
+            return {"error": "Invalid GitHub username"}
+        
+        cached = _get_cached_analysis(username)
+        if cached:
+            logger.info(f"Using cached GitHub analysis for {username}")
+            # Callers add keys (e.g. ai_summary), so hand out a copy
+            return {**cached, 'url': github_url}
+        
+        # One GraphQL request when a token is configured; otherwise (or if it
+        # fails) fetch profile and repos over REST concurrently
+        fetched = self.fetch_github_graphql(username, limit=15)
+        if fetched:
+            profile, repos = fetched
+        else:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                profile_future = pool.submit(self.fetch_github_profile, username)
+                repos_future = pool.submit(self.fetch_github_repos, username, 15)
+                profile = profile_future.result()
+                repos = repos_future.result()
         
         if not profile:
             return {"error": "Could not fetch GitHub profile"}
         
-        # Extract languages/skills from repos
-        languages = {}
-        repo_summaries = []
-        total_stars = 0
-        
-        for repo in repos:
-            if repo.get('fork', False):
-                continue  # Skip forked repos
-            
-            lang = repo.get('language')
-            if lang:
-                languages[lang] = languages.get(lang, 0) + 1
-            
-            stars = repo.get('stargazers_count', 0)
-            total_stars += stars
-            
-            repo_summaries.append({
-                'name': repo.get('name'),
-                'description': repo.get('description', '')[:100] if repo.get('description') else '',
-                'language': lang,
-                'stars': stars,
-                'url': repo.get('html_url')
-            })
+        # Extract languages/skills from repos (forked repos are skipped; the
+        # API has no server-side filter for them)
+        own_repos = [_REPO_FIELDS(repo) for repo in repos if not repo.get('fork', False)]
+        names, descriptions, langs, stars, urls = zip(*own_repos) if own_repos else ((),) * 5
+        
+        languages = Counter(filter(None, langs))
+        total_stars = sum(s or 0 for s in stars)
+        
+        # Only the top five repos are reported
+        repo_summaries = [
+            {
+                'name': names[i],
+                'description': descriptions[i][:100] if descriptions[i] else '',
+                'language': langs[i],
+                'stars': stars[i] or 0,
+                'url': urls[i]
+            }
+            for i in range(min(5, len(names)))
+        ]
         
-        # Sort languages by frequency
-        top_languages = sorted(languages.items(), key=lambda x: -x[1])[:8]
+        # Most frequent languages first
+        top_languages = languages.most_common(8)
         
         analysis = {
             'username': username,
@@ -348,12 +624,14 @@ Return only the NEW information found, not duplicates."""
             'following': profile.get('following', 0),
             'total_stars': total_stars,
             'top_languages': [lang for lang, _ in top_languages],
-            'top_repos': repo_summaries[:5],
+            'top_repos': repo_summaries,
             'created_at': profile.get('created_at'),
         }
         
+        _cache_analysis(username, analysis)
+        
         logger.info(f"GitHub analysis for {username}: {len(top_languages)} languages, {total_stars} stars")
-        return analysis
+        return dict(analysis)
     
     def generate_github_summary(self, github_analysis: Dict[str, Any]) -> str:
         """
@@ -436,20 +714,21 @@ Be objective and concise."""
         
         # Add discovered languages to skills if not present
         github_languages = analysis.get('top_languages', [])
-        current_skills_lower = [s.lower() for s in candidate.skills]
+        current_skills_lower = {s.lower() for s in candidate.skills}
         
         new_skills = []
         for lang in github_languages:
             if lang.lower() not in current_skills_lower:
                 new_skills.append(lang)
+                current_skills_lower.add(lang.lower())
         
         if new_skills:
             candidate.skills.extend(new_skills)
             logger.info(f"Added {len(new_skills)} skills from GitHub: {new_skills}")
         
         # Add GitHub projects to candidate projects
+        existing_names = {p.name.lower() for p in candidate.projects if p.name}
         for repo in analysis.get('top_repos', [])[:3]:
-            from app.models.candidate import Project
             project = Project(
                 name=repo.get('name'),
                 description=repo.get('description', ''),
@@ -457,9 +736,9 @@ Be objective and concise."""
                 url=repo.get('url')
             )
             # Check if project already exists
-            existing_names = [p.name.lower() for p in candidate.projects if p.name]
             if project.name and project.name.lower() not in existing_names:
                 candidate.projects.append(project)
+                existing_names.add(project.name.lower())
         
         # Generate and append GitHub summary to candidate summary
         github_summary = self.generate_github_summary(analysis)
@@ -499,6 +778,12 @@ Be objective and concise."""
         # Store raw text for GitHub URL extraction
         candidate.raw_text = raw_text
         
+        # Cheap substring probe: without any GitHub mention there is nothing to
+        # find, so skip the regex sweep and the enrichment path entirely
+        if enrich_github and not candidate.github_url and 'github' not in raw_text.lower():
+            logger.info(f"No GitHub reference in resume for {candidate.name}")
+            enrich_github = False
+        
         # Enrich with GitHub if enabled
         if enrich_github:
             candidate = self.enrich_candidate_with_github(candidate)
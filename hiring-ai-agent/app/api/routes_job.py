@@ -1,6 +1,9 @@
 """
 Job API Routes - Endpoints for job context management.
 """
+import asyncio
+from pathlib import Path
+
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel
 from typing import List, Optional
@@ -43,18 +46,7 @@ async def create_job(
             title_hint=None
         )
         
-        return JobContextResponse(
-            id=job.id,
-            job_title=job.job_title,
-            seniority=job.seniority,
-            required_skills=job.required_skills,
-            preferred_skills=job.preferred_skills,
-            experience_required=job.experience_required,
-            responsibilities=job.responsibilities,
-            domain=job.domain,
-            job_summary=job.job_summary,
-            created_at=job.created_at
-        )
+        return JobContextResponse.model_validate(job)
     except Exception as e:
         logger.error(f"Failed to create job: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -75,18 +67,7 @@ async def get_job(
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    return JobContextResponse(
-        id=job.id,
-        job_title=job.job_title,
-        seniority=job.seniority,
-        required_skills=job.required_skills,
-        preferred_skills=job.preferred_skills,
-        experience_required=job.experience_required,
-        responsibilities=job.responsibilities,
-        domain=job.domain,
-        job_summary=job.job_summary,
-        created_at=job.created_at
-    )
+    return JobContextResponse.model_validate(job)
 
 
 @router.get("/", response_model=List[JobContextResponse])
@@ -101,21 +82,7 @@ async def list_jobs(
     """
     jobs = workflow.list_jobs(limit=limit)
     
-    return [
-        JobContextResponse(
-            id=job.id,
-            job_title=job.job_title,
-            seniority=job.seniority,
-            required_skills=job.required_skills,
-            preferred_skills=job.preferred_skills,
-            experience_required=job.experience_required,
-            responsibilities=job.responsibilities,
-            domain=job.domain,
-            job_summary=job.job_summary,
-            created_at=job.created_at
-        )
-        for job in jobs
-    ]
+    return [JobContextResponse.model_validate(job) for job in jobs]
 
 
 @router.get("/search/{title}")
@@ -133,18 +100,7 @@ async def search_job_by_title(
     if not job:
         raise HTTPException(status_code=404, detail=f"Job with title '{title}' not found")
     
-    return JobContextResponse(
-        id=job.id,
-        job_title=job.job_title,
-        seniority=job.seniority,
-        required_skills=job.required_skills,
-        preferred_skills=job.preferred_skills,
-        experience_required=job.experience_required,
-        responsibilities=job.responsibilities,
-        domain=job.domain,
-        job_summary=job.job_summary,
-        created_at=job.created_at
-    )
+    return JobContextResponse.model_validate(job)
 
 
 @router.post("/{job_id}/update", response_model=JobContextResponse)
@@ -163,18 +119,7 @@ async def update_job(
     if not job:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    return JobContextResponse(
-        id=job.id,
-        job_title=job.job_title,
-        seniority=job.seniority,
-        required_skills=job.required_skills,
-        preferred_skills=job.preferred_skills,
-        experience_required=job.experience_required,
-        responsibilities=job.responsibilities,
-        domain=job.domain,
-        job_summary=job.job_summary,
-        created_at=job.created_at
-    )
+    return JobContextResponse.model_validate(job)
 
 
 @router.delete("/{job_id}")
@@ -231,20 +176,25 @@ async def delete_candidates_for_job(
         except Exception as e:
             logger.warning(f"Chroma deletion warning for candidates of job {job_id}: {e}")
 
-    # Delete files
-    deleted_files = 0
-    from pathlib import Path
-    for p in resume_paths:
-        if not p:
-            continue
-        pp = Path(p)
-        if pp.exists():
-            try:
-                pp.unlink()
-                deleted_files += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete resume file {p}: {e}")
+    # Delete files concurrently; unlinks are independent blocking syscalls
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_delete_resume_file, p) for p in resume_paths if p)
+    )
+    deleted_files = sum(results)
 
     # Also remove any score reports directly tied to the job (already handled in DB method)
 
     return {"deleted_candidate_count": len(candidate_ids), "deleted_files": deleted_files}
+
+
+def _delete_resume_file(path: str) -> bool:
+    """Delete a resume file, returning whether a file was removed."""
+    # A single unlink; a missing file surfaces as FileNotFoundError, no extra stat
+    try:
+        Path(path).unlink()
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        logger.warning(f"Failed to delete resume file {path}: {e}")
+        return False
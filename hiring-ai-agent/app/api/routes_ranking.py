@@ -1,14 +1,20 @@
 """
 Ranking API Routes - Endpoints for candidate ranking and assessment.
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel
-from typing import List, Optional
+import asyncio
+import hashlib
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from typing import Dict, List, Optional
 
 from app.models.score_report import ScoreReport, RankingReport
 from app.workflows.ranking_workflow import RankingWorkflow
 from app.workflows.assessment_workflow import AssessmentWorkflow
 from app.dependencies import get_ranking_workflow, get_assessment_workflow
+from app.utils.http_cache import etag_matches
+from app.utils.json_response import FastJSONResponse
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -47,6 +53,75 @@ class ScoreReportResponse(BaseModel):
     recommendation: Optional[str]
 
 
+# Fields emitted for a ScoreReport; response_model stays on the routes for the
+# OpenAPI schema, but handlers dump ScoreReport directly and serialize with orjson
+_SCORE_REPORT_FIELDS = set(ScoreReportResponse.model_fields)
+
+# Serializes a whole list of reports in one pydantic-core call
+_SCORE_REPORT_LIST_ADAPTER = TypeAdapter(List[ScoreReport])
+
+
+# Full re-rankings in flight, by job ID; repeat refreshes join the running one
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _get_or_start_refresh(job_id: str, workflow: RankingWorkflow) -> asyncio.Task:
+    """
+    Return the in-flight full re-ranking of a job, starting one if none is running.
+    
+    Runs on the event loop thread, so the check-then-insert needs no lock.
+    """
+    task = _refresh_tasks.get(job_id)
+    if task is None:
+        task = asyncio.create_task(
+            run_in_threadpool(workflow.rank_all_candidates, job_id, None, True)
+        )
+        _refresh_tasks[job_id] = task
+        task.add_done_callback(lambda t: _finish_refresh(job_id, t))
+    return task
+
+
+def _finish_refresh(job_id: str, task: asyncio.Task):
+    """Forget a finished re-ranking and log its failure, if any."""
+    _refresh_tasks.pop(job_id, None)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background ranking for {job_id} failed: {task.exception()}")
+
+
+# Rankings change only when reports are (re)generated, which gives them new IDs
+RANKING_CACHE_CONTROL = "private, max-age=60, stale-while-revalidate=300"
+
+
+def _ranking_etag(job_id: str, reports: List[ScoreReport]) -> str:
+    """
+    ETag identifying a set of score reports for a job.
+    
+    Built from the reports in ID order, so stored rankings and a ranking run
+    that returns the same reports (ties possibly ordered differently) agree.
+    """
+    digest = hashlib.blake2b(job_id.encode(), digest_size=16)
+    for report in sorted(reports, key=lambda r: r.id or ""):
+        digest.update(f"|{report.id}:{report.overall_score}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 response if the client already holds this version, else None."""
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": RANKING_CACHE_CONTROL}
+        )
+    return None
+
+
+def _score_report_dicts(reports: List[ScoreReport]) -> List[dict]:
+    """Dump score reports to JSON-ready dicts without re-validating them."""
+    return _SCORE_REPORT_LIST_ADAPTER.dump_python(
+        reports, mode='json', include={'__all__': _SCORE_REPORT_FIELDS}
+    )
+
+
 class RankingReportResponse(BaseModel):
     """API response for full ranking report."""
     job_id: str
@@ -56,9 +131,10 @@ class RankingReportResponse(BaseModel):
     top_candidates_summary: Optional[str]
 
 
-@router.get("/{job_id}", response_model=RankingReportResponse)
+@router.get("/{job_id}", response_model=RankingReportResponse, response_class=ORJSONResponse)
 async def get_rankings_for_job(
     job_id: str,
+    request: Request,
     top_k: Optional[int] = None,
     force_refresh: bool = False,
     workflow: RankingWorkflow = Depends(get_ranking_workflow)
@@ -72,40 +148,42 @@ async def get_rankings_for_job(
     3. Generates LLM analysis (strengths/weaknesses)
     4. Returns sorted results
     
-    Set force_refresh=true to regenerate all scores.
+    Set force_refresh=true to regenerate all scores; without top_k this joins
+    a refresh that is already running for the job. Responses carry an ETag.
+    Without force_refresh, an If-None-Match matching the stored rankings gets
+    304 before the pipeline runs, as long as every direct applicant is scored.
     """
     try:
-        report = workflow.rank_all_candidates(
-            job_id=job_id,
-            top_k=top_k,
-            force_refresh=force_refresh
-        )
+        if not force_refresh and request.headers.get("if-none-match"):
+            stored = await run_in_threadpool(workflow.get_stored_rankings, job_id, top_k)
+            if stored:
+                not_modified = _not_modified(request, _ranking_etag(job_id, stored))
+                if not_modified:
+                    return not_modified
         
-        return RankingReportResponse(
-            job_id=report.job_id,
-            job_title=report.job_title,
-            total_candidates=report.total_candidates,
-            rankings=[
-                ScoreReportResponse(
-                    id=r.id,
-                    candidate_id=r.candidate_id,
-                    job_id=r.job_id,
-                    candidate_name=r.candidate_name,
-                    overall_score=r.overall_score,
-                    skill_match_score=r.skill_match_score,
-                    experience_match_score=r.experience_match_score,
-                    semantic_similarity_score=r.semantic_similarity_score,
-                    matched_skills=r.matched_skills,
-                    missing_skills=r.missing_skills,
-                    strengths=r.strengths,
-                    weaknesses=r.weaknesses,
-                    reasoning=r.reasoning,
-                    recommendation=r.recommendation
-                )
-                for r in report.rankings
-            ],
-            top_candidates_summary=report.top_candidates_summary
-        )
+        if force_refresh and top_k is None:
+            # shield: a disconnecting client must not cancel a shared run
+            report = await asyncio.shield(_get_or_start_refresh(job_id, workflow))
+        else:
+            report = await run_in_threadpool(
+                workflow.rank_all_candidates,
+                job_id=job_id,
+                top_k=top_k,
+                force_refresh=force_refresh
+            )
+        
+        etag = _ranking_etag(job_id, report.rankings)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        
+        return ORJSONResponse({
+            "job_id": report.job_id,
+            "job_title": report.job_title,
+            "total_candidates": report.total_candidates,
+            "rankings": _score_report_dicts(report.rankings),
+            "top_candidates_summary": report.top_candidates_summary
+        }, headers={"ETag": etag, "Cache-Control": RANKING_CACHE_CONTROL})
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -117,7 +195,6 @@ async def get_rankings_for_job(
 @router.post("/{job_id}/refresh")
 async def refresh_rankings_for_job(
     job_id: str,
-    background_tasks: BackgroundTasks,
     workflow: RankingWorkflow = Depends(get_ranking_workflow)
 ):
     """
@@ -125,20 +202,24 @@ async def refresh_rankings_for_job(
 
     This starts the full ranking pipeline asynchronously and returns immediately.
     Use this when you want to precompute scores (e.g., after bulk upload) and
-    avoid recomputing on each frontend view.
+    avoid recomputing on each frontend view. While a refresh for the job is
+    still running, further requests do not start another one.
     """
     try:
-        # Schedule the ranking to run in background
-        background_tasks.add_task(workflow.rank_all_candidates, job_id, None, True)
+        if job_id in _refresh_tasks:
+            return {"status": "already_running", "job_id": job_id}
+        
+        _get_or_start_refresh(job_id, workflow)
         return {"status": "started", "job_id": job_id}
     except Exception as e:
         logger.error(f"Failed to start background ranking for {job_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{job_id}/top/{limit}", response_model=List[ScoreReportResponse])
+@router.get("/{job_id}/top/{limit}", response_model=List[ScoreReportResponse], response_class=ORJSONResponse)
 async def get_top_candidates(
     job_id: str,
+    request: Request,
     limit: int = 5,
     workflow: RankingWorkflow = Depends(get_ranking_workflow)
 ):
@@ -147,30 +228,20 @@ async def get_top_candidates(
     
     Returns the highest-scoring candidates based on existing rankings.
     """
-    reports = workflow.get_top_candidates(job_id, limit)
+    reports = await run_in_threadpool(workflow.get_top_candidates, job_id, limit)
     
-    return [
-        ScoreReportResponse(
-            id=r.id,
-            candidate_id=r.candidate_id,
-            job_id=r.job_id,
-            candidate_name=r.candidate_name,
-            overall_score=r.overall_score,
-            skill_match_score=r.skill_match_score,
-            experience_match_score=r.experience_match_score,
-            semantic_similarity_score=r.semantic_similarity_score,
-            matched_skills=r.matched_skills,
-            missing_skills=r.missing_skills,
-            strengths=r.strengths,
-            weaknesses=r.weaknesses,
-            reasoning=r.reasoning,
-            recommendation=r.recommendation
-        )
-        for r in reports
-    ]
+    etag = _ranking_etag(job_id, reports)
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    
+    return ORJSONResponse(
+        _score_report_dicts(reports),
+        headers={"ETag": etag, "Cache-Control": RANKING_CACHE_CONTROL}
+    )
 
 
-@router.get("/{job_id}/{candidate_id}", response_model=ScoreReportResponse)
+@router.get("/{job_id}/{candidate_id}", response_model=ScoreReportResponse, response_class=ORJSONResponse)
 async def get_candidate_score(
     job_id: str,
     candidate_id: str,
@@ -182,28 +253,14 @@ async def get_candidate_score(
     If not already scored, generates a new assessment.
     """
     try:
-        report = workflow.assess_candidate(
+        report = await run_in_threadpool(
+            workflow.assess_candidate,
             candidate_id=candidate_id,
             job_id=job_id,
             force_refresh=False
         )
         
-        return ScoreReportResponse(
-            id=report.id,
-            candidate_id=report.candidate_id,
-            job_id=report.job_id,
-            candidate_name=report.candidate_name,
-            overall_score=report.overall_score,
-            skill_match_score=report.skill_match_score,
-            experience_match_score=report.experience_match_score,
-            semantic_similarity_score=report.semantic_similarity_score,
-            matched_skills=report.matched_skills,
-            missing_skills=report.missing_skills,
-            strengths=report.strengths,
-            weaknesses=report.weaknesses,
-            reasoning=report.reasoning,
-            recommendation=report.recommendation
-        )
+        return ORJSONResponse(report.model_dump(mode='json', include=_SCORE_REPORT_FIELDS))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -211,7 +268,7 @@ async def get_candidate_score(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/assess", response_model=ScoreReportResponse)
+@router.post("/assess", response_model=ScoreReportResponse, response_class=ORJSONResponse)
 async def assess_candidate(
     request: AssessRequest,
     workflow: AssessmentWorkflow = Depends(get_assessment_workflow)
@@ -227,28 +284,14 @@ async def assess_candidate(
     - Recommendation (Interview/Maybe/Reject)
     """
     try:
-        report = workflow.assess_candidate(
+        report = await run_in_threadpool(
+            workflow.assess_candidate,
             candidate_id=request.candidate_id,
             job_id=request.job_id,
             force_refresh=request.force_refresh
         )
         
-        return ScoreReportResponse(
-            id=report.id,
-            candidate_id=report.candidate_id,
-            job_id=report.job_id,
-            candidate_name=report.candidate_name,
-            overall_score=report.overall_score,
-            skill_match_score=report.skill_match_score,
-            experience_match_score=report.experience_match_score,
-            semantic_similarity_score=report.semantic_similarity_score,
-            matched_skills=report.matched_skills,
-            missing_skills=report.missing_skills,
-            strengths=report.strengths,
-            weaknesses=report.weaknesses,
-            reasoning=report.reasoning,
-            recommendation=report.recommendation
-        )
+        return ORJSONResponse(report.model_dump(mode='json', include=_SCORE_REPORT_FIELDS))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -256,7 +299,7 @@ async def assess_candidate(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/compare")
+@router.post("/compare", response_class=FastJSONResponse)
 async def compare_candidates(
     request: CompareRequest,
     workflow: RankingWorkflow = Depends(get_ranking_workflow)
@@ -268,37 +311,19 @@ async def compare_candidates(
     a comparison with the best candidate highlighted.
     """
     try:
-        result = workflow.compare_candidates(
+        result = await workflow.compare_candidates_async(
             candidate_ids=request.candidate_ids,
             job_id=request.job_id
         )
         
-        return {
+        return FastJSONResponse({
             "job_id": result["job_id"],
             "job_title": result["job_title"],
             "candidates_compared": result["candidates_compared"],
-            "rankings": [
-                ScoreReportResponse(
-                    id=r.id,
-                    candidate_id=r.candidate_id,
-                    job_id=r.job_id,
-                    candidate_name=r.candidate_name,
-                    overall_score=r.overall_score,
-                    skill_match_score=r.skill_match_score,
-                    experience_match_score=r.experience_match_score,
-                    semantic_similarity_score=r.semantic_similarity_score,
-                    matched_skills=r.matched_skills,
-                    missing_skills=r.missing_skills,
-                    strengths=r.strengths,
-                    weaknesses=r.weaknesses,
-                    reasoning=r.reasoning,
-                    recommendation=r.recommendation
-                ).model_dump()
-                for r in result["rankings"]
-            ],
+            "rankings": _score_report_dicts(result["rankings"]),
             "best_candidate": result["best_candidate"].candidate_name if result["best_candidate"] else None,
             "summary": result["summary"]
-        }
+        })
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -1,10 +1,17 @@
 """
 Resume API Routes - Endpoints for resume upload and management.
 """
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+import anyio
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Optional
 
 from app.models.candidate import Candidate, CandidateResponse
@@ -16,13 +23,37 @@ from app.dependencies import (
     get_job_context_workflow,
     get_email_ingest_agent
 )
-from app.config import get_settings
+from app.config import get_settings, Settings
+from app.utils.http_cache import etag_matches
+from app.utils.json_response import FastJSONResponse
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/resume", tags=["Resumes"])
 
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Background GitHub enrichments by candidate ID, oldest first (bounded)
+_enrichment_jobs: "OrderedDict[str, dict]" = OrderedDict()
+ENRICHMENT_JOBS_MAX = 256
+_enrichment_jobs_lock = threading.Lock()  # Written from threadpool workers
+
+# Fields emitted for a candidate by the read endpoints (serialized with orjson)
+_CANDIDATE_FIELDS = set(CandidateResponse.model_fields)
+
+# Fields emitted by /{candidate_id}/full, nested models included
+_FULL_CANDIDATE_FIELDS = {
+    "id", "name", "email", "phone", "location", "headline", "summary", "skills",
+    "total_experience_years", "experience", "education", "projects", "certifications",
+    "github_url", "linkedin_url", "portfolio_url", "source", "is_linkedin_pdf",
+    "resume_file_path", "job_id", "created_at"
+}
+
+# Serializes a whole list of candidates in one pydantic-core call
+_CANDIDATE_LIST_ADAPTER = TypeAdapter(List[CandidateResponse])
+
 
 class EmailIngestResponse(BaseModel):
     """Response for email ingestion."""
@@ -34,7 +65,8 @@ class EmailIngestResponse(BaseModel):
 async def upload_resume(
     file: UploadFile = File(...),
     job_id: Optional[str] = None,
-    workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
+    workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Upload a resume PDF for processing.
@@ -49,43 +81,51 @@ async def upload_resume(
             detail="Only PDF files are supported"
         )
     
-    # Check file size
-    settings = get_settings()
+    # Stream to a temp file, enforcing the size limit as we go
     max_size = settings.max_file_size_mb * 1024 * 1024
     
-    content = await file.read()
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB"
-        )
-    
+    tmp = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
     try:
-        candidate = workflow.process_resume_bytes(
-            pdf_bytes=content,
-            source="upload",
-            job_id=job_id,
-            filename=file.filename
-        )
+        with tmp:
+            total = 0
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB"
+                    )
+                tmp.write(chunk)
         
-        return CandidateResponse(
-            id=candidate.id,
-            name=candidate.name,
-            email=candidate.email,
-            headline=candidate.headline,
-            skills=candidate.skills,
-            total_experience_years=candidate.total_experience_years,
-            summary=candidate.summary,
-            source=candidate.source,
-            job_id=candidate.job_id,
-            created_at=candidate.created_at
-        )
-    except Exception as e:
-        logger.error(f"Failed to process resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        try:
+            candidate = await run_in_threadpool(
+                workflow.process_resume_path,
+                file_path=tmp.name,
+                source="upload",
+                job_id=job_id,
+                filename=file.filename
+            )
+            
+            return CandidateResponse(
+                id=candidate.id,
+                name=candidate.name,
+                email=candidate.email,
+                headline=candidate.headline,
+                skills=candidate.skills,
+                total_experience_years=candidate.total_experience_years,
+                summary=candidate.summary,
+                source=candidate.source,
+                job_id=candidate.job_id,
+                created_at=candidate.created_at
+            )
+        except Exception as e:
+            logger.error(f"Failed to process resume: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        os.unlink(tmp.name)
 
 
-@router.get("/{candidate_id}", response_model=CandidateResponse)
+@router.get("/{candidate_id}", response_model=CandidateResponse, response_class=ORJSONResponse)
 async def get_candidate(
     candidate_id: str,
     workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
@@ -95,26 +135,15 @@ async def get_candidate(
     
     Returns the full candidate profile with extracted information.
     """
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
     
-    return CandidateResponse(
-        id=candidate.id,
-        name=candidate.name,
-        email=candidate.email,
-        headline=candidate.headline,
-        skills=candidate.skills,
-        total_experience_years=candidate.total_experience_years,
-        summary=candidate.summary,
-        source=candidate.source,
-        job_id=candidate.job_id,
-        created_at=candidate.created_at
-    )
+    return ORJSONResponse(candidate.model_dump(mode='json', include=_CANDIDATE_FIELDS))
 
 
-@router.get("/", response_model=List[CandidateResponse])
+@router.get("/", response_model=List[CandidateResponse], response_class=ORJSONResponse)
 async def list_candidates(
     job_id: Optional[str] = None,
     limit: int = 100,
@@ -125,23 +154,11 @@ async def list_candidates(
     
     Returns a list of candidate profiles.
     """
-    candidates = workflow.list_candidates(job_id=job_id, limit=limit)
-    
-    return [
-        CandidateResponse(
-            id=c.id,
-            name=c.name,
-            email=c.email,
-            headline=c.headline,
-            skills=c.skills,
-            total_experience_years=c.total_experience_years,
-            summary=c.summary,
-            source=c.source,
-            job_id=c.job_id,
-            created_at=c.created_at
-        )
-        for c in candidates
-    ]
+    candidates = await run_in_threadpool(
+        workflow.list_candidates_summary, job_id=job_id, limit=limit
+    )
+    
+    return ORJSONResponse(_CANDIDATE_LIST_ADAPTER.dump_python(candidates, mode='json'))
 
 
 @router.post("/email-ingest", response_model=EmailIngestResponse)
@@ -167,7 +184,7 @@ async def ingest_from_email(
     
     def process_email_resume(
         job_title: str,
-        pdf_bytes: bytes,
+        pdf_path: str,
         filename: str,
         sender: str,
         message_id: str
@@ -179,8 +196,8 @@ async def ingest_from_email(
             job = job_workflow.get_or_create_job(job_title)
             
             # Process resume
-            candidate = resume_workflow.process_resume_bytes(
-                pdf_bytes=pdf_bytes,
+            candidate = resume_workflow.process_resume_path(
+                file_path=pdf_path,
                 source="email",
                 job_id=job.id,
                 filename=filename
@@ -192,8 +209,8 @@ async def ingest_from_email(
         except Exception as e:
             logger.error(f"Failed to process email resume from {sender}: {e}")
     
-    # Run email polling
-    email_agent.poll_and_process(process_email_resume)
+    # Run email polling (IMAP, parsing and LLM calls all block)
+    await run_in_threadpool(email_agent.poll_and_process, process_email_resume)
     
     return EmailIngestResponse(
         message="Email ingestion complete",
@@ -201,7 +218,7 @@ async def ingest_from_email(
     )
 
 
-@router.get("/{candidate_id}/full")
+@router.get("/{candidate_id}/full", response_class=FastJSONResponse)
 async def get_candidate_full(
     candidate_id: str,
     workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
@@ -209,47 +226,29 @@ async def get_candidate_full(
     """
     Get full candidate details including experience, education, and projects.
     """
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
     
-    return {
-        "id": candidate.id,
-        "name": candidate.name,
-        "email": candidate.email,
-        "phone": candidate.phone,
-        "location": candidate.location,
-        "headline": candidate.headline,
-        "summary": candidate.summary,
-        "skills": candidate.skills,
-        "total_experience_years": candidate.total_experience_years,
-        "experience": [exp.model_dump() for exp in candidate.experience],
-        "education": [edu.model_dump() for edu in candidate.education],
-        "projects": [proj.model_dump() for proj in candidate.projects],
-        "certifications": candidate.certifications,
-        "github_url": candidate.github_url,
-        "linkedin_url": candidate.linkedin_url,
-        "portfolio_url": candidate.portfolio_url,
-        "source": candidate.source,
-        "is_linkedin_pdf": candidate.is_linkedin_pdf,
-        "resume_file_path": candidate.resume_file_path,
-        "job_id": candidate.job_id,
-        "created_at": candidate.created_at
-    }
+    return FastJSONResponse(
+        candidate.model_dump(mode='json', include=_FULL_CANDIDATE_FIELDS)
+    )
 
 
 @router.get("/{candidate_id}/download")
 async def download_resume(
     candidate_id: str,
+    request: Request,
     workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
 ):
     """
     Download the original resume PDF for a candidate.
     
-    Returns the PDF file if available.
+    Returns the PDF file if available, or 304 when the client's
+    If-None-Match still matches the stored file.
     """
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
@@ -262,12 +261,23 @@ async def download_resume(
     
     file_path = Path(candidate.resume_file_path)
     
-    if not file_path.exists():
+    # One stat serves the existence check, the ETag and FileResponse
+    try:
+        stat_result = await anyio.Path(file_path).stat()
+    except FileNotFoundError:
         raise HTTPException(
             status_code=404,
             detail="Resume file not found on disk"
         )
     
+    etag = '"' + hashlib.sha1(
+        f"{stat_result.st_mtime}-{stat_result.st_size}".encode()
+    ).hexdigest() + '"'
+    cache_headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+    
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=cache_headers)
+    
     # Create a safe filename
     safe_name = (candidate.name or "resume").replace(" ", "_")
     filename = f"{safe_name}_{candidate_id}.pdf"
@@ -275,7 +285,9 @@ async def download_resume(
     return FileResponse(
         path=file_path,
         filename=filename,
-        media_type="application/pdf"
+        media_type="application/pdf",
+        stat_result=stat_result,
+        headers=cache_headers
     )
 
 
@@ -288,13 +300,14 @@ async def delete_candidate(
     Delete a candidate, their score reports, associated resume file, and remove embedding from Chroma.
     """
     # Ensure candidate exists
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
 
     # Remove embedding from chroma
     try:
-        workflow.chroma.delete(
+        await run_in_threadpool(
+            workflow.chroma.delete,
             collection_name=workflow.settings.chroma_collection_candidates,
             ids=[candidate_id]
         )
@@ -302,37 +315,41 @@ async def delete_candidate(
         logger.warning(f"Chroma deletion warning for candidate {candidate_id}: {e}")
 
     # Delete DB rows and get resume path
-    resume_path = workflow.db.delete_candidate(candidate_id)
+    resume_path = await run_in_threadpool(workflow.db.delete_candidate, candidate_id)
 
     # Delete file if present
     deleted_file = False
     if resume_path:
-        p = Path(resume_path)
-        if p.exists():
-            try:
-                p.unlink()
-                deleted_file = True
-            except Exception as e:
-                logger.warning(f"Failed to delete resume file {resume_path}: {e}")
+        try:
+            await anyio.Path(resume_path).unlink()
+            deleted_file = True
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to delete resume file {resume_path}: {e}")
 
     return {"deleted": True, "deleted_file": deleted_file}
 
 
-@router.post("/{candidate_id}/enrich-github")
+@router.post("/{candidate_id}/enrich-github", response_class=FastJSONResponse)
 async def enrich_candidate_github(
     candidate_id: str,
+    background_tasks: BackgroundTasks,
     github_url: Optional[str] = None,
+    run_async: bool = Query(False, alias="async"),
     workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
 ):
     """
     Manually enrich a candidate with GitHub profile analysis.
     
     If github_url is not provided, will try to extract it from the resume text.
+    With async=true the enrichment runs in the background and the response is
+    202 with a result_url to poll.
     
     Returns:
         GitHub analysis data and updated candidate skills
     """
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
@@ -354,29 +371,93 @@ async def enrich_candidate_github(
             detail="No GitHub URL found in resume. Please provide github_url parameter."
         )
     
-    # Analyze GitHub profile
-    analysis = resume_agent.analyze_github_profile(candidate.github_url)
+    if run_async:
+        _record_enrichment(candidate_id, {"status": "running"})
+        background_tasks.add_task(_run_enrichment_job, workflow, candidate)
+        return FastJSONResponse({
+            "status": "accepted",
+            "candidate_id": candidate_id,
+            "result_url": f"{router.prefix}/{candidate_id}/enrich-github/status"
+        }, status_code=202)
+    
+    # GitHub and LLM calls block, so keep them off the event loop
+    try:
+        result = await run_in_threadpool(_enrich_with_github, workflow, candidate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return FastJSONResponse(result)
+
+
+@router.get("/{candidate_id}/enrich-github/status", response_class=FastJSONResponse)
+async def get_enrichment_status(candidate_id: str):
+    """
+    Poll a background GitHub enrichment started with async=true.
+    
+    Returns:
+        status ("running", "complete" or "failed") and, once complete, the
+        same payload as the synchronous endpoint
+    """
+    with _enrichment_jobs_lock:
+        job = _enrichment_jobs.get(candidate_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No GitHub enrichment recorded for candidate {candidate_id}"
+        )
+    return FastJSONResponse(job)
+
+
+def _enrich_with_github(workflow: ResumeIngestionWorkflow, candidate: Candidate) -> dict:
+    """
+    Analyze the candidate's GitHub profile, enrich and store the candidate.
     
+    Raises:
+        ValueError: If the GitHub analysis failed
+    """
+    resume_agent = workflow.resume_agent
+    analysis = resume_agent.analyze_github_profile(candidate.github_url)
     if 'error' in analysis:
-        raise HTTPException(status_code=400, detail=analysis['error'])
+        raise ValueError(analysis['error'])
     
-    # Enrich candidate
-    enriched = resume_agent.enrich_candidate_with_github(candidate)
+    # Enrichment mutates the candidate, so count before it runs
+    skills_before = len(candidate.skills)
+    projects_before = len(candidate.projects)
     
-    # Update in database
+    # Re-reads the analysis from the agent's cache
+    enriched = resume_agent.enrich_candidate_with_github(candidate)
     workflow.db.update_candidate(enriched)
     
     return {
         "message": "GitHub enrichment complete",
-        "candidate_id": candidate_id,
+        "candidate_id": candidate.id,
         "github_analysis": analysis,
-        "new_skills_added": len(enriched.skills) - len(candidate.skills),
-        "projects_added": len(enriched.projects) - len(candidate.projects),
+        "new_skills_added": len(enriched.skills) - skills_before,
+        "projects_added": len(enriched.projects) - projects_before,
         "updated_summary": enriched.summary
     }
 
 
-@router.get("/{candidate_id}/github-analysis")
+def _run_enrichment_job(workflow: ResumeIngestionWorkflow, candidate: Candidate):
+    """Background task body for async enrichment; records the outcome."""
+    try:
+        result = _enrich_with_github(workflow, candidate)
+        _record_enrichment(candidate.id, {"status": "complete", **result})
+    except Exception as e:
+        logger.error(f"Background GitHub enrichment failed for {candidate.id}: {e}")
+        _record_enrichment(candidate.id, {"status": "failed", "error": str(e)})
+
+
+def _record_enrichment(candidate_id: str, job: dict):
+    """Store an enrichment status, evicting the oldest beyond ENRICHMENT_JOBS_MAX."""
+    with _enrichment_jobs_lock:
+        _enrichment_jobs[candidate_id] = job
+        _enrichment_jobs.move_to_end(candidate_id)
+        while len(_enrichment_jobs) > ENRICHMENT_JOBS_MAX:
+            _enrichment_jobs.popitem(last=False)
+
+
+@router.get("/{candidate_id}/github-analysis", response_class=FastJSONResponse)
 async def get_github_analysis(
     candidate_id: str,
     workflow: ResumeIngestionWorkflow = Depends(get_resume_ingestion_workflow)
@@ -386,7 +467,7 @@ async def get_github_analysis(
     
     Fetches fresh data from GitHub API.
     """
-    candidate = workflow.get_candidate(candidate_id)
+    candidate = await run_in_threadpool(workflow.get_candidate, candidate_id)
     
     if not candidate:
         raise HTTPException(status_code=404, detail=f"Candidate {candidate_id} not found")
@@ -398,13 +479,13 @@ async def get_github_analysis(
         )
     
     resume_agent = workflow.resume_agent
-    analysis = resume_agent.analyze_github_profile(candidate.github_url)
+    analysis = await run_in_threadpool(resume_agent.analyze_github_profile, candidate.github_url)
     
     if 'error' in analysis:
         raise HTTPException(status_code=400, detail=analysis['error'])
     
     # Generate summary
-    summary = resume_agent.generate_github_summary(analysis)
+    summary = await run_in_threadpool(resume_agent.generate_github_summary, analysis)
     analysis['ai_summary'] = summary
     
-    return analysis
+    return FastJSONResponse(analysis)
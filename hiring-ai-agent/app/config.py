@@ -3,10 +3,13 @@ Application configuration settings.
 Loads environment variables and provides centralized config access.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field
+from typing import Optional, Tuple
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
+
+from app.utils.regex_utils import compile_pattern
 
 
 class Settings(BaseSettings):
@@ -28,6 +31,8 @@ class Settings(BaseSettings):
     chroma_persist_dir: str = "data/chroma_db"
     chroma_collection_jobs: str = "job_contexts"
     chroma_collection_candidates: str = "candidates"
+    chroma_write_batch_size: int = 32  # Embedding adds written per batch (1 disables batching)
+    chroma_write_max_delay_seconds: float = 2.0  # Oldest a buffered embedding gets before a write
     
     # Email settings (for IMAP polling)
     email_enabled: bool = False
@@ -36,7 +41,15 @@ class Settings(BaseSettings):
     email_password: Optional[str] = None  # Gmail App Password
     email_folder: str = "INBOX"
     email_subject_pattern: str = r"^JOB\s*-\s*(.+?)\s*-\s*APPLICATION$"
+    # Server-side SUBJECT filters; every matching subject must contain all of these
+    email_subject_search_terms: Tuple[str, ...] = ("JOB", "APPLICATION")
     email_poll_interval_minutes: int = 5
+    email_idle: bool = False  # Also listen with IMAP IDLE for near-instant pickup
+    email_fetch_pool_size: int = 3  # IMAP sessions for parallel attachment downloads
+    email_processed_retention_days: int = 30  # How long processed Message-IDs are remembered
+    
+    # GitHub API (optional; a token enables the single-request GraphQL lookup)
+    github_token: Optional[str] = None
     
     # File storage
     # Base data directory (used for resumes, uploads, chroma, etc.)
@@ -49,23 +62,57 @@ class Settings(BaseSettings):
     weight_skill_match: float = 0.35
     weight_experience_match: float = 0.25
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"
+    # LLM evaluation
+    llm_eval_batch_size: int = 5  # Candidates per evaluation call when ranking
+    llm_max_concurrency: int = 8  # Concurrent evaluation calls when ranking
+    llm_eval_always: bool = False  # Skip the template shortcut for scores >= 95 or < 30
+    llm_eval_cache_size: int = 2048  # Cached LLM evaluations (0 disables the cache)
+    llm_eval_cache_similarity: float = 0.95  # Min candidate/job cosine similarity to reuse one
+    
+    # Worker threads for blocking work (sync handlers, run_in_threadpool, asyncio.to_thread)
+    threadpool_size: int = Field(default_factory=lambda: min(32, (os.cpu_count() or 1) * 4))
+    
+    # Score report cache
+    cache_backend: str = "sqlite"  # "sqlite" or "none"
+    cache_ttl_hours: int = 168
+    
+    @field_validator("email_subject_pattern")
+    @classmethod
+    def _check_subject_pattern(cls, value: str) -> str:
+        """Fail at startup on a pattern that won't compile or has no job title group."""
+        if compile_pattern(value).groups < 1:
+            raise ValueError("email_subject_pattern must capture the job title in group 1")
+        return value
+    
+    @property
+    def email_subject_re(self):
+        """email_subject_pattern compiled once (RE2 when available, case-insensitive)."""
+        return _compile_subject_pattern(self.email_subject_pattern)
+    
+    # Frozen: shared via get_settings() and never mutated at runtime
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        extra="ignore",
+        frozen=True
+    )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=8)
+def _compile_subject_pattern(pattern: str):
+    """Compile an email subject pattern, memoized per pattern."""
+    return compile_pattern(pattern, ignore_case=True)
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the application settings."""
-    return settings
+    """Get the application settings (parsed from the environment once)."""
+    return Settings()
 
 
 def ensure_directories():
     """Ensure required directories exist."""
+    settings = get_settings()
     dirs = [
         settings.chroma_persist_dir,
         settings.upload_dir,
@@ -15,6 +15,8 @@ CREATE TABLE IF NOT EXISTS jobs (
     domain TEXT,
     job_summary TEXT,
     raw_text TEXT,
+    raw_text_hash TEXT,  -- SHA-256 of raw_text
+    raw_text_len INTEGER,
     location TEXT,
     remote_policy TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -85,11 +87,35 @@ CREATE TABLE IF NOT EXISTS email_log (
     error_message TEXT
 );
 
+-- Score report cache, keyed by a hash of everything that determines a report
+CREATE TABLE IF NOT EXISTS score_cache (
+    cache_key TEXT PRIMARY KEY,
+    report TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_candidates_job_id ON candidates(job_id);
 CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
 CREATE INDEX IF NOT EXISTS idx_score_reports_job_id ON score_reports(job_id);
 CREATE INDEX IF NOT EXISTS idx_score_reports_candidate_id ON score_reports(candidate_id);
 CREATE INDEX IF NOT EXISTS idx_score_reports_score ON score_reports(overall_score DESC);
+CREATE INDEX IF NOT EXISTS idx_score_reports_job_score ON score_reports(job_id, overall_score DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_score_reports_candidate_job ON score_reports(candidate_id, job_id);
 CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(job_title);
+CREATE INDEX IF NOT EXISTS idx_jobs_title_lower ON jobs(LOWER(job_title), created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_email_log_message_id ON email_log(message_id);
+
+-- Cascade deletes to score reports (triggers rather than ON DELETE CASCADE,
+-- which would need existing tables rebuilt and foreign keys enforced)
+CREATE TRIGGER IF NOT EXISTS trg_candidates_delete_score_reports
+AFTER DELETE ON candidates
+BEGIN
+    DELETE FROM score_reports WHERE candidate_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_jobs_delete_score_reports
+AFTER DELETE ON jobs
+BEGIN
+    DELETE FROM score_reports WHERE job_id = OLD.id;
+END;
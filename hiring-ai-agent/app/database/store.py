@@ -1,22 +1,219 @@
 """
 Database Store - SQLite operations for persistent storage.
 """
-import json
 import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import uuid
 
-from app.models.job_context import JobContext
-from app.models.candidate import Candidate
+import orjson
+from pydantic import BaseModel
+
+from app.models.job_context import JobContext, hash_raw_text
+from app.models.candidate import Candidate, CandidateResponse, Education, Experience, Project
 from app.models.score_report import ScoreReport
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _model_default(obj: Any) -> Any:
+    """orjson hook: dump nested pydantic models (experience, education, projects)."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type {type(obj).__name__} is not JSON serializable")
+
+
+_EMPTY_LIST = b'[]'
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize a JSON column value with orjson.
+    
+    The bytes are stored as a BLOB as-is (a TEXT column keeps BLOB values),
+    skipping the UTF-8 decode on write and the text conversion on read.
+    Empty lists, the common case for most columns, skip the encoder.
+    """
+    if not obj and isinstance(obj, list):
+        return _EMPTY_LIST
+    return orjson.dumps(obj, default=_model_default)
+
+
+def _loads(value: Any) -> Any:
+    """
+    Deserialize a JSON list column; NULL and empty lists skip the decoder.
+    
+    Accepts bytes (BLOB rows) and str (rows written as TEXT before).
+    """
+    if not value or value == _EMPTY_LIST or value == '[]':
+        return []
+    return orjson.loads(value)
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a CURRENT_TIMESTAMP column (UTC, stored without an offset) as aware UTC."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+# Rows pulled per fetchmany() when converting large result sets
+FETCH_BATCH_SIZE = 256
+
+
+def _iter_rows(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
+    """
+    Yield a cursor's rows in fetchmany batches.
+    
+    Converting rows while fetching keeps only one batch of raw rows alive
+    next to the models being built, instead of the whole fetchall() list.
+    """
+    while True:
+        batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not batch:
+            return
+        yield from batch
+
+# Applied once to the shared (write) connection. page_size only takes effect
+# on a new database (it must precede WAL); mmap reads pages straight from the
+# OS page cache instead of through read() calls
+CONNECTION_PRAGMAS = """
+PRAGMA page_size=8192;
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-131072;
+PRAGMA mmap_size=1073741824;
+"""
+
+# Applied to each per-thread read-only connection (WAL is a property of the
+# file); the mapping is shared through the OS, the page cache is per connection
+READ_CONNECTION_PRAGMAS = """
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-16384;
+PRAGMA mmap_size=1073741824;
+"""
+
+# Prepared statements kept per connection (sqlite3 default: 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Jobs/candidates kept in the in-process read cache (each)
+MODEL_CACHE_SIZE = 1024
+
+# Job columns: everything but the (large) original JD text, whose digest
+# and length are stored alongside it
+_JOB_COLUMNS = """
+    id, job_title, seniority, required_skills, preferred_skills, experience_required,
+    experience_min_years, experience_max_years, responsibilities, domain, job_summary,
+    raw_text_hash, raw_text_len, location, remote_policy, created_at, updated_at
+"""
+
+# Returns the stored row (DB timestamps included) without the raw text
+_INSERT_JOB_SQL = f"""
+    INSERT INTO jobs (
+        id, job_title, seniority, required_skills, preferred_skills,
+        experience_required, experience_min_years, experience_max_years,
+        responsibilities, domain, job_summary, raw_text, raw_text_hash,
+        raw_text_len, location, remote_policy
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    RETURNING {_JOB_COLUMNS}
+"""
+
+# Hot lookups, kept as constants so every call reuses one prepared statement
+_SELECT_JOB_SQL = f"SELECT {_JOB_COLUMNS} FROM jobs WHERE id = ?"
+_SELECT_JOB_BY_TITLE_SQL = (
+    f"SELECT {_JOB_COLUMNS} FROM jobs WHERE LOWER(job_title) = LOWER(?) "
+    "ORDER BY created_at DESC LIMIT 1"
+)
+_SELECT_CANDIDATE_SQL = "SELECT * FROM candidates WHERE id = ?"
+_SELECT_SCORE_REPORT_SQL = "SELECT * FROM score_reports WHERE candidate_id = ? AND job_id = ?"
+_SELECT_RANKINGS_SQL = "SELECT * FROM score_reports WHERE job_id = ? ORDER BY overall_score DESC"
+_SELECT_TOP_RANKINGS_SQL = _SELECT_RANKINGS_SQL + " LIMIT ?"
+_SELECT_EMAIL_LOG_SQL = "SELECT id FROM email_log WHERE message_id = ?"
+
+_SCORE_REPORT_COLUMNS = (
+    "id", "candidate_id", "job_id", "candidate_name", "overall_score",
+    "skill_match_score", "experience_match_score", "semantic_similarity_score",
+    "matched_skills", "missing_skills", "extra_skills", "strengths", "weaknesses",
+    "reasoning", "recommendation", "created_at"
+)
+
+# Candidate columns behind CandidateResponse
+_CANDIDATE_SUMMARY_COLUMNS = """
+    id, name, email, headline, skills, total_experience_years, summary, source, job_id, created_at
+"""
+
+
+_INSERT_CANDIDATE_SQL = """
+    INSERT INTO candidates (
+        id, name, email, phone, location, headline, skills,
+        experience, education, projects, certifications,
+        total_experience_years, summary, github_url, linkedin_url,
+        portfolio_url, source, is_linkedin_pdf, raw_text, resume_file_path, job_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Single-row insert that hands back the stored row (executemany cannot use RETURNING)
+_INSERT_CANDIDATE_RETURNING_SQL = _INSERT_CANDIDATE_SQL + "    RETURNING *\n"
+
+_INSERT_SCORE_REPORT_SQL = """
+    INSERT INTO score_reports (
+        id, candidate_id, job_id, candidate_name, overall_score,
+        skill_match_score, experience_match_score, semantic_similarity_score,
+        matched_skills, missing_skills, extra_skills,
+        strengths, weaknesses, reasoning, recommendation
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(candidate_id, job_id) DO UPDATE SET
+        id = excluded.id,
+        candidate_name = excluded.candidate_name,
+        overall_score = excluded.overall_score,
+        skill_match_score = excluded.skill_match_score,
+        experience_match_score = excluded.experience_match_score,
+        semantic_similarity_score = excluded.semantic_similarity_score,
+        matched_skills = excluded.matched_skills,
+        missing_skills = excluded.missing_skills,
+        extra_skills = excluded.extra_skills,
+        strengths = excluded.strengths,
+        weaknesses = excluded.weaknesses,
+        reasoning = excluded.reasoning,
+        recommendation = excluded.recommendation,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+
+class _ReadConnection:
+    """
+    A thread's read-only connection, held only by that thread's local storage.
+    
+    When the thread exits its locals are dropped and the finalizer closes the
+    connection, so short-lived worker threads don't leave connections behind.
+    """
+    
+    __slots__ = ("conn", "__weakref__")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        weakref.finalize(self, conn.close)
+
+
+class _ModelCache(OrderedDict):
+    """
+    LRU map of cached models with a generation counter.
+    
+    The generation is bumped on every invalidation, so a reader that loaded
+    a row before a concurrent write can tell its copy may be stale.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.generation = 0
+
+
 class DatabaseStore:
     """
     SQLite database operations for jobs, candidates, and scores.
@@ -34,24 +231,145 @@ class DatabaseStore:
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
+        # One write connection for the process, serialized by a lock: SQLite
+        # has a single writer anyway, and opening a connection per call
+        # re-reads the schema and cold-starts the page cache
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(CONNECTION_PRAGMAS)
+        
+        # Reads use a read-only connection per thread, so under WAL they run
+        # in parallel with each other and with the writer; each is closed when
+        # its thread exits (the weak set only lets close() reach live ones)
+        self._local = threading.local()
+        self._read_conns: "weakref.WeakSet[_ReadConnection]" = weakref.WeakSet()
+        self._shared_reads = db_path == ":memory:"
+        
+        # Read-through caches for get_job/get_candidate, invalidated on writes;
+        # plus lowercased title -> job ID for get_job_by_title
+        self._job_cache = _ModelCache()
+        self._candidate_cache = _ModelCache()
+        self._job_title_index: Dict[str, str] = {}
+        
         # Initialize schema
         self._init_schema()
         
+        # Message IDs already in email_log, so rescans of known mail skip SQL
+        with self._read_connection() as conn:
+            self._seen_message_ids = {
+                row['message_id'] for row in conn.execute(
+                    "SELECT message_id FROM email_log WHERE message_id IS NOT NULL"
+                )
+            }
+        
         logger.info(f"Initialized database at: {db_path}")
     
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Context manager yielding the shared connection; one transaction per block."""
+        with self._lock:
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+    
+    @contextmanager
+    def _read_connection(self):
+        """Context manager yielding this thread's read-only connection."""
+        if self._shared_reads:
+            with self._get_connection() as conn:
+                yield conn
+            return
+        
+        holder = getattr(self._local, "reader", None)
+        if holder is None:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(
+                uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.row_factory = sqlite3.Row
+            conn.executescript(READ_CONNECTION_PRAGMAS)
+            holder = _ReadConnection(conn)
+            self._local.reader = holder
+            with self._lock:
+                self._read_conns.add(holder)
+        yield holder.conn
+    
+    def close(self):
+        """Close the write connection and every live read connection."""
+        with self._lock:
+            self._conn.close()
+            for holder in list(self._read_conns):
+                holder.conn.close()
+            self._read_conns.clear()
+    
+    def _cache_get(self, cache: _ModelCache, key: str) -> Optional[BaseModel]:
+        """Return a copy of a cached model (callers may mutate what they get)."""
+        with self._lock:
+            model = cache.get(key)
+            if model is None:
+                return None
+            cache.move_to_end(key)
+            return model.model_copy(deep=True)
+    
+    def _cache_generation(self, cache: _ModelCache) -> int:
+        """
+        Snapshot a cache's generation; take it before reading the row to cache.
+        
+        Invalidations run inside write transactions, so holding the lock here
+        means a write is either fully committed or not yet started.
+        """
+        with self._lock:
+            return cache.generation
+    
+    def _cache_put(
+        self,
+        cache: _ModelCache,
+        key: str,
+        model: BaseModel,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Cache a copy of a model, evicting the least recently used entry.
+        
+        Args:
+            cache: Cache to fill
+            key: Model ID
+            model: Model to cache
+            generation: Snapshot from _cache_generation taken before the model
+                was read; if the cache was invalidated since, nothing is cached.
+                Omit for models read inside the writing transaction.
+        
+        Returns:
+            Whether the model was cached
+        """
+        with self._lock:
+            if generation is not None and generation != cache.generation:
+                return False
+            cache[key] = model.model_copy(deep=True)
+            cache.move_to_end(key)
+            while len(cache) > MODEL_CACHE_SIZE:
+                cache.popitem(last=False)
+            return True
+    
+    def _cache_invalidate(self, cache: _ModelCache, *keys: str):
+        """Drop models from a cache and fence off reads already in flight."""
+        with self._lock:
+            cache.generation += 1
+            for key in keys:
+                cache.pop(key, None)
+    
+    def _forget_job(self, job_id: str):
+        """Drop a job from the read cache and the title index."""
+        with self._lock:
+            self._cache_invalidate(self._job_cache, job_id)
+            for title in [t for t, j in self._job_title_index.items() if j == job_id]:
+                del self._job_title_index[title]
     
     def _init_schema(self):
         """Initialize database schema."""
@@ -65,7 +383,55 @@ class DatabaseStore:
             schema_sql = self._get_inline_schema()
         
         with self._get_connection() as conn:
+            self._dedupe_score_reports(conn)
             conn.executescript(schema_sql)
+            self._add_missing_columns(conn)
+    
+    def _add_missing_columns(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database was created."""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(candidates)")}
+        if 'resume_file_path' not in columns:
+            conn.execute("ALTER TABLE candidates ADD COLUMN resume_file_path TEXT")
+            logger.info("Added candidates.resume_file_path column")
+        
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+        if 'raw_text_hash' not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN raw_text_hash TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN raw_text_len INTEGER")
+            # Existing jobs: digest the stored text once, here
+            rows = conn.execute(
+                "SELECT id, raw_text FROM jobs WHERE raw_text IS NOT NULL AND raw_text != ''"
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET raw_text_hash = ?, raw_text_len = ? WHERE id = ?",
+                [(hash_raw_text(row['raw_text']), len(row['raw_text']), row['id']) for row in rows]
+            )
+            logger.info(f"Added jobs.raw_text_hash/raw_text_len columns ({len(rows)} jobs backfilled)")
+    
+    def _dedupe_score_reports(self, conn: sqlite3.Connection):
+        """
+        Keep only the newest report per candidate-job pair.
+        
+        Databases created before idx_score_reports_candidate_job may hold
+        duplicates, which would make creating the unique index fail.
+        """
+        exists = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?",
+            ("idx_score_reports_candidate_job",)
+        ).fetchone()
+        has_table = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'score_reports'"
+        ).fetchone()
+        if exists or not has_table:
+            return
+        
+        cur = conn.execute("""
+            DELETE FROM score_reports WHERE rowid NOT IN (
+                SELECT MAX(rowid) FROM score_reports GROUP BY candidate_id, job_id
+            )
+        """)
+        if cur.rowcount:
+            logger.info(f"Removed {cur.rowcount} duplicate score reports")
     
     def _get_inline_schema(self) -> str:
         """Get inline schema definition."""
@@ -84,6 +450,8 @@ class DatabaseStore:
             domain TEXT,
             job_summary TEXT,
             raw_text TEXT,
+            raw_text_hash TEXT,
+            raw_text_len INTEGER,
             location TEXT,
             remote_policy TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -154,12 +522,35 @@ class DatabaseStore:
             error_message TEXT
         );
         
+        -- Score report cache
+        CREATE TABLE IF NOT EXISTS score_cache (
+            cache_key TEXT PRIMARY KEY,
+            report TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        
         -- Indexes
         CREATE INDEX IF NOT EXISTS idx_candidates_job_id ON candidates(job_id);
         CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates(email);
         CREATE INDEX IF NOT EXISTS idx_score_reports_job_id ON score_reports(job_id);
         CREATE INDEX IF NOT EXISTS idx_score_reports_candidate_id ON score_reports(candidate_id);
+        CREATE INDEX IF NOT EXISTS idx_score_reports_job_score ON score_reports(job_id, overall_score DESC);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_score_reports_candidate_job ON score_reports(candidate_id, job_id);
         CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(job_title);
+        CREATE INDEX IF NOT EXISTS idx_jobs_title_lower ON jobs(LOWER(job_title), created_at DESC);
+        
+        -- Cascade deletes to score reports
+        CREATE TRIGGER IF NOT EXISTS trg_candidates_delete_score_reports
+        AFTER DELETE ON candidates
+        BEGIN
+            DELETE FROM score_reports WHERE candidate_id = OLD.id;
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS trg_jobs_delete_score_reports
+        AFTER DELETE ON jobs
+        BEGIN
+            DELETE FROM score_reports WHERE job_id = OLD.id;
+        END;
         """
     
     # ============ Job Operations ============
@@ -177,28 +568,30 @@ class DatabaseStore:
         job_id = job.id or f"JOB-{uuid.uuid4().hex[:8].upper()}"
         
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO jobs (
-                    id, job_title, seniority, required_skills, preferred_skills,
-                    experience_required, experience_min_years, experience_max_years,
-                    responsibilities, domain, job_summary, raw_text, location, remote_policy
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            row = conn.execute(_INSERT_JOB_SQL, (
                 job_id,
                 job.job_title,
                 job.seniority,
-                json.dumps(job.required_skills),
-                json.dumps(job.preferred_skills),
+                _dumps(job.required_skills),
+                _dumps(job.preferred_skills),
                 job.experience_required,
                 job.experience_min_years,
                 job.experience_max_years,
-                json.dumps(job.responsibilities),
+                _dumps(job.responsibilities),
                 job.domain,
                 job.job_summary,
                 job.raw_text,
+                job.raw_text_hash,
+                job.raw_text_len,
                 job.location,
                 job.remote_policy
-            ))
+            )).fetchone()
+            
+            # The stored row (DB timestamps included) primes the read cache;
+            # newest job wins a title lookup, same as the SQL fallback
+            self._forget_job(job_id)
+            self._cache_put(self._job_cache, job_id, self._row_to_job(row))
+            self._job_title_index[job.job_title.lower()] = job_id
         
         logger.info(f"Created job: {job_id}")
         return job_id
@@ -213,15 +606,20 @@ class DatabaseStore:
         Returns:
             JobContext or None
         """
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM jobs WHERE id = ?", (job_id,)
-            ).fetchone()
+        job = self._cache_get(self._job_cache, job_id)
+        if job is not None:
+            return job
+        
+        generation = self._cache_generation(self._job_cache)
+        with self._read_connection() as conn:
+            row = conn.execute(_SELECT_JOB_SQL, (job_id,)).fetchone()
         
         if not row:
             return None
         
-        return self._row_to_job(row)
+        job = self._row_to_job(row)
+        self._cache_put(self._job_cache, job_id, job, generation)
+        return job
     
     def get_job_by_title(self, title: str) -> Optional[JobContext]:
         """
@@ -233,45 +631,60 @@ class DatabaseStore:
         Returns:
             JobContext or None
         """
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM jobs WHERE LOWER(job_title) = LOWER(?) ORDER BY created_at DESC LIMIT 1",
-                (title,)
-            ).fetchone()
+        job_id = self._job_title_index.get(title.lower())
+        if job_id:
+            job = self.get_job(job_id)
+            if job:
+                return job
+        
+        generation = self._cache_generation(self._job_cache)
+        with self._read_connection() as conn:
+            row = conn.execute(_SELECT_JOB_BY_TITLE_SQL, (title,)).fetchone()
         
         if not row:
             return None
         
-        return self._row_to_job(row)
+        job = self._row_to_job(row)
+        # Under the lock, as _forget_job walks the index
+        with self._lock:
+            if self._cache_put(self._job_cache, job.id, job, generation):
+                self._job_title_index[title.lower()] = job.id
+        return job
     
     def list_jobs(self, limit: int = 100) -> List[JobContext]:
-        """List all jobs."""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
-            ).fetchall()
-        
-        return [self._row_to_job(row) for row in rows]
+        """List all jobs (without their raw text)."""
+        with self._read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            )
+            return [self._row_to_job(row) for row in _iter_rows(cursor)]
     
     def _row_to_job(self, row: sqlite3.Row) -> JobContext:
-        """Convert database row to JobContext."""
-        return JobContext(
+        """
+        Convert database row to JobContext (without the raw JD text).
+        
+        Rows were validated when written, so the model is constructed without
+        re-running validation; only the timestamps need parsing.
+        """
+        created_at, updated_at = row['created_at'], row['updated_at']
+        return JobContext.model_construct(
             id=row['id'],
             job_title=row['job_title'],
             seniority=row['seniority'],
-            required_skills=json.loads(row['required_skills'] or '[]'),
-            preferred_skills=json.loads(row['preferred_skills'] or '[]'),
+            required_skills=_loads(row['required_skills']),
+            preferred_skills=_loads(row['preferred_skills']),
             experience_required=row['experience_required'],
             experience_min_years=row['experience_min_years'],
             experience_max_years=row['experience_max_years'],
-            responsibilities=json.loads(row['responsibilities'] or '[]'),
+            responsibilities=_loads(row['responsibilities']),
             domain=row['domain'],
             job_summary=row['job_summary'],
-            raw_text=row['raw_text'],
+            raw_text_hash=row['raw_text_hash'],
+            raw_text_len=row['raw_text_len'],
             location=row['location'],
             remote_policy=row['remote_policy'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
+            created_at=_parse_timestamp(created_at),
+            updated_at=_parse_timestamp(updated_at)
         )
     
     # ============ Candidate Operations ============
@@ -289,55 +702,87 @@ class DatabaseStore:
         candidate_id = candidate.id or f"CAND-{uuid.uuid4().hex[:8].upper()}"
         
         with self._get_connection() as conn:
-            conn.execute("""
-                INSERT INTO candidates (
-                    id, name, email, phone, location, headline, skills,
-                    experience, education, projects, certifications,
-                    total_experience_years, summary, github_url, linkedin_url,
-                    portfolio_url, source, is_linkedin_pdf, raw_text, resume_file_path, job_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                candidate_id,
-                candidate.name,
-                candidate.email,
-                candidate.phone,
-                candidate.location,
-                candidate.headline,
-                json.dumps(candidate.skills),
-                json.dumps([exp.model_dump() for exp in candidate.experience]),
-                json.dumps([edu.model_dump() for edu in candidate.education]),
-                json.dumps([proj.model_dump() for proj in candidate.projects]),
-                json.dumps(candidate.certifications),
-                candidate.total_experience_years,
-                candidate.summary,
-                candidate.github_url,
-                candidate.linkedin_url,
-                candidate.portfolio_url,
-                candidate.source,
-                1 if candidate.is_linkedin_pdf else 0,
-                candidate.raw_text,
-                candidate.resume_file_path,
-                candidate.job_id
-            ))
+            row = conn.execute(
+                _INSERT_CANDIDATE_RETURNING_SQL, self._candidate_params(candidate_id, candidate)
+            ).fetchone()
+            self._cache_put(self._candidate_cache, candidate_id, self._row_to_candidate(row))
         
         logger.info(f"Created candidate: {candidate_id}")
         return candidate_id
     
+    def create_candidates_bulk(self, candidates: List[Candidate]) -> List[str]:
+        """
+        Create several candidates in a single transaction.
+        
+        Args:
+            candidates: Candidate models
+            
+        Returns:
+            Candidate IDs, in input order
+        """
+        candidate_ids = [
+            candidate.id or f"CAND-{uuid.uuid4().hex[:8].upper()}" for candidate in candidates
+        ]
+        if not candidate_ids:
+            return []
+        
+        with self._get_connection() as conn:
+            conn.executemany(_INSERT_CANDIDATE_SQL, [
+                self._candidate_params(candidate_id, candidate)
+                for candidate_id, candidate in zip(candidate_ids, candidates)
+            ])
+            self._cache_invalidate(self._candidate_cache, *candidate_ids)
+        
+        logger.info(f"Created {len(candidate_ids)} candidates")
+        return candidate_ids
+    
+    @staticmethod
+    def _candidate_params(candidate_id: str, candidate: Candidate) -> tuple:
+        """Row values for _INSERT_CANDIDATE_SQL."""
+        return (
+            candidate_id,
+            candidate.name,
+            candidate.email,
+            candidate.phone,
+            candidate.location,
+            candidate.headline,
+            _dumps(candidate.skills),
+            _dumps(candidate.experience),
+            _dumps(candidate.education),
+            _dumps(candidate.projects),
+            _dumps(candidate.certifications),
+            candidate.total_experience_years,
+            candidate.summary,
+            candidate.github_url,
+            candidate.linkedin_url,
+            candidate.portfolio_url,
+            candidate.source,
+            1 if candidate.is_linkedin_pdf else 0,
+            candidate.raw_text,
+            candidate.resume_file_path,
+            candidate.job_id
+        )
+    
     def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
         """Get a candidate by ID."""
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM candidates WHERE id = ?", (candidate_id,)
-            ).fetchone()
+        candidate = self._cache_get(self._candidate_cache, candidate_id)
+        if candidate is not None:
+            return candidate
+        
+        generation = self._cache_generation(self._candidate_cache)
+        with self._read_connection() as conn:
+            row = conn.execute(_SELECT_CANDIDATE_SQL, (candidate_id,)).fetchone()
         
         if not row:
             return None
         
-        return self._row_to_candidate(row)
+        candidate = self._row_to_candidate(row)
+        self._cache_put(self._candidate_cache, candidate_id, candidate, generation)
+        return candidate
     
     def get_candidate_by_email(self, email: str) -> Optional[Candidate]:
         """Get a candidate by email."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             row = conn.execute(
                 "SELECT * FROM candidates WHERE email = ?", (email,)
             ).fetchone()
@@ -349,42 +794,102 @@ class DatabaseStore:
     
     def list_candidates(self, job_id: Optional[str] = None, limit: int = 100) -> List[Candidate]:
         """List candidates, optionally filtered by job."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             if job_id:
-                rows = conn.execute(
+                cursor = conn.execute(
                     "SELECT * FROM candidates WHERE job_id = ? ORDER BY created_at DESC LIMIT ?",
                     (job_id, limit)
+                )
+            else:
+                cursor = conn.execute(
+                    "SELECT * FROM candidates ORDER BY created_at DESC LIMIT ?", (limit,)
+                )
+            return [self._row_to_candidate(row) for row in _iter_rows(cursor)]
+    
+    def list_candidates_summary(
+        self,
+        job_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[CandidateResponse]:
+        """
+        List candidates with only the listing columns.
+        
+        Skips the resume text and the experience/education/projects JSON,
+        which list views never show.
+        
+        Args:
+            job_id: Only candidates who applied for this job
+            limit: Maximum candidates
+            
+        Returns:
+            CandidateResponse list, newest first
+        """
+        with self._read_connection() as conn:
+            if job_id:
+                rows = conn.execute(
+                    f"SELECT {_CANDIDATE_SUMMARY_COLUMNS} FROM candidates "
+                    "WHERE job_id = ? ORDER BY created_at DESC LIMIT ?",
+                    (job_id, limit)
                 ).fetchall()
             else:
                 rows = conn.execute(
-                    "SELECT * FROM candidates ORDER BY created_at DESC LIMIT ?", (limit,)
+                    f"SELECT {_CANDIDATE_SUMMARY_COLUMNS} FROM candidates "
+                    "ORDER BY created_at DESC LIMIT ?",
+                    (limit,)
                 ).fetchall()
         
-        return [self._row_to_candidate(row) for row in rows]
+        return [
+            CandidateResponse(
+                id=row['id'],
+                name=row['name'],
+                email=row['email'],
+                headline=row['headline'],
+                skills=_loads(row['skills']),
+                total_experience_years=row['total_experience_years'],
+                summary=row['summary'],
+                source=row['source'] or 'upload',
+                job_id=row['job_id'],
+                created_at=_parse_timestamp(row['created_at'])
+            )
+            for row in rows
+        ]
     
-    def _row_to_candidate(self, row: sqlite3.Row) -> Candidate:
-        """Convert database row to Candidate."""
-        from app.models.candidate import Experience, Education, Project
+    def list_candidate_ids(self, job_id: Optional[str] = None, limit: int = 100) -> List[str]:
+        """List candidate IDs (newest first), optionally filtered by job."""
+        with self._read_connection() as conn:
+            if job_id:
+                rows = conn.execute(
+                    "SELECT id FROM candidates WHERE job_id = ? ORDER BY created_at DESC LIMIT ?",
+                    (job_id, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT id FROM candidates ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
         
-        # Handle missing resume_file_path column for older databases
-        resume_file_path = None
-        try:
-            resume_file_path = row['resume_file_path']
-        except (IndexError, KeyError):
-            pass
+        return [row['id'] for row in rows]
+    
+    def _row_to_candidate(self, row: sqlite3.Row) -> Candidate:
+        """
+        Convert database row to Candidate.
         
-        return Candidate(
+        Rows were validated when written, so the candidate and its
+        experience/education/projects entries are constructed without
+        re-running validation; only the timestamps need parsing.
+        """
+        created_at, updated_at = row['created_at'], row['updated_at']
+        return Candidate.model_construct(
             id=row['id'],
             name=row['name'],
             email=row['email'],
             phone=row['phone'],
             location=row['location'],
             headline=row['headline'],
-            skills=json.loads(row['skills'] or '[]'),
-            experience=[Experience(**e) for e in json.loads(row['experience'] or '[]')],
-            education=[Education(**e) for e in json.loads(row['education'] or '[]')],
-            projects=[Project(**p) for p in json.loads(row['projects'] or '[]')],
-            certifications=json.loads(row['certifications'] or '[]'),
+            skills=_loads(row['skills']),
+            experience=[Experience.model_construct(**e) for e in _loads(row['experience'])],
+            education=[Education.model_construct(**e) for e in _loads(row['education'])],
+            projects=[Project.model_construct(**p) for p in _loads(row['projects'])],
+            certifications=_loads(row['certifications']),
             total_experience_years=row['total_experience_years'],
             summary=row['summary'],
             github_url=row['github_url'],
@@ -393,10 +898,10 @@ class DatabaseStore:
             source=row['source'],
             is_linkedin_pdf=bool(row['is_linkedin_pdf']),
             raw_text=row['raw_text'],
-            resume_file_path=resume_file_path,
+            resume_file_path=row['resume_file_path'],
             job_id=row['job_id'],
-            created_at=row['created_at'],
-            updated_at=row['updated_at']
+            created_at=_parse_timestamp(created_at),
+            updated_at=_parse_timestamp(updated_at)
         )
 
     # ============ Deletion / Cleanup Operations ============
@@ -408,19 +913,14 @@ class DatabaseStore:
         Returns the resume_file_path (if any) so callers can remove the file from disk.
         """
         with self._get_connection() as conn:
-            # Fetch resume path if present
+            # Score reports go with it (trg_candidates_delete_score_reports)
             row = conn.execute(
-                "SELECT resume_file_path FROM candidates WHERE id = ?",
+                "DELETE FROM candidates WHERE id = ? RETURNING resume_file_path",
                 (candidate_id,)
             ).fetchone()
+            self._cache_invalidate(self._candidate_cache, candidate_id)
 
-            resume_path = row['resume_file_path'] if row and row['resume_file_path'] else None
-
-            # Delete score reports for this candidate
-            conn.execute("DELETE FROM score_reports WHERE candidate_id = ?", (candidate_id,))
-
-            # Delete candidate row
-            conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,))
+        resume_path = row['resume_file_path'] if row and row['resume_file_path'] else None
 
         logger.info(f"Deleted candidate and reports: {candidate_id}")
         return resume_path
@@ -432,19 +932,15 @@ class DatabaseStore:
         Returns a dict with deleted candidate ids and resume_file_paths for cleanup.
         """
         with self._get_connection() as conn:
+            # Their score reports go with them (trg_candidates_delete_score_reports)
             rows = conn.execute(
-                "SELECT id, resume_file_path FROM candidates WHERE job_id = ?",
+                "DELETE FROM candidates WHERE job_id = ? RETURNING id, resume_file_path",
                 (job_id,)
             ).fetchall()
 
             candidate_ids = [r['id'] for r in rows]
             resume_paths = [r['resume_file_path'] for r in rows if r['resume_file_path']]
-
-            if candidate_ids:
-                # Delete score reports for these candidates
-                placeholders = ','.join(['?'] * len(candidate_ids))
-                conn.execute(f"DELETE FROM score_reports WHERE candidate_id IN ({placeholders})", tuple(candidate_ids))
-                conn.execute(f"DELETE FROM candidates WHERE id IN ({placeholders})", tuple(candidate_ids))
+            self._cache_invalidate(self._candidate_cache, *candidate_ids)
 
             # Also delete any score reports directly tied to the job
             conn.execute("DELETE FROM score_reports WHERE job_id = ?", (job_id,))
@@ -454,12 +950,14 @@ class DatabaseStore:
 
     def delete_job(self, job_id: str) -> bool:
         """
-        Delete a job row. Does not remove embeddings from vector store (caller should handle that).
+        Delete a job row and its score reports (candidates are kept).
+        Does not remove embeddings from vector store (caller should handle that).
         Returns True if a row was deleted.
         """
         with self._get_connection() as conn:
             cur = conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
             deleted = cur.rowcount
+            self._forget_job(job_id)
 
         logger.info(f"Deleted job {job_id}, rows removed: {deleted}")
         return deleted > 0
@@ -509,11 +1007,11 @@ class DatabaseStore:
                 candidate.phone,
                 candidate.location,
                 candidate.headline,
-                json.dumps(candidate.skills),
-                json.dumps([exp.model_dump() for exp in candidate.experience]),
-                json.dumps([edu.model_dump() for edu in candidate.education]),
-                json.dumps([proj.model_dump() for proj in candidate.projects]),
-                json.dumps(candidate.certifications),
+                _dumps(candidate.skills),
+                _dumps(candidate.experience),
+                _dumps(candidate.education),
+                _dumps(candidate.projects),
+                _dumps(candidate.certifications),
                 candidate.total_experience_years,
                 candidate.summary,
                 candidate.github_url,
@@ -526,6 +1024,7 @@ class DatabaseStore:
                 candidate.job_id,
                 candidate.id
             ))
+            self._cache_invalidate(self._candidate_cache, candidate.id)
         
         logger.info(f"Updated candidate: {candidate.id}")
         return True
@@ -536,71 +1035,145 @@ class DatabaseStore:
         """Create a new score report."""
         report_id = report.id or f"SCORE-{uuid.uuid4().hex[:8].upper()}"
         with self._get_connection() as conn:
-            # Ensure only one score report exists per candidate-job pair.
-            # Delete any existing report for this candidate+job before inserting the new one.
-            try:
-                conn.execute(
-                    "DELETE FROM score_reports WHERE candidate_id = ? AND job_id = ?",
-                    (report.candidate_id, report.job_id)
-                )
-            except Exception:
-                # If table schema is older and column missing, ignore and continue to insert
-                pass
-
-            conn.execute("""
-                INSERT INTO score_reports (
-                    id, candidate_id, job_id, candidate_name, overall_score,
-                    skill_match_score, experience_match_score, semantic_similarity_score,
-                    matched_skills, missing_skills, extra_skills,
-                    strengths, weaknesses, reasoning, recommendation
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                report_id,
-                report.candidate_id,
-                report.job_id,
-                report.candidate_name,
-                report.overall_score,
-                report.skill_match_score,
-                report.experience_match_score,
-                report.semantic_similarity_score,
-                json.dumps(report.matched_skills),
-                json.dumps(report.missing_skills),
-                json.dumps(report.extra_skills),
-                json.dumps(report.strengths),
-                json.dumps(report.weaknesses),
-                report.reasoning,
-                report.recommendation
-            ))
+            # Replaces any existing report for this candidate+job (see the unique index)
+            conn.execute(_INSERT_SCORE_REPORT_SQL, self._score_report_params(report_id, report))
         
         logger.info(f"Created score report: {report_id}")
         return report_id
     
+    def create_score_reports_bulk(self, reports: List[ScoreReport]) -> List[str]:
+        """
+        Create several score reports in a single transaction.
+        
+        Like create_score_report, any existing report for the same
+        candidate-job pair is replaced.
+        
+        Args:
+            reports: ScoreReport models
+            
+        Returns:
+            Score report IDs, in input order
+        """
+        report_ids = [
+            report.id or f"SCORE-{uuid.uuid4().hex[:8].upper()}" for report in reports
+        ]
+        if not report_ids:
+            return []
+        
+        with self._get_connection() as conn:
+            conn.executemany(_INSERT_SCORE_REPORT_SQL, [
+                self._score_report_params(report_id, report)
+                for report_id, report in zip(report_ids, reports)
+            ])
+        
+        logger.info(f"Created {len(report_ids)} score reports")
+        return report_ids
+    
+    @staticmethod
+    def _score_report_params(report_id: str, report: ScoreReport) -> tuple:
+        """Row values for _INSERT_SCORE_REPORT_SQL."""
+        return (
+            report_id,
+            report.candidate_id,
+            report.job_id,
+            report.candidate_name,
+            report.overall_score,
+            report.skill_match_score,
+            report.experience_match_score,
+            report.semantic_similarity_score,
+            _dumps(report.matched_skills),
+            _dumps(report.missing_skills),
+            _dumps(report.extra_skills),
+            _dumps(report.strengths),
+            _dumps(report.weaknesses),
+            report.reasoning,
+            report.recommendation
+        )
+    
     def get_score_report(self, candidate_id: str, job_id: str) -> Optional[ScoreReport]:
         """Get score report for a candidate-job pair."""
-        with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT * FROM score_reports WHERE candidate_id = ? AND job_id = ?",
-                (candidate_id, job_id)
-            ).fetchone()
+        with self._read_connection() as conn:
+            row = conn.execute(_SELECT_SCORE_REPORT_SQL, (candidate_id, job_id)).fetchone()
         
         if not row:
             return None
         
         return self._row_to_score_report(row)
     
-    def get_rankings_for_job(self, job_id: str) -> List[ScoreReport]:
-        """Get all rankings for a job, sorted by score."""
-        with self._get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM score_reports WHERE job_id = ? ORDER BY overall_score DESC",
-                (job_id,)
-            ).fetchall()
+    def get_rankings_for_job(self, job_id: str, limit: Optional[int] = None) -> List[ScoreReport]:
+        """
+        Get rankings for a job, sorted by score.
+        
+        Args:
+            job_id: Job ID
+            limit: Only the best N reports (sorted and limited in SQLite)
+            
+        Returns:
+            List of ScoreReports, highest score first
+        """
+        with self._read_connection() as conn:
+            if limit is None:
+                cursor = conn.execute(_SELECT_RANKINGS_SQL, (job_id,))
+            else:
+                cursor = conn.execute(_SELECT_TOP_RANKINGS_SQL, (job_id, limit))
+            return [self._row_to_score_report(row) for row in _iter_rows(cursor)]
+    
+    def get_candidates_with_scores(
+        self,
+        candidate_ids: List[str],
+        job_id: str
+    ) -> List[Tuple[Candidate, Optional[ScoreReport]]]:
+        """
+        Load candidates together with their stored report for a job.
+        
+        One LEFT JOIN replaces a get_score_report plus get_candidate
+        round-trip per candidate.
+        
+        Args:
+            candidate_ids: Candidate IDs
+            job_id: Job ID the reports are for
+            
+        Returns:
+            (candidate, score report or None) pairs in candidate_ids order;
+            unknown IDs are left out
+        """
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        if not candidate_ids:
+            return []
         
-        return [self._row_to_score_report(row) for row in rows]
+        score_columns = ", ".join(f"s.{name} AS s_{name}" for name in _SCORE_REPORT_COLUMNS)
+        placeholders = ",".join("?" * len(candidate_ids))
+        with self._read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT c.*, {score_columns} FROM candidates c "
+                "LEFT JOIN score_reports s ON s.candidate_id = c.id AND s.job_id = ? "
+                f"WHERE c.id IN ({placeholders})",
+                (job_id, *candidate_ids)
+            )
+            by_id = {
+                row['id']: (
+                    self._row_to_candidate(row),
+                    self._row_to_score_report(row, prefix="s_") if row['s_id'] else None
+                )
+                for row in _iter_rows(cursor)
+            }
+        return [by_id[candidate_id] for candidate_id in candidate_ids if candidate_id in by_id]
     
-    def _row_to_score_report(self, row: sqlite3.Row) -> ScoreReport:
-        """Convert database row to ScoreReport."""
-        return ScoreReport(
+    def _row_to_score_report(self, row: sqlite3.Row, prefix: str = "") -> ScoreReport:
+        """
+        Convert database row to ScoreReport.
+        
+        Rows were validated when written, so the model is constructed without
+        re-running validation; only created_at needs parsing.
+        
+        Args:
+            row: Database row
+            prefix: Alias prefix of the score report columns in a joined row
+        """
+        if prefix:
+            row = {name: row[prefix + name] for name in _SCORE_REPORT_COLUMNS}
+        created_at = row['created_at']
+        return ScoreReport.model_construct(
             id=row['id'],
             candidate_id=row['candidate_id'],
             job_id=row['job_id'],
@@ -609,16 +1182,93 @@ class DatabaseStore:
             skill_match_score=row['skill_match_score'],
             experience_match_score=row['experience_match_score'],
             semantic_similarity_score=row['semantic_similarity_score'],
-            matched_skills=json.loads(row['matched_skills'] or '[]'),
-            missing_skills=json.loads(row['missing_skills'] or '[]'),
-            extra_skills=json.loads(row['extra_skills'] or '[]'),
-            strengths=json.loads(row['strengths'] or '[]'),
-            weaknesses=json.loads(row['weaknesses'] or '[]'),
+            matched_skills=_loads(row['matched_skills']),
+            missing_skills=_loads(row['missing_skills']),
+            extra_skills=_loads(row['extra_skills']),
+            strengths=_loads(row['strengths']),
+            weaknesses=_loads(row['weaknesses']),
             reasoning=row['reasoning'],
             recommendation=row['recommendation'],
-            created_at=row['created_at']
+            created_at=_parse_timestamp(created_at)
         )
     
+    # ============ Score Cache Operations ============
+    
+    def get_cached_score_report(self, cache_key: str, max_age_hours: int) -> Optional[str]:
+        """
+        Get a cached score report if it is younger than max_age_hours.
+        
+        Args:
+            cache_key: Cache key (see ScoreReportCache)
+            max_age_hours: TTL in hours
+            
+        Returns:
+            Serialized ScoreReport JSON or None
+        """
+        with self._read_connection() as conn:
+            row = conn.execute(
+                "SELECT report FROM score_cache WHERE cache_key = ? AND created_at >= datetime('now', ?)",
+                (cache_key, f"-{int(max_age_hours)} hours")
+            ).fetchone()
+        
+        return row['report'] if row else None
+    
+    def get_cached_score_reports(self, cache_keys: List[str], max_age_hours: int) -> Dict[str, str]:
+        """
+        Get several cached score reports younger than max_age_hours in one query.
+        
+        Args:
+            cache_keys: Cache keys (see ScoreReportCache)
+            max_age_hours: TTL in hours
+            
+        Returns:
+            Dict mapping each found key to its serialized ScoreReport JSON
+        """
+        cache_keys = list(dict.fromkeys(cache_keys))
+        if not cache_keys:
+            return {}
+        
+        placeholders = ",".join("?" * len(cache_keys))
+        with self._read_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT cache_key, report FROM score_cache WHERE cache_key IN ({placeholders}) "
+                "AND created_at >= datetime('now', ?)",
+                (*cache_keys, f"-{int(max_age_hours)} hours")
+            )
+            return {row['cache_key']: row['report'] for row in _iter_rows(cursor)}
+    
+    def put_cached_score_report(self, cache_key: str, report_json: str):
+        """Store (or replace) a serialized score report in the cache."""
+        self.put_cached_score_reports([(cache_key, report_json)])
+    
+    def put_cached_score_reports(self, entries: List[Tuple[str, str]]):
+        """Store (or replace) several (cache key, report JSON) entries in one transaction."""
+        if not entries:
+            return
+        with self._get_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO score_cache (cache_key, report) VALUES (?, ?)",
+                entries
+            )
+    
+    def prune_score_cache(self, older_than_hours: int) -> int:
+        """
+        Delete cached score reports older than the TTL.
+        
+        Args:
+            older_than_hours: TTL in hours
+            
+        Returns:
+            Number of deleted entries
+        """
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM score_cache WHERE created_at < datetime('now', ?)",
+                (f"-{int(older_than_hours)} hours",)
+            )
+        
+        return cursor.rowcount
+    
     # ============ Email Log Operations ============
     
     def log_email(
@@ -640,14 +1290,39 @@ class DatabaseStore:
                     id, message_id, subject, sender, status, job_id, candidate_id, error_message
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (log_id, message_id, subject, sender, status, job_id, candidate_id, error_message))
+            self._seen_message_ids.add(message_id)
         
         return log_id
     
     def is_email_processed(self, message_id: str) -> bool:
         """Check if an email has already been processed."""
+        if message_id in self._seen_message_ids:
+            return True
+        
+        # Not seen by this process; the table stays the source of truth
+        with self._read_connection() as conn:
+            row = conn.execute(_SELECT_EMAIL_LOG_SQL, (message_id,)).fetchone()
+        
+        if row is None:
+            return False
+        self._seen_message_ids.add(message_id)
+        return True
+    
+    def prune_email_log(self, older_than_days: int = 30) -> int:
+        """
+        Delete email log entries older than the retention window.
+        
+        Args:
+            older_than_days: Retention window in days
+            
+        Returns:
+            Number of deleted entries
+        """
         with self._get_connection() as conn:
-            row = conn.execute(
-                "SELECT id FROM email_log WHERE message_id = ?", (message_id,)
-            ).fetchone()
+            rows = conn.execute(
+                "DELETE FROM email_log WHERE processed_at < datetime('now', ?) RETURNING message_id",
+                (f"-{int(older_than_days)} days",)
+            ).fetchall()
+            self._seen_message_ids.difference_update(row['message_id'] for row in rows)
         
-        return row is not None
+        return len(rows)
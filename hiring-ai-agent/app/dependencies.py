@@ -1,9 +1,12 @@
 """
 FastAPI dependency injection.
 Provides shared instances of services, agents, and workflows.
+
+Every factory is cached: the objects hold no per-request state, so one
+instance of each serves the whole process.
 """
 from functools import lru_cache
-from typing import Generator
+from typing import Generator, Optional
 
 from app.config import get_settings, Settings
 from app.services.gemini_llm import GeminiLLM
@@ -11,6 +14,8 @@ from app.services.chroma_db import ChromaStore
 from app.services.pdf_parser import PDFParser
 from app.services.resume_extractor import ResumeExtractor
 from app.services.scoring_utils import ScoringUtils
+from app.services.evaluation_cache import EvaluationCache
+from app.services.score_report_cache import ScoreReportCache
 from app.database.store import DatabaseStore
 from app.agents.jd_context_agent import JDContextAgent
 from app.agents.resume_analysis_agent import ResumeAnalysisAgent
@@ -39,7 +44,11 @@ def get_llm() -> GeminiLLM:
 def get_chroma_store() -> ChromaStore:
     """Get singleton ChromaDB instance."""
     settings = get_settings()
-    return ChromaStore(persist_dir=settings.chroma_persist_dir)
+    return ChromaStore(
+        persist_dir=settings.chroma_persist_dir,
+        write_batch_size=settings.chroma_write_batch_size,
+        max_write_delay_seconds=settings.chroma_write_max_delay_seconds
+    )
 
 
 @lru_cache()
@@ -49,65 +58,115 @@ def get_database() -> DatabaseStore:
     return DatabaseStore(db_path=settings.database_path)
 
 
+@lru_cache()
 def get_pdf_parser() -> PDFParser:
-    """Get PDF parser instance."""
+    """Get singleton PDF parser."""
     return PDFParser()
 
 
+@lru_cache()
 def get_resume_extractor() -> ResumeExtractor:
-    """Get resume extractor instance."""
+    """Get singleton resume extractor."""
     return ResumeExtractor(llm=get_llm())
 
 
+def _scoring_weights(settings: Settings) -> dict:
+    """Scoring weights from settings."""
+    return {
+        "semantic_similarity": settings.weight_semantic_similarity,
+        "skill_match": settings.weight_skill_match,
+        "experience_match": settings.weight_experience_match
+    }
+
+
+@lru_cache()
 def get_scoring_utils() -> ScoringUtils:
-    """Get scoring utilities instance."""
-    settings = get_settings()
+    """Get singleton scoring utilities."""
     return ScoringUtils(
         llm=get_llm(),
-        weights={
-            "semantic_similarity": settings.weight_semantic_similarity,
-            "skill_match": settings.weight_skill_match,
-            "experience_match": settings.weight_experience_match
-        }
+        weights=_scoring_weights(get_settings())
+    )
+
+
+@lru_cache()
+def get_evaluation_cache() -> Optional[EvaluationCache]:
+    """Get singleton LLM evaluation cache (None when disabled)."""
+    settings = get_settings()
+    if settings.llm_eval_cache_size <= 0:
+        return None
+    return EvaluationCache(
+        max_entries=settings.llm_eval_cache_size,
+        similarity_threshold=settings.llm_eval_cache_similarity
+    )
+
+
+@lru_cache()
+def get_score_report_cache() -> Optional[ScoreReportCache]:
+    """Get singleton score report cache (None when disabled)."""
+    settings = get_settings()
+    if settings.cache_backend != "sqlite":
+        return None
+    return ScoreReportCache(
+        database=get_database(),
+        model_version=f"{settings.gemini_model}|{settings.gemini_embedding_model}",
+        weights=_scoring_weights(settings),
+        ttl_hours=settings.cache_ttl_hours
     )
 
 
 # ============ Agents ============
 
+@lru_cache()
 def get_jd_context_agent() -> JDContextAgent:
-    """Get JD Context Agent instance."""
+    """Get singleton JD Context Agent."""
     return JDContextAgent(llm=get_llm())
 
 
+@lru_cache()
 def get_resume_analysis_agent() -> ResumeAnalysisAgent:
-    """Get Resume Analysis Agent instance."""
-    return ResumeAnalysisAgent(llm=get_llm())
+    """Get singleton Resume Analysis Agent."""
+    return ResumeAnalysisAgent(
+        llm=get_llm(),
+        github_token=get_settings().github_token
+    )
 
 
+@lru_cache()
 def get_ranking_agent() -> RankingAgent:
-    """Get Ranking Agent instance."""
+    """Get singleton Ranking Agent."""
+    settings = get_settings()
     return RankingAgent(
         llm=get_llm(),
-        scoring_utils=get_scoring_utils()
+        scoring_utils=get_scoring_utils(),
+        eval_batch_size=settings.llm_eval_batch_size,
+        max_concurrency=settings.llm_max_concurrency,
+        llm_eval_always=settings.llm_eval_always,
+        evaluation_cache=get_evaluation_cache()
     )
 
 
+@lru_cache()
 def get_email_ingest_agent() -> EmailIngestAgent:
-    """Get Email Ingest Agent instance."""
+    """Get singleton Email Ingest Agent (keeps its IMAP session across polls)."""
     settings = get_settings()
     return EmailIngestAgent(
         imap_server=settings.email_imap_server,
         email_address=settings.email_address,
         email_password=settings.email_password,
         folder=settings.email_folder,
-        subject_pattern=settings.email_subject_pattern
+        subject_pattern=settings.email_subject_re,
+        subject_search_terms=settings.email_subject_search_terms,
+        pool_size=settings.email_fetch_pool_size,
+        database=get_database(),
+        processed_retention_days=settings.email_processed_retention_days
     )
 
 
 # ============ Workflows ============
 
+@lru_cache()
 def get_job_context_workflow() -> JobContextWorkflow:
-    """Get Job Context Workflow instance."""
+    """Get singleton Job Context Workflow."""
     return JobContextWorkflow(
         agent=get_jd_context_agent(),
         chroma_store=get_chroma_store(),
@@ -116,8 +175,9 @@ def get_job_context_workflow() -> JobContextWorkflow:
     )
 
 
+@lru_cache()
 def get_resume_ingestion_workflow() -> ResumeIngestionWorkflow:
-    """Get Resume Ingestion Workflow instance."""
+    """Get singleton Resume Ingestion Workflow."""
     return ResumeIngestionWorkflow(
         pdf_parser=get_pdf_parser(),
         resume_agent=get_resume_analysis_agent(),
@@ -127,17 +187,20 @@ def get_resume_ingestion_workflow() -> ResumeIngestionWorkflow:
     )
 
 
+@lru_cache()
 def get_assessment_workflow() -> AssessmentWorkflow:
-    """Get Assessment Workflow instance."""
+    """Get singleton Assessment Workflow."""
     return AssessmentWorkflow(
         ranking_agent=get_ranking_agent(),
         chroma_store=get_chroma_store(),
-        database=get_database()
+        database=get_database(),
+        score_cache=get_score_report_cache()
     )
 
 
+@lru_cache()
 def get_ranking_workflow() -> RankingWorkflow:
-    """Get Ranking Workflow instance."""
+    """Get singleton Ranking Workflow."""
     return RankingWorkflow(
         assessment_workflow=get_assessment_workflow(),
         ranking_agent=get_ranking_agent(),
@@ -4,9 +4,14 @@ Hiring AI Agent - Main FastAPI Application
 A multi-agent system for automated resume screening and candidate ranking.
 """
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+
+import anyio.to_thread
+from fastapi import BackgroundTasks, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.config import get_settings, ensure_directories
@@ -16,6 +21,8 @@ from app.api.routes_ranking import router as ranking_router
 from app.utils.error_handler import AppException, app_exception_handler
 from app.utils.logger import setup_logger, get_logger
 from app.dependencies import (
+    get_chroma_store,
+    get_database,
     get_email_ingest_agent,
     get_resume_ingestion_workflow,
     get_job_context_workflow
@@ -29,6 +36,17 @@ logger = get_logger(__name__)
 scheduler = AsyncIOScheduler()
 
 
+async def flush_embedding_writes(interval: float):
+    """Background task writing buffered embeddings once they are old enough."""
+    chroma = get_chroma_store()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(chroma.flush_due)
+        except Exception as e:
+            logger.error(f"Embedding flush failed: {e}")
+
+
 async def poll_email_inbox():
     """Background task to poll email inbox for new applications."""
     settings = get_settings()
@@ -36,58 +54,85 @@ async def poll_email_inbox():
     if not settings.email_enabled:
         return
     
+    # IMAP, PDF parsing and LLM calls all block; keep them off the event loop
+    await asyncio.to_thread(_poll_email_inbox_sync)
+
+
+def _process_email_resume(
+    job_title: str,
+    pdf_path: str,
+    filename: str,
+    sender: str,
+    message_id: str
+):
+    """Ingest one emailed resume for the job named in its subject."""
+    try:
+        # Get or create job
+        job = get_job_context_workflow().get_or_create_job(job_title)
+        
+        # Process resume
+        candidate = get_resume_ingestion_workflow().process_resume_path(
+            file_path=pdf_path,
+            source="email",
+            job_id=job.id,
+            filename=filename
+        )
+        
+        logger.info(f"Processed email resume: {candidate.name} for {job_title}")
+        
+    except Exception as e:
+        logger.error(f"Failed to process email resume from {sender}: {e}")
+
+
+def _poll_email_inbox_sync():
+    """Poll the inbox and ingest matching resumes (blocking)."""
     logger.info("Polling email inbox for new applications...")
     
     try:
         email_agent = get_email_ingest_agent()
-        resume_workflow = get_resume_ingestion_workflow()
-        job_workflow = get_job_context_workflow()
         
         if not email_agent.is_configured():
             return
         
-        def process_email_resume(
-            job_title: str,
-            pdf_bytes: bytes,
-            filename: str,
-            sender: str,
-            message_id: str
-        ):
-            try:
-                # Get or create job
-                job = job_workflow.get_or_create_job(job_title)
-                
-                # Process resume
-                candidate = resume_workflow.process_resume_bytes(
-                    pdf_bytes=pdf_bytes,
-                    source="email",
-                    job_id=job.id,
-                    filename=filename
-                )
-                
-                logger.info(f"Processed email resume: {candidate.name} for {job_title}")
-                
-            except Exception as e:
-                logger.error(f"Failed to process email resume from {sender}: {e}")
-        
-        count = email_agent.poll_and_process(process_email_resume)
+        count = email_agent.poll_and_process(_process_email_resume)
         logger.info(f"Email poll complete: {count} resumes processed")
         
     except Exception as e:
         logger.error(f"Email polling failed: {e}")
 
 
+def _idle_email_inbox():
+    """Ingest resumes as the server announces new mail (blocks until stop_idle)."""
+    try:
+        get_email_ingest_agent().idle_loop(_process_email_resume)
+    except Exception as e:
+        logger.error(f"Email IDLE listener failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info("Starting Hiring AI Agent...")
     
+    # Python 3.12+: run new tasks inline until their first await, saving a
+    # loop iteration for tasks that finish (or fail) without suspending
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     # Ensure data directories exist
     ensure_directories()
     
-    # Start email polling scheduler if enabled
+    # Size both thread pools (anyio's for sync handlers and run_in_threadpool,
+    # the loop's for asyncio.to_thread) to one budget rather than their defaults
     settings = get_settings()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.threadpool_size)
+    )
+    logger.info(f"Thread pool size: {settings.threadpool_size}")
+    
+    # Start email polling scheduler if enabled
     if settings.email_enabled:
         scheduler.add_job(
             poll_email_inbox,
@@ -98,14 +143,39 @@ async def lifespan(app: FastAPI):
         scheduler.start()
         logger.info(f"Email polling enabled (every {settings.email_poll_interval_minutes} minutes)")
     
+    # Push delivery via IMAP IDLE; scheduled polling stays on as a fallback
+    idle_thread = None
+    if settings.email_enabled and settings.email_idle:
+        idle_thread = threading.Thread(
+            target=_idle_email_inbox, name="email-idle", daemon=True
+        )
+        idle_thread.start()
+        logger.info("Email IDLE listener started")
+    
+    # Write buffered embeddings in the background
+    flusher = None
+    if settings.chroma_write_batch_size > 1:
+        flusher = asyncio.create_task(
+            flush_embedding_writes(max(0.1, settings.chroma_write_max_delay_seconds / 2))
+        )
+    
     logger.info("Hiring AI Agent started successfully")
     
     yield
     
     # Shutdown
     logger.info("Shutting down Hiring AI Agent...")
+    if flusher:
+        flusher.cancel()
+    get_chroma_store().flush_all()
     if scheduler.running:
         scheduler.shutdown()
+    if idle_thread:
+        get_email_ingest_agent().stop_idle()
+        # Stop is checked every second, but a callback may still be running
+        await asyncio.to_thread(idle_thread.join, 10)
+    get_email_ingest_agent().disconnect()
+    get_database().close()
     logger.info("Shutdown complete")
 
 
@@ -141,6 +211,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Room for multipart boundaries and part headers in an upload's Content-Length
+UPLOAD_OVERHEAD_ALLOWANCE = 16 * 1024
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Reject resume uploads whose declared Content-Length is over the size limit.
+    
+    Runs before FastAPI reads the multipart body, so oversized uploads are
+    refused without receiving them; chunked uploads without a Content-Length
+    are still capped while upload_resume streams them.
+    """
+    if request.method == "POST" and request.url.path == "/resume/upload":
+        settings = get_settings()
+        content_length = request.headers.get("content-length", "")
+        max_size = settings.max_file_size_mb * 1024 * 1024 + UPLOAD_OVERHEAD_ALLOWANCE
+        if content_length.isdigit() and int(content_length) > max_size:
+            return JSONResponse(
+                status_code=413,
+                content={"detail": f"File too large. Maximum size is {settings.max_file_size_mb}MB"}
+            )
+    return await call_next(request)
+
+
 # Add exception handler
 app.add_exception_handler(AppException, app_exception_handler)
 
@@ -174,7 +269,7 @@ async def health_check():
 
 
 @app.post("/email/trigger", tags=["Email"])
-async def trigger_email_poll():
+async def trigger_email_poll(background_tasks: BackgroundTasks):
     """Manually trigger email inbox polling."""
     settings = get_settings()
     
@@ -184,8 +279,8 @@ async def trigger_email_poll():
             "message": "Email ingestion is not enabled"
         }
     
-    # Run poll in background
-    asyncio.create_task(poll_email_inbox())
+    # Run poll in background, after the response is sent
+    background_tasks.add_task(poll_email_inbox)
     
     return {
         "status": "triggered",
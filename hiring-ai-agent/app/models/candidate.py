@@ -1,9 +1,10 @@
 """
 Candidate model - structured representation of a candidate's resume.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 
 
 class Experience(BaseModel):
@@ -68,16 +69,17 @@ class Candidate(BaseModel):
     raw_text: Optional[str] = Field(default=None, description="Original resume text")
     resume_file_path: Optional[str] = Field(default=None, description="Path to stored resume PDF file")
     
-    # Vector embedding
-    embedding_vector: Optional[List[float]] = Field(default=None, description="Vector embedding")
+    # Vector embedding; ChromaDB is its store, so it is only set while ingesting
+    # (reads don't load it) and is never serialized
+    embedding_vector: Optional[List[float]] = Field(default=None, exclude=True, description="Vector embedding")
     
     # Metadata
     job_id: Optional[str] = Field(default=None, description="Associated job ID (if applied via email)")
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
-    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
+    updated_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "CAND-001",
                 "name": "Rahul Nair",
@@ -114,6 +116,7 @@ class Candidate(BaseModel):
                 "source": "email"
             }
         }
+    )
 
 
 class CandidateResponse(BaseModel):
@@ -128,3 +131,5 @@ class CandidateResponse(BaseModel):
     source: str
     job_id: Optional[str]
     created_at: datetime
+    
+    model_config = ConfigDict(frozen=True)
@@ -1,9 +1,16 @@
 """
 Job Context model - structured representation of a job description.
 """
-from pydantic import BaseModel, Field
+import hashlib
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
+
+
+def hash_raw_text(raw_text: str) -> str:
+    """SHA-256 hex digest identifying a job description's original text."""
+    return hashlib.sha256(raw_text.encode('utf-8')).hexdigest()
 
 
 class JobContext(BaseModel):
@@ -24,18 +31,31 @@ class JobContext(BaseModel):
     domain: Optional[str] = Field(default=None, description="Industry/domain (e.g., Fintech, Healthcare, AI)")
     
     job_summary: Optional[str] = Field(default=None, description="LLM-generated job summary")
-    raw_text: Optional[str] = Field(default=None, description="Original JD text")
+    # The original text is stored in the jobs table next to its digest and
+    # length; it is never serialized and is not loaded with the job
+    raw_text: Optional[str] = Field(default=None, exclude=True, description="Original JD text")
+    raw_text_hash: Optional[str] = Field(default=None, description="SHA-256 of the original JD text")
+    raw_text_len: Optional[int] = Field(default=None, description="Length of the original JD text")
     
     location: Optional[str] = Field(default=None, description="Job location")
     remote_policy: Optional[str] = Field(default=None, description="Remote/Hybrid/Onsite")
     
-    embedding_vector: Optional[List[float]] = Field(default=None, description="Vector embedding for similarity search")
+    # Lives in ChromaDB; only set while the job is being embedded, never serialized
+    embedding_vector: Optional[List[float]] = Field(default=None, exclude=True, description="Vector embedding for similarity search")
     
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
-    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
+    updated_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
     
-    class Config:
-        json_schema_extra = {
+    @model_validator(mode='after')
+    def _fill_raw_text_digest(self) -> "JobContext":
+        """Derive raw_text_hash/raw_text_len when the text is provided."""
+        if self.raw_text and self.raw_text_hash is None:
+            self.raw_text_hash = hash_raw_text(self.raw_text)
+            self.raw_text_len = len(self.raw_text)
+        return self
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "JOB-2024-001",
                 "job_title": "AI Engineer",
@@ -56,6 +76,7 @@ class JobContext(BaseModel):
                 "remote_policy": "Remote"
             }
         }
+    )
 
 
 class JobContextCreate(BaseModel):
@@ -76,3 +97,5 @@ class JobContextResponse(BaseModel):
     domain: Optional[str]
     job_summary: Optional[str]
     created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True, frozen=True)
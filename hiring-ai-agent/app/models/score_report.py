@@ -1,9 +1,10 @@
 """
 Score Report model - candidate evaluation results.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 
 
 class ScoreReport(BaseModel):
@@ -32,10 +33,10 @@ class ScoreReport(BaseModel):
     recommendation: Optional[str] = Field(default=None, description="Hire/Interview/Reject recommendation")
     
     # Metadata
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "id": "SCORE-001",
                 "candidate_id": "CAND-001",
@@ -61,6 +62,7 @@ class ScoreReport(BaseModel):
                 "recommendation": "Interview"
             }
         }
+    )
 
 
 class RankingReport(BaseModel):
@@ -77,10 +79,10 @@ class RankingReport(BaseModel):
         description="LLM summary of top candidates"
     )
     
-    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    created_at: Optional[datetime] = Field(default_factory=partial(datetime.now, timezone.utc))
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "job_id": "JOB-2024-001",
                 "job_title": "AI Engineer",
@@ -102,3 +104,4 @@ class RankingReport(BaseModel):
                 "top_candidates_summary": "Top candidate Rahul Nair shows exceptional fit..."
             }
         }
+    )
@@ -3,11 +3,15 @@ from .chroma_db import ChromaStore
 from .pdf_parser import PDFParser
 from .resume_extractor import ResumeExtractor
 from .scoring_utils import ScoringUtils
+from .evaluation_cache import EvaluationCache
+from .score_report_cache import ScoreReportCache
 
 __all__ = [
     "GeminiLLM",
     "ChromaStore",
     "PDFParser",
     "ResumeExtractor",
-    "ScoringUtils"
+    "ScoringUtils",
+    "EvaluationCache",
+    "ScoreReportCache"
 ]
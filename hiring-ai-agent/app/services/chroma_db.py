@@ -1,29 +1,56 @@
 """
 ChromaDB wrapper - vector store operations for embeddings.
 """
+import threading
+import time
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import uuid
 
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Max IDs per batched get; keeps individual requests bounded
+GET_BATCH_SIZE = 100
+
 
 class ChromaStore:
     """
     Wrapper around ChromaDB for storing and querying embeddings.
     """
     
-    def __init__(self, persist_dir: str = "data/chroma_db"):
+    def __init__(
+        self,
+        persist_dir: str = "data/chroma_db",
+        write_batch_size: int = 1,
+        max_write_delay_seconds: float = 2.0
+    ):
         """
         Initialize ChromaDB client.
         
         Args:
             persist_dir: Directory to persist the database
+            write_batch_size: Buffer add_embedding calls and write them in
+                batches of this size (1 writes each call immediately)
+            max_write_delay_seconds: Age at which flush_due() writes a
+                partial batch
         """
         self.persist_dir = persist_dir
+        self.write_batch_size = max(1, write_batch_size)
+        self.max_write_delay_seconds = max_write_delay_seconds
+        
+        # collection -> {id: (embedding, metadata, document)}, plus when the
+        # oldest buffered item arrived
+        self._buffer_lock = threading.Lock()
+        self._buffers: Dict[str, Dict[str, Tuple]] = {}
+        self._buffered_since: Dict[str, float] = {}
+        
+        # Collection handles by name, so each operation skips Chroma's metadata lookup
+        self._collection_lock = threading.Lock()
+        self._collections: Dict[str, chromadb.Collection] = {}
         
         # Initialize persistent client
         self.client = chromadb.PersistentClient(
@@ -37,16 +64,27 @@ class ChromaStore:
         """
         Get or create a collection.
         
+        The handle is cached after the first call; delete_collection drops it.
+        
         Args:
             collection_name: Name of the collection
             
         Returns:
             ChromaDB Collection object
         """
-        return self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity
-        )
+        collection = self._collections.get(collection_name)
+        if collection is not None:
+            return collection
+        
+        with self._collection_lock:
+            collection = self._collections.get(collection_name)
+            if collection is None:
+                collection = self.client.get_or_create_collection(
+                    name=collection_name,
+                    metadata={"hnsw:space": "cosine"}  # Use cosine similarity
+                )
+                self._collections[collection_name] = collection
+            return collection
     
     def add_embedding(
         self,
@@ -59,6 +97,10 @@ class ChromaStore:
         """
         Add a single embedding to a collection.
         
+        With write batching enabled the embedding is buffered and written
+        with others once the batch fills or flush_due() finds it old enough;
+        any other operation on the collection flushes it first.
+        
         Args:
             collection_name: Target collection
             id: Unique ID for the embedding
@@ -66,6 +108,18 @@ class ChromaStore:
             metadata: Optional metadata dict
             document: Optional document text
         """
+        if self.write_batch_size > 1:
+            with self._buffer_lock:
+                buffer = self._buffers.setdefault(collection_name, {})
+                if not buffer:
+                    self._buffered_since[collection_name] = time.monotonic()
+                # Like collection.add, the first embedding for an ID wins
+                buffer.setdefault(id, (embedding, metadata, document))
+                full = len(buffer) >= self.write_batch_size
+            if full:
+                self.flush(collection_name)
+            return
+        
         collection = self.get_or_create_collection(collection_name)
         
         collection.add(
@@ -77,11 +131,74 @@ class ChromaStore:
         
         logger.debug(f"Added embedding {id} to collection {collection_name}")
     
+    def flush(self, collection_name: str) -> int:
+        """
+        Write the buffered embeddings of a collection.
+        
+        Args:
+            collection_name: Collection to flush
+            
+        Returns:
+            Number of embeddings written
+        """
+        with self._buffer_lock:
+            buffer = self._buffers.pop(collection_name, None)
+            self._buffered_since.pop(collection_name, None)
+        if not buffer:
+            return 0
+        
+        # collection.add needs metadatas/documents for all items or none
+        groups: Dict[Tuple[bool, bool], List[Tuple]] = {}
+        for item_id, (embedding, metadata, document) in buffer.items():
+            groups.setdefault((bool(metadata), bool(document)), []).append(
+                (item_id, embedding, metadata, document)
+            )
+        
+        try:
+            for (has_metadata, has_document), items in groups.items():
+                self.add_embeddings(
+                    collection_name=collection_name,
+                    ids=[item[0] for item in items],
+                    embeddings=[item[1] for item in items],
+                    metadatas=[item[2] for item in items] if has_metadata else None,
+                    documents=[item[3] for item in items] if has_document else None
+                )
+        except Exception:
+            # Keep the embeddings for the next flush (re-adding a written ID is a no-op)
+            with self._buffer_lock:
+                pending = self._buffers.setdefault(collection_name, {})
+                for item_id, item in buffer.items():
+                    pending.setdefault(item_id, item)
+                self._buffered_since.setdefault(collection_name, time.monotonic())
+            raise
+        return len(buffer)
+    
+    def flush_due(self) -> int:
+        """Flush every collection whose oldest buffered embedding is past the delay."""
+        now = time.monotonic()
+        with self._buffer_lock:
+            due = [
+                name for name, since in self._buffered_since.items()
+                if now - since >= self.max_write_delay_seconds
+            ]
+        return sum(self.flush(name) for name in due)
+    
+    def flush_all(self) -> int:
+        """Flush every buffered embedding (call at shutdown)."""
+        with self._buffer_lock:
+            names = list(self._buffers)
+        return sum(self.flush(name) for name in names)
+    
+    def _flush_pending(self, collection_name: str):
+        """Write buffered embeddings before another operation reads or changes the collection."""
+        if collection_name in self._buffers:
+            self.flush(collection_name)
+    
     def add_embeddings(
         self,
         collection_name: str,
         ids: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: Optional[List[Dict[str, Any]]] = None,
         documents: Optional[List[str]] = None
     ) -> None:
@@ -91,7 +208,8 @@ class ChromaStore:
         Args:
             collection_name: Target collection
             ids: List of unique IDs
-            embeddings: List of vector embeddings
+            embeddings: Vector embeddings, as lists or an (N, D) array; passed
+                to Chroma as one contiguous float32 array
             metadatas: Optional list of metadata dicts
             documents: Optional list of document texts
         """
@@ -99,7 +217,7 @@ class ChromaStore:
         
         collection.add(
             ids=ids,
-            embeddings=embeddings,
+            embeddings=np.ascontiguousarray(embeddings, dtype=np.float32),
             metadatas=metadatas,
             documents=documents
         )
@@ -127,6 +245,7 @@ class ChromaStore:
         Returns:
             Query results with ids, distances, metadatas, documents
         """
+        self._flush_pending(collection_name)
         collection = self.get_or_create_collection(collection_name)
         
         if include is None:
@@ -152,6 +271,9 @@ class ChromaStore:
         """
         Get a specific embedding by ID.
         
+        Fetching several records? Use get_by_ids, which needs one request
+        per GET_BATCH_SIZE IDs instead of one per ID.
+        
         Args:
             collection_name: Collection to query
             id: ID to fetch
@@ -160,24 +282,51 @@ class ChromaStore:
         Returns:
             Record data or None if not found
         """
+        return self.get_by_ids(collection_name, [id], include=include).get(id)
+    
+    def get_by_ids(
+        self,
+        collection_name: str,
+        ids: List[str],
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get several embeddings by ID in batched requests.
+        
+        Args:
+            collection_name: Collection to query
+            ids: IDs to fetch
+            include: Fields to include
+            
+        Returns:
+            Dict mapping each found ID to its record (same shape as get_by_id)
+        """
+        self._flush_pending(collection_name)
         collection = self.get_or_create_collection(collection_name)
         
         if include is None:
             include = ["metadatas", "documents", "embeddings"]
         
-        results = collection.get(
-            ids=[id],
-            include=include
-        )
+        records = {}
+        for start in range(0, len(ids), GET_BATCH_SIZE):
+            results = collection.get(
+                ids=ids[start:start + GET_BATCH_SIZE],
+                include=include
+            )
+            
+            metadatas = results.get('metadatas')
+            documents = results.get('documents')
+            embeddings = results.get('embeddings')
+            for i, record_id in enumerate(results['ids']):
+                records[record_id] = {
+                    'id': record_id,
+                    'metadata': metadatas[i] if metadatas else None,
+                    'document': documents[i] if documents else None,
+                    'embedding': embeddings[i] if embeddings is not None else None
+                }
         
-        if results['ids']:
-            return {
-                'id': results['ids'][0],
-                'metadata': results['metadatas'][0] if results.get('metadatas') else None,
-                'document': results['documents'][0] if results.get('documents') else None,
-                'embedding': results['embeddings'][0] if results.get('embeddings') else None
-            }
-        return None
+        logger.debug(f"Fetched {len(records)}/{len(ids)} records from {collection_name}")
+        return records
     
     def update_embedding(
         self,
@@ -197,6 +346,7 @@ class ChromaStore:
             metadata: New metadata (optional)
             document: New document (optional)
         """
+        self._flush_pending(collection_name)
         collection = self.get_or_create_collection(collection_name)
         
         collection.update(
@@ -222,6 +372,7 @@ class ChromaStore:
             ids: List of IDs to delete
             where: Filter condition for deletion
         """
+        self._flush_pending(collection_name)
         collection = self.get_or_create_collection(collection_name)
         
         if ids:
@@ -241,6 +392,7 @@ class ChromaStore:
         Returns:
             Number of embeddings
         """
+        self._flush_pending(collection_name)
         collection = self.get_or_create_collection(collection_name)
         return collection.count()
     
@@ -261,5 +413,10 @@ class ChromaStore:
         Args:
             collection_name: Collection to delete
         """
-        self.client.delete_collection(name=collection_name)
+        with self._buffer_lock:
+            self._buffers.pop(collection_name, None)
+            self._buffered_since.pop(collection_name, None)
+        with self._collection_lock:
+            self._collections.pop(collection_name, None)
+            self.client.delete_collection(name=collection_name)
         logger.info(f"Deleted collection: {collection_name}")
@@ -0,0 +1,227 @@
+"""
+Evaluation Cache - Reuse LLM candidate evaluations across repeat assessments.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Storage type of the cached unit vectors; half precision halves the matrices
+# and is far finer than the similarity threshold (products are taken in float32)
+VECTOR_DTYPE = np.float16
+
+
+def normalize_for_hash(text: str) -> str:
+    """Normalize text so formatting-only differences hash the same."""
+    return _WHITESPACE_RE.sub(' ', text).strip().lower()
+
+
+def hash_key(*parts: str) -> str:
+    """SHA-256 of the normalized parts, used as an exact cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(normalize_for_hash(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class EvaluationCache:
+    """
+    Two-tier in-process cache for LLM evaluations.
+    
+    1. Exact: keyed by a hash of the normalized prompt.
+    2. Semantic: when the exact key misses, an entry for the same candidate
+       whose candidate and job embeddings are both above the cosine similarity
+       threshold (and whose overall score is close) is reused. Evaluations
+       name the candidate's own strengths and gaps, so they are never
+       reused for another candidate.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        similarity_threshold: float = 0.95,
+        max_score_delta: float = 2.0
+    ):
+        """
+        Initialize the evaluation cache.
+        
+        Args:
+            max_entries: Maximum cached evaluations (oldest evicted first)
+            similarity_threshold: Minimum cosine similarity of both the candidate
+                and the job embedding for a semantic hit
+            max_score_delta: Maximum overall score difference for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.max_score_delta = max_score_delta
+        
+        self._lock = threading.Lock()
+        # key -> (slot, score, owner, value)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        
+        # Semantic tier: unit vectors (VECTOR_DTYPE) in fixed slots, allocated on first use
+        self._candidate_vecs: Optional[np.ndarray] = None
+        self._job_vecs: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[str]] = [None] * max_entries
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+    
+    def get(
+        self,
+        key: str,
+        score: float,
+        candidate_embedding: Optional[List[float]] = None,
+        job_embedding: Optional[List[float]] = None,
+        owner: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        Look up a cached evaluation.
+        
+        Args:
+            key: Exact key (see hash_key)
+            score: Overall score of the candidate being evaluated
+            candidate_embedding: Candidate embedding for the semantic tier
+            job_embedding: Job embedding for the semantic tier
+            owner: Candidate ID; the semantic tier only reuses entries stored
+                for the same owner (and is skipped without one)
+        
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                return entry[3]
+            
+            if owner is None:
+                return None
+            slot = self._find_similar(score, owner, candidate_embedding, job_embedding)
+            if slot is None:
+                return None
+            
+            similar_key = self._slot_keys[slot]
+            self._entries.move_to_end(similar_key)
+            logger.debug(f"Semantic evaluation cache hit for {key[:12]}")
+            return self._entries[similar_key][3]
+    
+    def put(
+        self,
+        key: str,
+        score: float,
+        value: Any,
+        candidate_embedding: Optional[List[float]] = None,
+        job_embedding: Optional[List[float]] = None,
+        owner: Optional[str] = None
+    ):
+        """
+        Store an evaluation.
+        
+        Args:
+            key: Exact key (see hash_key)
+            score: Overall score the evaluation was generated for
+            value: Evaluation to cache
+            candidate_embedding: Candidate embedding for the semantic tier
+            job_embedding: Job embedding for the semantic tier
+            owner: Candidate ID the evaluation describes; entries without one
+                are only reused on an exact key match
+        """
+        with self._lock:
+            if key in self._entries:
+                self._release(key)
+            while len(self._entries) >= self.max_entries:
+                self._release(next(iter(self._entries)))
+            
+            slot = None
+            candidate_vec = self._unit(candidate_embedding)
+            job_vec = self._unit(job_embedding)
+            if (
+                owner is not None and candidate_vec is not None and job_vec is not None
+                and self._ensure_matrix(candidate_vec.size, job_vec.size)
+            ):
+                slot = self._free_slots.pop()
+                self._candidate_vecs[slot] = candidate_vec
+                self._job_vecs[slot] = job_vec
+                self._slot_keys[slot] = key
+            
+            self._entries[key] = (slot, score, owner, value)
+    
+    def clear(self):
+        """Drop every cached evaluation."""
+        with self._lock:
+            self._entries.clear()
+            self._candidate_vecs = None
+            self._job_vecs = None
+            self._slot_keys = [None] * self.max_entries
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+    
+    def _find_similar(
+        self,
+        score: float,
+        owner: str,
+        candidate_embedding: Optional[List[float]],
+        job_embedding: Optional[List[float]]
+    ) -> Optional[int]:
+        """Return the slot of the most similar eligible entry of the same owner, if any."""
+        if self._candidate_vecs is None:
+            return None
+        
+        candidate_vec = self._unit(candidate_embedding)
+        job_vec = self._unit(job_embedding)
+        if (
+            candidate_vec is None or job_vec is None
+            or candidate_vec.size != self._candidate_vecs.shape[1]
+            or job_vec.size != self._job_vecs.shape[1]
+        ):
+            return None
+        
+        # Free slots are zero vectors, so they never pass the threshold
+        similarity = np.minimum(
+            np.matmul(self._candidate_vecs, candidate_vec, dtype=np.float32),
+            np.matmul(self._job_vecs, job_vec, dtype=np.float32)
+        )
+        for slot in np.argsort(similarity)[::-1]:
+            if similarity[slot] < self.similarity_threshold:
+                return None
+            entry = self._entries.get(self._slot_keys[slot])
+            if entry and entry[2] == owner and abs(entry[1] - score) <= self.max_score_delta:
+                return int(slot)
+        return None
+    
+    def _ensure_matrix(self, candidate_dim: int, job_dim: int) -> bool:
+        """Allocate the embedding matrices; False if dimensions don't match them."""
+        if self._candidate_vecs is None:
+            self._candidate_vecs = np.zeros((self.max_entries, candidate_dim), dtype=VECTOR_DTYPE)
+            self._job_vecs = np.zeros((self.max_entries, job_dim), dtype=VECTOR_DTYPE)
+            return True
+        return (
+            self._candidate_vecs.shape[1] == candidate_dim
+            and self._job_vecs.shape[1] == job_dim
+        )
+    
+    def _release(self, key: str):
+        """Remove an entry and free its embedding slot."""
+        slot, _, _, _ = self._entries.pop(key)
+        if slot is not None:
+            self._candidate_vecs[slot] = 0
+            self._job_vecs[slot] = 0
+            self._slot_keys[slot] = None
+            self._free_slots.append(slot)
+    
+    @staticmethod
+    def _unit(embedding: Optional[List[float]]) -> Optional[np.ndarray]:
+        """Normalize an embedding to unit length (None if missing or zero)."""
+        if embedding is None or len(embedding) == 0:
+            return None
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else None
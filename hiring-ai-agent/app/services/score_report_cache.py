@@ -0,0 +1,170 @@
+"""
+Score Report Cache - Reuse score reports when nothing that determines them has changed.
+"""
+import json
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.candidate import Candidate
+from app.models.job_context import JobContext
+from app.models.score_report import ScoreReport
+from app.services.evaluation_cache import hash_key
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Candidate and job fields that feed the scores and the evaluation prompt
+_CANDIDATE_KEY_FIELDS = {
+    "name", "headline", "skills", "total_experience_years", "summary", "experience"
+}
+_JOB_KEY_FIELDS = {
+    "job_title", "seniority", "required_skills", "preferred_skills", "experience_required",
+    "experience_min_years", "experience_max_years", "domain", "raw_text_hash"
+}
+
+
+class ScoreReportCache:
+    """
+    Exact-match cache of score reports, persisted in SQLite.
+    
+    The key hashes the (normalized) resume text, the scoring-relevant candidate
+    and job fields, the models and the scoring weights, so any change to those
+    produces a fresh assessment.
+    """
+    
+    def __init__(
+        self,
+        database,
+        model_version: str,
+        weights: Dict[str, float],
+        ttl_hours: int = 168
+    ):
+        """
+        Initialize the score report cache.
+        
+        Args:
+            database: DatabaseStore instance
+            model_version: Identifies the LLM/embedding models in use
+            weights: Scoring weights
+            ttl_hours: How long a cached report stays valid
+        """
+        self.db = database
+        self.model_version = model_version
+        self.weights = json.dumps(weights, sort_keys=True)
+        self.ttl_hours = ttl_hours
+        
+        pruned = self.db.prune_score_cache(ttl_hours)
+        if pruned:
+            logger.info(f"Pruned {pruned} expired cached score reports")
+    
+    def key_for(self, candidate: Candidate, job: JobContext) -> str:
+        """Cache key for a candidate/job pair."""
+        return hash_key(
+            candidate.raw_text or "",
+            candidate.model_dump_json(include=_CANDIDATE_KEY_FIELDS),
+            job.model_dump_json(include=_JOB_KEY_FIELDS),
+            self.model_version,
+            self.weights
+        )
+    
+    def get_or_compute(
+        self,
+        candidate: Candidate,
+        job: JobContext,
+        compute_fn: Callable[[], ScoreReport],
+        force_refresh: bool = False
+    ) -> ScoreReport:
+        """
+        Return the cached report for this pair, or compute and cache it.
+        
+        Args:
+            candidate: Candidate model
+            job: JobContext model
+            compute_fn: Runs the scoring and LLM pipeline on a miss
+            force_refresh: Skip the lookup (the result is still cached)
+        
+        Returns:
+            ScoreReport for this candidate and job
+        """
+        key = self.key_for(candidate, job)
+        
+        if not force_refresh:
+            cached = self._get(key)
+            if cached:
+                logger.info(f"Score cache hit for {candidate.name} / {job.job_title}")
+                return cached.model_copy(update={
+                    "id": None,
+                    "candidate_id": candidate.id,
+                    "job_id": job.id,
+                    "candidate_name": candidate.name
+                })
+        
+        report = compute_fn()
+        try:
+            self.db.put_cached_score_report(key, report.model_dump_json(exclude={"id"}))
+        except Exception as e:
+            logger.warning(f"Failed to cache score report: {e}")
+        return report
+    
+    def lookup(self, candidates: List[Candidate], job: JobContext) -> Dict[str, ScoreReport]:
+        """
+        Get the cached reports of several candidates for a job in one query.
+        
+        Args:
+            candidates: Candidate models
+            job: JobContext model
+        
+        Returns:
+            Dict mapping candidate ID to its cached report (misses left out)
+        """
+        keys = {candidate.id: self.key_for(candidate, job) for candidate in candidates}
+        try:
+            payloads = self.db.get_cached_score_reports(list(keys.values()), self.ttl_hours)
+        except Exception as e:
+            logger.warning(f"Score cache lookup failed: {e}")
+            return {}
+        
+        reports = {}
+        for candidate in candidates:
+            payload = payloads.get(keys[candidate.id])
+            if not payload:
+                continue
+            try:
+                cached = ScoreReport.model_validate_json(payload)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cached score report: {e}")
+                continue
+            reports[candidate.id] = cached.model_copy(update={
+                "id": None,
+                "candidate_id": candidate.id,
+                "job_id": job.id,
+                "candidate_name": candidate.name
+            })
+        
+        if reports:
+            logger.info(f"Score cache hits: {len(reports)}/{len(candidates)} for {job.job_title}")
+        return reports
+    
+    def put(self, job: JobContext, scored: List[Tuple[Candidate, ScoreReport]]):
+        """
+        Cache several freshly computed reports for a job in one transaction.
+        
+        Args:
+            job: JobContext model
+            scored: (candidate, report) pairs
+        """
+        try:
+            self.db.put_cached_score_reports([
+                (self.key_for(candidate, job), report.model_dump_json(exclude={"id"}))
+                for candidate, report in scored
+            ])
+        except Exception as e:
+            logger.warning(f"Failed to cache score reports: {e}")
+    
+    def _get(self, key: str) -> Optional[ScoreReport]:
+        """Load and deserialize a cached report (None on miss or bad entry)."""
+        try:
+            payload = self.db.get_cached_score_report(key, self.ttl_hours)
+            return ScoreReport.model_validate_json(payload) if payload else None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached score report: {e}")
+            return None
@@ -1,11 +1,17 @@
 from .text_cleaner import TextCleaner
 from .logger import setup_logger, get_logger
 from .error_handler import AppException, handle_exception
+from .regex_utils import compile_pattern
+from .json_response import FastJSONResponse
+from .http_cache import etag_matches
 
 __all__ = [
     "TextCleaner",
     "setup_logger",
     "get_logger",
     "AppException",
-    "handle_exception"
+    "handle_exception",
+    "compile_pattern",
+    "FastJSONResponse",
+    "etag_matches"
 ]
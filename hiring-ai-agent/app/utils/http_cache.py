@@ -0,0 +1,25 @@
+"""
+HTTP Cache - Conditional request helpers shared by the API routes.
+"""
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag (RFC 9110).
+    
+    Args:
+        if_none_match: Header value: "*" or a comma-separated list of tags
+        etag: Current (quoted) entity tag
+        
+    Returns:
+        True if the client's copy is current
+    """
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
@@ -0,0 +1,38 @@
+"""
+JSON Response - Serialize handler payloads with orjson, skipping jsonable_encoder.
+"""
+from pathlib import PurePath
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """
+    Serialize the types orjson does not handle natively.
+    
+    datetime, UUID and dataclasses are native to orjson; pydantic models are
+    dumped once per model, which also covers nested sub-models.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json')
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered directly with orjson (models allowed in the payload)."""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
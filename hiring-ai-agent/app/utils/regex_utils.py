@@ -0,0 +1,40 @@
+"""
+Regex Utils - Compile patterns with RE2 when available.
+"""
+import re
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    # Optional: google-re2 matches in linear time without backtracking and
+    # releases the GIL while matching
+    import re2
+except ImportError:
+    re2 = None
+
+
+def compile_pattern(pattern: str, ignore_case: bool = False):
+    """
+    Compile a regex, preferring RE2 and falling back to the stdlib engine.
+    
+    Both engines expose the same match/search/group API, so callers do not
+    need to know which one they got.
+    
+    Args:
+        pattern: Regular expression
+        ignore_case: Match case-insensitively
+        
+    Returns:
+        Compiled pattern object
+    """
+    if re2 is not None:
+        try:
+            # Inline flag works across the re2 bindings, unlike their flag arguments
+            return re2.compile(f"(?i){pattern}" if ignore_case else pattern)
+        except Exception as e:
+            # RE2 rejects backreferences and lookarounds
+            logger.debug(f"RE2 cannot compile {pattern!r} ({e}), using re")
+    
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
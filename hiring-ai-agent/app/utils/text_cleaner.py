@@ -2,8 +2,40 @@
 Text Cleaner - Utilities for cleaning and normalizing text.
 """
 import re
+from functools import lru_cache
 from typing import List
 
+# Common skill normalizations (lowercase alias -> canonical name)
+SKILL_NORMALIZATIONS = {
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'py': 'Python',
+    'c++': 'C++',
+    'c#': 'C#',
+    'node': 'Node.js',
+    'react': 'React',
+    'vue': 'Vue.js',
+    'angular': 'Angular',
+    'aws': 'AWS',
+    'gcp': 'Google Cloud',
+    'azure': 'Azure',
+    'k8s': 'Kubernetes',
+    'docker': 'Docker',
+    'sql': 'SQL',
+    'nosql': 'NoSQL',
+    'ml': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'ai': 'Artificial Intelligence',
+    'nlp': 'NLP',
+    'cv': 'Computer Vision',
+}
+
+
+@lru_cache(maxsize=8192)
+def _normalize_skill_cached(skill: str) -> str:
+    """Process-wide memoized skill normalization; the same skills recur across JDs and resumes."""
+    return SKILL_NORMALIZATIONS.get(skill.lower(), skill)
+
 
 class TextCleaner:
     """
@@ -196,35 +228,4 @@ class TextCleaner:
         Returns:
             Normalized skill name
         """
-        skill = skill.strip()
-        
-        # Common normalizations
-        normalizations = {
-            'js': 'JavaScript',
-            'ts': 'TypeScript',
-            'py': 'Python',
-            'c++': 'C++',
-            'c#': 'C#',
-            'node': 'Node.js',
-            'react': 'React',
-            'vue': 'Vue.js',
-            'angular': 'Angular',
-            'aws': 'AWS',
-            'gcp': 'Google Cloud',
-            'azure': 'Azure',
-            'k8s': 'Kubernetes',
-            'docker': 'Docker',
-            'sql': 'SQL',
-            'nosql': 'NoSQL',
-            'ml': 'Machine Learning',
-            'dl': 'Deep Learning',
-            'ai': 'Artificial Intelligence',
-            'nlp': 'NLP',
-            'cv': 'Computer Vision',
-        }
-        
-        skill_lower = skill.lower()
-        if skill_lower in normalizations:
-            return normalizations[skill_lower]
-        
-        return skill
+        return _normalize_skill_cached(skill.strip())
@@ -1,13 +1,15 @@
 """
 Assessment Workflow - Compare a candidate against a job and generate scores.
 """
-from typing import Optional
+import asyncio
+from typing import List, Optional
 
 from app.models.job_context import JobContext
 from app.models.candidate import Candidate
 from app.models.score_report import ScoreReport
 from app.agents.ranking_agent import RankingAgent
 from app.services.chroma_db import ChromaStore
+from app.services.score_report_cache import ScoreReportCache
 from app.database.store import DatabaseStore
 from app.config import get_settings
 from app.utils.logger import get_logger
@@ -28,7 +30,8 @@ class AssessmentWorkflow:
         self,
         ranking_agent: RankingAgent,
         chroma_store: ChromaStore,
-        database: DatabaseStore
+        database: DatabaseStore,
+        score_cache: Optional[ScoreReportCache] = None
     ):
         """
         Initialize Assessment Workflow.
@@ -37,10 +40,12 @@ class AssessmentWorkflow:
             ranking_agent: RankingAgent instance
             chroma_store: ChromaStore instance
             database: DatabaseStore instance
+            score_cache: Optional cache of reports keyed by candidate/job content
         """
         self.ranking_agent = ranking_agent
         self.chroma = chroma_store
         self.db = database
+        self.score_cache = score_cache
         self.settings = get_settings()
     
     def assess_candidate(
@@ -89,17 +94,20 @@ class AssessmentWorkflow:
             job_id
         )
         
-        # Generate score report using ranking agent
-        report = self.ranking_agent.generate_candidate_rank(
-            candidate=candidate,
-            job=job,
-            candidate_embedding=candidate_embedding,
-            job_embedding=job_embedding
+        return self._score_and_store(
+            candidate, job, candidate_embedding, job_embedding, bypass_cache=force_refresh
         )
-        
-        # Update IDs
-        report.candidate_id = candidate_id
-        report.job_id = job_id
+    
+    def _score_and_store(
+        self,
+        candidate: Candidate,
+        job: JobContext,
+        candidate_embedding: Optional[list],
+        job_embedding: Optional[list],
+        bypass_cache: bool = False
+    ) -> ScoreReport:
+        """Run the ranking agent for a loaded candidate/job pair and store the report."""
+        report = self._score(candidate, job, candidate_embedding, job_embedding, bypass_cache)
         
         # Store score report
         report_id = self.db.create_score_report(report)
@@ -108,6 +116,36 @@ class AssessmentWorkflow:
         logger.info(f"Assessment complete: {report.overall_score:.1f}")
         return report
     
+    def _score(
+        self,
+        candidate: Candidate,
+        job: JobContext,
+        candidate_embedding: Optional[list],
+        job_embedding: Optional[list],
+        bypass_cache: bool = False
+    ) -> ScoreReport:
+        """Run the ranking agent for a loaded candidate/job pair (not stored)."""
+        # Generate score report using ranking agent
+        def compute() -> ScoreReport:
+            return self.ranking_agent.generate_candidate_rank(
+                candidate=candidate,
+                job=job,
+                candidate_embedding=candidate_embedding,
+                job_embedding=job_embedding
+            )
+        
+        if self.score_cache is not None:
+            report = self.score_cache.get_or_compute(
+                candidate, job, compute, force_refresh=bypass_cache
+            )
+        else:
+            report = compute()
+        
+        # Update IDs
+        report.candidate_id = candidate.id
+        report.job_id = job.id
+        return report
+    
     def _get_embedding(self, collection: str, id: str) -> Optional[list]:
         """Get embedding from vector store."""
         result = self.chroma.get_by_id(
@@ -137,11 +175,21 @@ class AssessmentWorkflow:
         """
         logger.info(f"Direct assessment: {candidate.name} for {job.job_title}")
         
+        # Stored models don't carry their embeddings; read those from the vector store
+        candidate_embedding = candidate.embedding_vector
+        if candidate_embedding is None and candidate.id:
+            candidate_embedding = self._get_embedding(
+                self.settings.chroma_collection_candidates, candidate.id
+            )
+        job_embedding = job.embedding_vector
+        if job_embedding is None and job.id:
+            job_embedding = self._get_embedding(self.settings.chroma_collection_jobs, job.id)
+        
         return self.ranking_agent.generate_candidate_rank(
             candidate=candidate,
             job=job,
-            candidate_embedding=candidate.embedding_vector,
-            job_embedding=job.embedding_vector
+            candidate_embedding=candidate_embedding,
+            job_embedding=job_embedding
         )
     
     def get_assessment(
@@ -165,30 +213,211 @@ class AssessmentWorkflow:
         self,
         candidate_ids: list,
         job_id: str,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        job_embedding: Optional[list] = None
     ) -> list:
         """
         Assess multiple candidates for a job.
         
+        The job is loaded once and the embeddings of every candidate that
+        needs scoring are fetched from the vector store in one batched get;
+        candidates without a stored or cached report are scored together by
+        RankingAgent.rank_candidates (batched, concurrent LLM evaluations).
+        force_refresh ignores both the stored reports and the score cache, and
+        the regenerated reports replace the cached ones.
+        
         Args:
             candidate_ids: List of candidate IDs
             job_id: Job ID
             force_refresh: Whether to regenerate
+            job_embedding: Job embedding if the caller already has it
             
         Returns:
             List of ScoreReports
         """
-        reports = []
+        job = self.db.get_job(job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        
+        # Candidates and their stored reports in one query
+        loaded = {
+            candidate.id: (candidate, existing)
+            for candidate, existing in self.db.get_candidates_with_scores(candidate_ids, job_id)
+        }
         
+        reports = []
+        pending = []
         for candidate_id in candidate_ids:
+            if candidate_id not in loaded:
+                logger.error(f"Failed to assess {candidate_id}: Candidate {candidate_id} not found")
+                continue
+            candidate, existing = loaded[candidate_id]
+            if existing and not force_refresh:
+                reports.append(existing)
+            else:
+                pending.append(candidate)
+        
+        if not pending:
+            return reports
+        
+        if job_embedding is None:
+            job_embedding = self._get_embedding(self.settings.chroma_collection_jobs, job_id)
+        
+        candidate_records = self.chroma.get_by_ids(
+            collection_name=self.settings.chroma_collection_candidates,
+            ids=[candidate.id for candidate in pending],
+            include=["embeddings"]
+        )
+        
+        # Reports cached for unchanged candidate/job content, in one lookup
+        if self.score_cache is not None and not force_refresh:
+            cached = self.score_cache.lookup(pending, job)
+        else:
+            cached = {}
+        
+        misses = [candidate for candidate in pending if candidate.id not in cached]
+        computed = self._rank_misses(misses, job, candidate_records, job_embedding)
+        
+        scored = []
+        for candidate in pending:
+            report = cached.get(candidate.id) or computed.get(candidate.id)
+            if report is None:
+                continue
+            report.candidate_id = candidate.id
+            report.job_id = job.id
+            scored.append(report)
+        
+        if computed and self.score_cache is not None:
+            self.score_cache.put(job, [
+                (candidate, computed[candidate.id])
+                for candidate in misses if candidate.id in computed
+            ])
+        
+        # Store the new reports in one transaction
+        if len(scored) > 1:
+            for report, report_id in zip(scored, self.db.create_score_reports_bulk(scored)):
+                report.id = report_id
+        elif scored:
+            scored[0].id = self.db.create_score_report(scored[0])
+        
+        reports.extend(scored)
+        return reports
+    
+    def _rank_misses(
+        self,
+        candidates: List[Candidate],
+        job: JobContext,
+        candidate_records: dict,
+        job_embedding: Optional[list]
+    ) -> dict:
+        """
+        Score candidates that have no stored or cached report.
+        
+        Goes through RankingAgent.rank_candidates, so the LLM evaluations are
+        batched (eval_batch_size per call) with at most max_concurrency calls
+        in flight. If that fails, candidates are scored one at a time and
+        those that still fail are left out.
+        
+        Returns:
+            Dict mapping candidate ID to its new ScoreReport
+        """
+        if not candidates:
+            return {}
+        
+        embeddings = {
+            candidate_id: record['embedding'] for candidate_id, record in candidate_records.items()
+        }
+        try:
+            reports = self.ranking_agent.rank_candidates(candidates, job, embeddings, job_embedding)
+            return {report.candidate_id: report for report in reports}
+        except Exception as e:
+            logger.error(f"Batched assessment failed, assessing one at a time: {e}")
+        
+        computed = {}
+        for candidate in candidates:
             try:
-                report = self.assess_candidate(
-                    candidate_id=candidate_id,
-                    job_id=job_id,
-                    force_refresh=force_refresh
+                computed[candidate.id] = self.ranking_agent.generate_candidate_rank(
+                    candidate=candidate,
+                    job=job,
+                    candidate_embedding=embeddings.get(candidate.id),
+                    job_embedding=job_embedding
                 )
-                reports.append(report)
             except Exception as e:
-                logger.error(f"Failed to assess {candidate_id}: {e}")
+                logger.error(f"Failed to assess {candidate.id}: {e}")
+        return computed
+    
+    async def assess_candidates_async(
+        self,
+        candidate_ids: List[str],
+        job: JobContext,
+        max_concurrency: int = 8
+    ) -> List[ScoreReport]:
+        """
+        Assess several candidates for a loaded job, overlapping their LLM calls.
         
-        return reports
+        Stored reports are reused; the embeddings of the rest are fetched in
+        one batched get and at most max_concurrency assessments run at once.
+        Unlike batch_assess, a missing candidate raises instead of being skipped.
+        
+        Args:
+            candidate_ids: Candidate IDs (duplicates are assessed once)
+            job: JobContext model
+            max_concurrency: Maximum assessments in flight
+            
+        Returns:
+            ScoreReports in candidate_ids order
+        """
+        candidate_ids = list(dict.fromkeys(candidate_ids))
+        reports, pending = await asyncio.to_thread(self._load_pending, candidate_ids, job.id)
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def assess(candidate: Candidate, candidate_embedding, job_embedding):
+            async with semaphore:
+                reports[candidate.id] = await asyncio.to_thread(
+                    self._score_and_store, candidate, job, candidate_embedding, job_embedding
+                )
+        
+        await asyncio.gather(*(assess(*args) for args in pending))
+        
+        return [reports[candidate_id] for candidate_id in candidate_ids]
+    
+    def _load_pending(self, candidate_ids: List[str], job_id: str) -> tuple:
+        """
+        Split candidates into stored reports and those that still need scoring.
+        
+        Returns:
+            (reports by candidate ID, list of (candidate, candidate embedding,
+            job embedding) to score)
+        """
+        loaded = {
+            candidate.id: (candidate, existing)
+            for candidate, existing in self.db.get_candidates_with_scores(candidate_ids, job_id)
+        }
+        
+        reports = {}
+        candidates = []
+        for candidate_id in candidate_ids:
+            if candidate_id not in loaded:
+                raise ValueError(f"Candidate {candidate_id} not found")
+            candidate, existing = loaded[candidate_id]
+            if existing:
+                reports[candidate_id] = existing
+            else:
+                candidates.append(candidate)
+        
+        if not candidates:
+            return reports, []
+        
+        job_embedding = self._get_embedding(self.settings.chroma_collection_jobs, job_id)
+        records = self.chroma.get_by_ids(
+            collection_name=self.settings.chroma_collection_candidates,
+            ids=[c.id for c in candidates],
+            include=["embeddings"]
+        )
+        
+        pending = []
+        for candidate in candidates:
+            record = records.get(candidate.id)
+            pending.append((candidate, record['embedding'] if record else None, job_embedding))
+        return reports, pending
@@ -72,6 +72,9 @@ class JobContextWorkflow:
         job_id = self.db.create_job(job_context)
         job_context.id = job_id
         
+        # The text is persisted now; keep only its hash/length in memory
+        job_context.raw_text = None
+        
         # Step 4: Store embedding in vector store
         self._store_embedding(job_context)
         
@@ -113,7 +116,9 @@ class JobContextWorkflow:
     
     def get_job(self, job_id: str) -> Optional[JobContext]:
         """
-        Get a job by ID with embedding.
+        Get a job by ID.
+        
+        The embedding is not loaded; scoring reads it from the vector store.
         
         Args:
             job_id: Job ID
@@ -121,18 +126,7 @@ class JobContextWorkflow:
         Returns:
             JobContext or None
         """
-        job = self.db.get_job(job_id)
-        
-        if job:
-            # Fetch embedding from vector store
-            result = self.chroma.get_by_id(
-                collection_name=self.settings.chroma_collection_jobs,
-                id=job_id
-            )
-            if result and result.get('embedding'):
-                job.embedding_vector = result['embedding']
-        
-        return job
+        return self.db.get_job(job_id)
     
     def find_job_by_title(self, title: str) -> Optional[JobContext]:
         """
@@ -1,6 +1,8 @@
 """
 Ranking Workflow - Full ranking pipeline for all candidates for a job.
 """
+import asyncio
+import heapq
 from typing import List, Optional
 
 from app.models.job_context import JobContext
@@ -58,7 +60,8 @@ class RankingWorkflow:
         
         Args:
             job_id: Job ID
-            top_k: Optional limit on number of candidates
+            top_k: Only report the best K candidates (also caps the
+                vector-similarity search)
             force_refresh: Whether to regenerate all scores
             
         Returns:
@@ -87,21 +90,19 @@ class RankingWorkflow:
                 top_candidates_summary="No candidates available for this position."
             )
         
-        # Assess each candidate
-        reports = []
-        for cand_id in candidate_ids:
-            try:
-                report = self.assessment.assess_candidate(
-                    candidate_id=cand_id,
-                    job_id=job_id,
-                    force_refresh=force_refresh
-                )
-                reports.append(report)
-            except Exception as e:
-                logger.error(f"Failed to assess candidate {cand_id}: {e}")
+        # Assess candidates (embeddings fetched in one batched vector-store get)
+        reports = self.assessment.batch_assess(
+            candidate_ids,
+            job_id,
+            force_refresh=force_refresh,
+            job_embedding=job_embedding
+        )
         
-        # Sort by score
-        reports.sort(key=lambda r: r.overall_score, reverse=True)
+        # Best first; with top_k, an O(N log K) selection instead of a full sort
+        if top_k:
+            reports = heapq.nlargest(top_k, reports, key=lambda r: r.overall_score)
+        else:
+            reports.sort(key=lambda r: r.overall_score, reverse=True)
         
         # Generate summary
         summary = self.ranking_agent.generate_ranking_summary(reports, job)
@@ -146,9 +147,7 @@ class RankingWorkflow:
         candidate_ids = set()
         
         # Get candidates who applied for this job directly
-        direct_candidates = self.db.list_candidates(job_id=job_id)
-        for cand in direct_candidates:
-            candidate_ids.add(cand.id)
+        candidate_ids.update(self.db.list_candidate_ids(job_id=job_id))
         
         # If we have a job embedding, find similar candidates
         if job_embedding:
@@ -166,12 +165,11 @@ class RankingWorkflow:
         
         # If still no candidates, get all candidates
         if not candidate_ids:
-            all_candidates = self.db.list_candidates(limit=top_k or 100)
-            candidate_ids = {c.id for c in all_candidates}
+            candidate_ids = set(self.db.list_candidate_ids(limit=top_k or 100))
         
+        # Not cut to top_k here: set order is arbitrary, so the best K are
+        # selected after scoring instead
         result = list(candidate_ids)
-        if top_k:
-            result = result[:top_k]
         
         logger.info(f"Found {len(result)} candidates for ranking")
         return result
@@ -188,6 +186,31 @@ class RankingWorkflow:
         """
         return self.db.get_rankings_for_job(job_id)
     
+    def get_stored_rankings(
+        self,
+        job_id: str,
+        top_k: Optional[int] = None
+    ) -> Optional[List[ScoreReport]]:
+        """
+        Get the stored rankings a ranking run would return, without running it.
+        
+        Only reads the database (no scoring or LLM calls), so conditional
+        requests can be answered before the pipeline. Returns None while a
+        direct applicant has no report yet, since a run would score them.
+        
+        Args:
+            job_id: Job ID
+            top_k: Only the best K reports
+            
+        Returns:
+            ScoreReports, highest score first, or None
+        """
+        reports = self.db.get_rankings_for_job(job_id)
+        scored = {report.candidate_id for report in reports}
+        if not scored.issuperset(self.db.list_candidate_ids(job_id=job_id)):
+            return None
+        return reports[:top_k] if top_k else reports
+    
     def get_top_candidates(
         self,
         job_id: str,
@@ -203,8 +226,7 @@ class RankingWorkflow:
         Returns:
             List of top ScoreReports
         """
-        all_rankings = self.get_rankings(job_id)
-        return all_rankings[:limit]
+        return self.db.get_rankings_for_job(job_id, limit=limit)
     
     def compare_candidates(
         self,
@@ -240,3 +262,44 @@ class RankingWorkflow:
             "best_candidate": reports[0] if reports else None,
             "summary": self.ranking_agent.generate_ranking_summary(reports, job) if job else ""
         }
+    
+    async def compare_candidates_async(
+        self,
+        candidate_ids: List[str],
+        job_id: str
+    ) -> dict:
+        """
+        Compare specific candidates for a job, assessing them concurrently.
+        
+        Args:
+            candidate_ids: List of candidate IDs to compare
+            job_id: Job ID
+            
+        Returns:
+            Comparison dict with rankings and analysis
+        """
+        job = await asyncio.to_thread(self.db.get_job, job_id)
+        if not job:
+            raise ValueError(f"Job {job_id} not found")
+        
+        reports = await self.assessment.assess_candidates_async(
+            candidate_ids,
+            job,
+            max_concurrency=self.ranking_agent.max_concurrency
+        )
+        
+        # Sort by score
+        reports.sort(key=lambda r: r.overall_score, reverse=True)
+        
+        summary = await asyncio.to_thread(
+            self.ranking_agent.generate_ranking_summary, reports, job
+        )
+        
+        return {
+            "job_id": job_id,
+            "job_title": job.job_title,
+            "candidates_compared": len(reports),
+            "rankings": reports,
+            "best_candidate": reports[0] if reports else None,
+            "summary": summary
+        }
@@ -1,6 +1,7 @@
 """
 Resume Ingestion Workflow - Orchestrates resume parsing, embedding, and storage.
 """
+import shutil
 from pathlib import Path
 from typing import Optional, Union
 
@@ -110,6 +111,42 @@ class ResumeIngestionWorkflow:
             pdf_bytes=pdf_bytes
         )
     
+    def process_resume_path(
+        self,
+        file_path: Union[str, Path],
+        source: str = "upload",
+        job_id: Optional[str] = None,
+        filename: Optional[str] = None
+    ) -> Candidate:
+        """
+        Process an uploaded resume that has been spooled to disk.
+        
+        Unlike process_resume_file, the original PDF is kept as the
+        candidate's resume file; unlike process_resume_bytes, it is never
+        held in memory as a whole.
+        
+        Args:
+            file_path: Path to the spooled PDF (left in place for the caller)
+            source: How resume was received
+            job_id: Associated job ID
+            filename: Original filename
+            
+        Returns:
+            Processed Candidate
+        """
+        logger.info(f"Processing resume upload {file_path} (filename={filename})")
+        
+        # Step 1: Extract text from the PDF on disk
+        pdf_result = self.pdf_parser.extract_text(file_path)
+        
+        return self._process_resume_content(
+            raw_text=pdf_result["raw_text"],
+            is_linkedin=pdf_result["is_linkedin_pdf"],
+            source=source,
+            job_id=job_id,
+            pdf_path=file_path
+        )
+    
     def _process_resume_content(
         self,
         raw_text: str,
@@ -117,7 +154,8 @@ class ResumeIngestionWorkflow:
         source: str,
         job_id: Optional[str],
         enrich_github: bool = True,
-        pdf_bytes: Optional[bytes] = None
+        pdf_bytes: Optional[bytes] = None,
+        pdf_path: Optional[Union[str, Path]] = None
     ) -> Candidate:
         """
         Process extracted resume content.
@@ -129,6 +167,7 @@ class ResumeIngestionWorkflow:
             job_id: Associated job ID
             enrich_github: Whether to enrich with GitHub data
             pdf_bytes: Original PDF bytes to store
+            pdf_path: Path of the original PDF to store (instead of pdf_bytes)
             
         Returns:
             Processed Candidate
@@ -158,6 +197,12 @@ class ResumeIngestionWorkflow:
                 else:
                     return existing
         
+        # Fill in total experience once, from the entries, when the extractor didn't give it
+        if candidate.total_experience_years is None:
+            months = sum(exp.duration_months or 0 for exp in candidate.experience)
+            if months:
+                candidate.total_experience_years = round(months / 12.0, 1)
+        
         # Step 4: Generate embedding
         embedding_text = self._build_embedding_text(candidate)
         embedding = self.llm.embed_text(embedding_text)
@@ -168,8 +213,8 @@ class ResumeIngestionWorkflow:
         candidate.id = candidate_id
         
         # Step 5.5: Save original PDF file
-        if pdf_bytes:
-            resume_path = self._save_resume_file(candidate_id, pdf_bytes)
+        if pdf_bytes or pdf_path:
+            resume_path = self._save_resume_file(candidate_id, pdf_bytes, pdf_path)
             candidate.resume_file_path = resume_path
             self.db.update_candidate(candidate)
         
@@ -179,13 +224,19 @@ class ResumeIngestionWorkflow:
         logger.info(f"Resume ingestion complete: {candidate_id} ({candidate.name})")
         return candidate
     
-    def _save_resume_file(self, candidate_id: str, pdf_bytes: bytes) -> str:
+    def _save_resume_file(
+        self,
+        candidate_id: str,
+        pdf_bytes: Optional[bytes] = None,
+        pdf_path: Optional[Union[str, Path]] = None
+    ) -> str:
         """
         Save the original resume PDF to disk.
         
         Args:
             candidate_id: Candidate ID
             pdf_bytes: PDF file content
+            pdf_path: Existing PDF to copy (used when pdf_bytes is not given)
             
         Returns:
             Path to saved file
@@ -196,8 +247,11 @@ class ResumeIngestionWorkflow:
         
         # Save file
         file_path = resumes_dir / f"{candidate_id}.pdf"
-        with open(file_path, 'wb') as f:
-            f.write(pdf_bytes)
+        if pdf_bytes:
+            with open(file_path, 'wb') as f:
+                f.write(pdf_bytes)
+        else:
+            shutil.copyfile(pdf_path, file_path)
         
         logger.info(f"Saved resume file: {file_path}")
         return str(file_path)
@@ -228,7 +282,7 @@ class ResumeIngestionWorkflow:
             "name": candidate.name or "",
             "email": candidate.email or "",
             "skills": ",".join(candidate.skills[:15]),
-            "experience_years": str(candidate.total_experience_years or 0),
+            "experience_years": float(candidate.total_experience_years or 0),
             "job_id": candidate.job_id or "",
             "source": candidate.source,
             "type": "candidate"
@@ -244,7 +298,9 @@ class ResumeIngestionWorkflow:
     
     def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
         """
-        Get a candidate by ID with embedding.
+        Get a candidate by ID.
+        
+        The embedding is not loaded; scoring reads it from the vector store.
         
         Args:
             candidate_id: Candidate ID
@@ -252,18 +308,7 @@ class ResumeIngestionWorkflow:
         Returns:
             Candidate or None
         """
-        candidate = self.db.get_candidate(candidate_id)
-        
-        if candidate:
-            # Fetch embedding from vector store
-            result = self.chroma.get_by_id(
-                collection_name=self.settings.chroma_collection_candidates,
-                id=candidate_id
-            )
-            if result and result.get('embedding'):
-                candidate.embedding_vector = result['embedding']
-        
-        return candidate
+        return self.db.get_candidate(candidate_id)
     
     def list_candidates(
         self,
@@ -273,6 +318,14 @@ class ResumeIngestionWorkflow:
         """List candidates, optionally filtered by job."""
         return self.db.list_candidates(job_id=job_id, limit=limit)
     
+    def list_candidates_summary(
+        self,
+        job_id: Optional[str] = None,
+        limit: int = 100
+    ):
+        """List candidates for display (listing fields only)."""
+        return self.db.list_candidates_summary(job_id=job_id, limit=limit)
+    
     def find_similar_candidates(
         self,
         job_embedding: list,
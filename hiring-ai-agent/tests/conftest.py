@@ -0,0 +1,5 @@
+"""Shared test setup."""
+import os
+
+# Settings requires an API key; tests never call the real API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -1,11 +1,13 @@
 """Tests for agents."""
+import threading
+import time
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from app.agents.jd_context_agent import JDContextAgent
 from app.agents.resume_analysis_agent import ResumeAnalysisAgent
 from app.agents.ranking_agent import RankingAgent
 from app.models.job_context import JobContext
-from app.models.candidate import Candidate
+from app.models.candidate import Candidate, Experience
 from app.models.score_report import ScoreReport
 
 
@@ -172,3 +174,130 @@ class TestRankingAgent:
         
         assert result is not None
         mock_llm.generate_structured.assert_called_once()
+
+
+class TestRankCandidatesConcurrency:
+    """Tests for the bounded concurrency of batched ranking."""
+    
+    @pytest.fixture
+    def agent(self):
+        agent = RankingAgent(Mock(), Mock(), eval_batch_size=1, max_concurrency=2)
+        agent._build_job_fragment = Mock(return_value="")
+        agent._score_chunks = Mock(side_effect=lambda candidates, *args: [
+            [(candidate, {"overall_score": 50.0})] for candidate in candidates
+        ])
+        agent._build_report = Mock(side_effect=lambda candidate, job, scores, evaluation: Mock(
+            candidate_id=candidate.id, overall_score=scores["overall_score"]
+        ))
+        return agent
+    
+    @staticmethod
+    def _track_evaluations(agent):
+        """Make each chunk evaluation slow and record the peak number in flight."""
+        state = {"active": 0, "peak": 0}
+        lock = threading.Lock()
+        
+        def evaluate(chunk, *args):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return [Mock()]
+        
+        agent._evaluate_chunk = Mock(side_effect=evaluate)
+        return state
+    
+    def test_evaluations_bounded_by_max_concurrency(self, agent):
+        """Test that rank_candidates overlaps at most max_concurrency evaluations."""
+        state = self._track_evaluations(agent)
+        candidates = [Mock(id=f"c{i}") for i in range(6)]
+        
+        reports = agent.rank_candidates(candidates, Mock())
+        
+        assert len(reports) == 6
+        assert agent._evaluate_chunk.call_count == 6
+        assert state["peak"] == 2
+    
+    async def test_serial_inside_running_loop(self, agent):
+        """Test that rank_candidates evaluates serially when a loop is running."""
+        state = self._track_evaluations(agent)
+        candidates = [Mock(id=f"c{i}") for i in range(3)]
+        
+        reports = agent.rank_candidates(candidates, Mock())
+        
+        assert len(reports) == 3
+        assert state["peak"] == 1
+
+
+class TestExtractGithubUrl:
+    """Tests for finding a GitHub profile in resume text."""
+    
+    @pytest.fixture
+    def agent(self):
+        return ResumeAnalysisAgent(Mock())
+    
+    @pytest.mark.parametrize("text", [
+        "GitHub: https://github.com/johndoe",
+        "GitHub: github.com/johndoe",
+        "Portfolio | github.com/johndoe | LinkedIn",
+        "GitHub: @johndoe",
+    ])
+    def test_username_found(self, agent, text):
+        """Test that a labelled URL yields the username rather than the scheme or host."""
+        assert agent.extract_github_url(text) == "https://github.com/johndoe"
+    
+    def test_url_preferred_over_earlier_label(self, agent):
+        """Test that a profile URL anywhere wins over a bare label."""
+        text = "GitHub: jd\nLinks: https://github.com/johndoe"
+        
+        assert agent.extract_github_url(text) == "https://github.com/johndoe"
+    
+    def test_no_reference(self, agent):
+        assert agent.extract_github_url("Python developer, 5 years") is None
+
+
+class TestTemplateSummary:
+    """Tests for summaries rendered without an LLM call."""
+    
+    @pytest.fixture
+    def agent(self):
+        return ResumeAnalysisAgent(Mock())
+    
+    def _candidate(self, years: float, **fields) -> Candidate:
+        return Candidate(
+            name="Ada Lovelace",
+            headline="Senior Engineer at Acme | Python | AWS",
+            skills=["Python", "AWS", "SQL"],
+            experience=[Experience(role="Backend Engineer", company="Acme")],
+            total_experience_years=years,
+            **fields
+        )
+    
+    def test_rendered_summary(self, agent):
+        """Test that the summary uses a seniority word, not the free-form headline."""
+        summary = agent._generate_summary(self._candidate(6))
+        
+        assert summary == (
+            "Ada Lovelace is a senior professional with 6 years of experience, "
+            "most recently as Backend Engineer at Acme. Key skills include Python, AWS, SQL."
+        )
+        agent.llm.generate_text.assert_not_called()
+    
+    @pytest.mark.parametrize("years, seniority", [
+        (1, "junior"), (2, "mid-level"), (4.5, "mid-level"), (5, "senior"), (12, "seasoned")
+    ])
+    def test_seniority_by_experience(self, agent, years, seniority):
+        assert f" is a {seniority} professional " in agent._template_summary(self._candidate(years))
+    
+    def test_one_year_singular(self, agent):
+        assert "with 1 year of experience" in agent._template_summary(self._candidate(1))
+    
+    def test_sparse_data_uses_llm(self, agent):
+        """Test that a candidate without roles falls back to the LLM."""
+        agent.llm.generate_text.return_value = " LLM summary "
+        candidate = self._candidate(3)
+        candidate.experience = []
+        
+        assert agent._generate_summary(candidate) == "LLM summary"
@@ -0,0 +1,26 @@
+"""Tests for application settings."""
+import pytest
+from pydantic import ValidationError
+
+from app.config import Settings
+
+
+class TestSettings:
+    """Tests for Settings."""
+    
+    def test_frozen(self):
+        """Test that settings can't be mutated once loaded."""
+        settings = Settings()
+        
+        with pytest.raises(ValidationError):
+            settings.debug = True
+    
+    def test_hashable(self):
+        """Test that settings hash, so they can key caches."""
+        assert hash(Settings()) == hash(Settings())
+    
+    def test_search_terms_from_env(self, monkeypatch):
+        """Test that search terms parse from a JSON list into a tuple."""
+        monkeypatch.setenv("EMAIL_SUBJECT_SEARCH_TERMS", '["JOB", "APPLY"]')
+        
+        assert Settings().email_subject_search_terms == ("JOB", "APPLY")
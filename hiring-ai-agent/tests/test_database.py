@@ -0,0 +1,287 @@
+"""Tests for the SQLite database store."""
+import gc
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from app.database.store import DatabaseStore
+from app.models.candidate import Candidate
+from app.models.job_context import JobContext, hash_raw_text
+
+
+@pytest.fixture
+def store(tmp_path):
+    db = DatabaseStore(str(tmp_path / "test.db"))
+    yield db
+    db.close()
+
+
+def _run_in_thread(fn):
+    """Run fn in a fresh thread and wait for it to exit."""
+    thread = threading.Thread(target=fn)
+    thread.start()
+    thread.join()
+
+
+class TestReadConnections:
+    """Tests for the per-thread read-only connections."""
+    
+    def test_connection_reused_within_thread(self, store):
+        """Test that a thread gets the same read connection on every read."""
+        with store._read_connection() as first:
+            pass
+        with store._read_connection() as second:
+            pass
+        
+        assert first is second
+    
+    def test_threads_get_separate_connections(self, store):
+        """Test that each thread opens its own read connection."""
+        seen = []
+        
+        def read():
+            with store._read_connection() as conn:
+                seen.append(conn)
+        
+        _run_in_thread(read)
+        with store._read_connection() as main_conn:
+            pass
+        
+        assert seen[0] is not main_conn
+    
+    def test_connections_closed_when_threads_exit(self, store):
+        """Test that short-lived threads don't leave read connections open."""
+        opened = []
+        
+        def read():
+            store.list_jobs()
+            with store._read_connection() as conn:
+                opened.append(conn)
+        
+        fds_before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+        for _ in range(50):
+            _run_in_thread(read)
+        gc.collect()
+        
+        # Only the constructing thread's reader is still live
+        assert len(store._read_conns) == 1
+        for conn in opened:
+            with pytest.raises(Exception):
+                conn.execute("SELECT 1")
+        if fds_before is not None:
+            assert len(os.listdir("/proc/self/fd")) <= fds_before + 2
+    
+    def test_close_closes_live_readers(self, tmp_path):
+        """Test that close() closes the read connections of running threads."""
+        db = DatabaseStore(str(tmp_path / "close.db"))
+        with db._read_connection() as conn:
+            pass
+        
+        db.close()
+        
+        with pytest.raises(Exception):
+            conn.execute("SELECT 1")
+
+
+class TestJobRawText:
+    """Tests for storing the JD text digest next to the text."""
+    
+    def test_digest_loaded_without_raw_text(self, store):
+        """Test that a loaded job carries the digest and length but not the text."""
+        job_id = store.create_job(JobContext(job_title="Engineer", raw_text="Build APIs in Python"))
+        store._job_cache.clear()
+        
+        job = store.get_job(job_id)
+        
+        assert job.raw_text is None
+        assert job.raw_text_hash == hash_raw_text("Build APIs in Python")
+        assert job.raw_text_len == len("Build APIs in Python")
+        assert store.list_jobs()[0].raw_text_hash == job.raw_text_hash
+    
+    def test_existing_jobs_backfilled(self, tmp_path):
+        """Test that a database from before the digest columns gets them filled in."""
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("""
+            CREATE TABLE jobs (
+                id TEXT PRIMARY KEY, job_title TEXT NOT NULL, seniority TEXT,
+                required_skills TEXT, preferred_skills TEXT, experience_required TEXT,
+                experience_min_years REAL, experience_max_years REAL, responsibilities TEXT,
+                domain TEXT, job_summary TEXT, raw_text TEXT, location TEXT, remote_policy TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            "INSERT INTO jobs (id, job_title, raw_text) VALUES ('JOB-1', 'Engineer', 'Old JD')"
+        )
+        conn.commit()
+        conn.close()
+        
+        db = DatabaseStore(path)
+        try:
+            job = db.get_job("JOB-1")
+        finally:
+            db.close()
+        
+        assert job.raw_text_hash == hash_raw_text("Old JD")
+        assert job.raw_text_len == len("Old JD")
+
+
+class TestModelCaches:
+    """Tests for the job/candidate read caches and their invalidation."""
+    
+    def test_cached_job_is_a_copy(self, store):
+        """Test that mutating a returned job leaves the cache untouched."""
+        job_id = store.create_job(JobContext(job_title="Engineer", required_skills=["Python"]))
+        
+        store.get_job(job_id).required_skills.append("Go")
+        
+        assert store.get_job(job_id).required_skills == ["Python"]
+    
+    def test_title_lookup_uses_newest_job(self, store):
+        """Test that the title index follows the newest job with that title."""
+        store.create_job(JobContext(job_title="Engineer"))
+        newest = store.create_job(JobContext(job_title="Engineer"))
+        
+        assert store.get_job_by_title("ENGINEER").id == newest
+    
+    def test_delete_job_invalidates(self, store):
+        """Test that a deleted job is gone from the cache and the title index."""
+        job_id = store.create_job(JobContext(job_title="Engineer"))
+        store.get_job(job_id)
+        
+        store.delete_job(job_id)
+        
+        assert store.get_job(job_id) is None
+        assert store.get_job_by_title("Engineer") is None
+    
+    def test_update_candidate_invalidates(self, store):
+        """Test that an updated candidate is re-read rather than served stale."""
+        candidate_id = store.create_candidate(Candidate(name="Ada"))
+        candidate = store.get_candidate(candidate_id)
+        
+        candidate.name = "Ada Lovelace"
+        store.update_candidate(candidate)
+        
+        assert store.get_candidate(candidate_id).name == "Ada Lovelace"
+    
+    def test_delete_candidates_invalidates(self, store):
+        """Test that deleted candidates are not served from the cache."""
+        job_id = store.create_job(JobContext(job_title="Engineer"))
+        first = store.create_candidate(Candidate(name="Ada", job_id=job_id))
+        second = store.create_candidate(Candidate(name="Grace", job_id=job_id))
+        other = store.create_candidate(Candidate(name="Alan"))
+        for candidate_id in (first, second, other):
+            store.get_candidate(candidate_id)
+        
+        store.delete_candidate(other)
+        store.delete_candidates_by_job(job_id)
+        
+        assert store.get_candidate(first) is None
+        assert store.get_candidate(second) is None
+        assert store.get_candidate(other) is None
+    
+    @staticmethod
+    def _write_after_read(store, monkeypatch, convert: str, write):
+        """Run a write between the next row read and the cache fill, as another thread could."""
+        original = getattr(store, convert)
+        pending = [write]
+        
+        def convert_then_write(row):
+            model = original(row)
+            if pending:
+                pending.pop()()
+            return model
+        
+        monkeypatch.setattr(store, convert, convert_then_write)
+    
+    def test_update_during_read_not_cached(self, store, monkeypatch):
+        """Test that a copy read before a concurrent update is not cached over it."""
+        candidate_id = store.create_candidate(Candidate(name="Ada"))
+        store._candidate_cache.clear()
+        self._write_after_read(store, monkeypatch, "_row_to_candidate", lambda: store.update_candidate(
+            Candidate(id=candidate_id, name="Ada Lovelace")
+        ))
+        
+        assert store.get_candidate(candidate_id).name == "Ada"
+        assert store.get_candidate(candidate_id).name == "Ada Lovelace"
+    
+    def test_delete_during_read_not_cached(self, store, monkeypatch):
+        """Test that a job deleted while being read isn't cached or indexed."""
+        job_id = store.create_job(JobContext(job_title="Engineer"))
+        store._forget_job(job_id)
+        self._write_after_read(store, monkeypatch, "_row_to_job", lambda: store.delete_job(job_id))
+        
+        assert store.get_job_by_title("Engineer").id == job_id
+        assert store.get_job(job_id) is None
+        assert store._job_title_index == {}
+    
+    def test_cache_bounded(self, store, monkeypatch):
+        """Test that the least recently used entry is evicted."""
+        monkeypatch.setattr("app.database.store.MODEL_CACHE_SIZE", 2)
+        ids = [store.create_candidate(Candidate(name=f"C{i}")) for i in range(3)]
+        
+        assert list(store._candidate_cache) == ids[1:]
+
+
+class TestSeenMessageIds:
+    """Tests for the in-memory set of logged email Message-IDs."""
+    
+    def test_logged_email_is_processed(self, store):
+        """Test that a logged Message-ID is reported as processed."""
+        store.log_email("<m1@example.com>", "JOB - X - APPLICATION", "a@example.com", "processed")
+        
+        assert store.is_email_processed("<m1@example.com>")
+        assert not store.is_email_processed("<m2@example.com>")
+    
+    def test_loaded_on_startup(self, tmp_path):
+        """Test that a new store knows the Message-IDs logged before it started."""
+        path = str(tmp_path / "seen.db")
+        first = DatabaseStore(path)
+        first.log_email("<m1@example.com>", "s", "a@example.com", "processed")
+        first.close()
+        
+        second = DatabaseStore(path)
+        try:
+            assert "<m1@example.com>" in second._seen_message_ids
+        finally:
+            second.close()
+    
+    def test_prune_forgets_ids(self, store):
+        """Test that pruned log entries are dropped from the set too."""
+        store.log_email("<old@example.com>", "s", "a@example.com", "processed")
+        store.log_email("<new@example.com>", "s", "a@example.com", "processed")
+        with store._get_connection() as conn:
+            conn.execute(
+                "UPDATE email_log SET processed_at = datetime('now', '-40 days') "
+                "WHERE message_id = '<old@example.com>'"
+            )
+        
+        assert store.prune_email_log(30) == 1
+        assert not store.is_email_processed("<old@example.com>")
+        assert store.is_email_processed("<new@example.com>")
+
+
+class TestScoreCacheTable:
+    """Tests for the persisted score report cache."""
+    
+    def test_put_and_get_many(self, store):
+        """Test batched writes and reads, with misses left out."""
+        store.put_cached_score_reports([("k1", '{"a": 1}'), ("k2", '{"b": 2}')])
+        
+        assert store.get_cached_score_reports(["k1", "k2", "k3", "k1"], 24) == {
+            "k1": '{"a": 1}', "k2": '{"b": 2}'
+        }
+        assert store.get_cached_score_report("k2", 24) == '{"b": 2}'
+    
+    def test_expired_entries_ignored(self, store):
+        """Test that entries older than the TTL are not returned."""
+        store.put_cached_score_report("k1", '{"a": 1}')
+        with store._get_connection() as conn:
+            conn.execute("UPDATE score_cache SET created_at = datetime('now', '-3 hours')")
+        
+        assert store.get_cached_score_report("k1", 2) is None
+        assert store.get_cached_score_reports(["k1"], 4) == {"k1": '{"a": 1}'}
@@ -0,0 +1,241 @@
+"""Tests for the email ingest agent."""
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app.agents.email_ingest_agent import EmailIngestAgent, ProcessedEmail, _parse_fetch_response
+from app.database.store import DatabaseStore
+
+
+_TEXT_PART = b'("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 12 1 NIL NIL NIL NIL)'
+
+
+def _pdf_part(disposition: bytes = b'("ATTACHMENT" ("FILENAME" "resume.pdf"))') -> bytes:
+    return (
+        b'("APPLICATION" "PDF" ("NAME" "resume.pdf") NIL NIL "BASE64" 1000 NIL '
+        + disposition + b' NIL NIL)'
+    )
+
+
+def _structure(body: bytes) -> list:
+    """Parse a BODYSTRUCTURE the way it arrives from a FETCH."""
+    [(_, items)] = _parse_fetch_response([b'1 (UID 7 BODYSTRUCTURE ' + body + b')'])
+    return items['BODYSTRUCTURE']
+
+
+class _SocketIMAP:
+    """The parts of an imaplib session that the IDLE wait uses, over a plain socket."""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.file = sock.makefile('rb')
+    
+    def _new_tag(self) -> bytes:
+        return b'A001'
+    
+    def send(self, data: bytes):
+        self.sock.sendall(data)
+    
+    def readline(self) -> bytes:
+        return self.file.readline()
+
+
+@pytest.fixture
+def agent():
+    return EmailIngestAgent("imap.example.com", "jobs@example.com", "secret")
+
+
+@pytest.fixture
+def db(tmp_path):
+    store = DatabaseStore(str(tmp_path / "test.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def imap_pair():
+    client, server = socket.socketpair()
+    yield _SocketIMAP(client), server
+    client.close()
+    server.close()
+
+
+def _answer_done(server: socket.socket):
+    """Reply to the client's DONE with the tagged completion of IDLE."""
+    def serve():
+        data = b''
+        while b'DONE' not in data:
+            data += server.recv(1024)
+        server.sendall(b'A001 OK IDLE terminated\r\n')
+    
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestIdleWait:
+    """Tests for waiting on IMAP IDLE responses."""
+    
+    def test_buffered_exists_seen_immediately(self, agent, imap_pair):
+        """Test that an EXISTS read along with the continuation isn't left waiting for select."""
+        conn, server = imap_pair
+        # One segment, so the continuation read buffers the EXISTS line too
+        server.sendall(b'+ idling\r\n* 3 EXISTS\r\nA001 OK IDLE terminated\r\n')
+        
+        start = time.monotonic()
+        has_new = agent._idle_wait(conn, timeout=5)
+        
+        assert has_new is True
+        assert time.monotonic() - start < 1
+    
+    def test_returns_false_after_timeout(self, agent, imap_pair):
+        """Test that IDLE ends quietly when the server announces nothing."""
+        conn, server = imap_pair
+        server.sendall(b'+ idling\r\n')
+        responder = _answer_done(server)
+        
+        has_new = agent._idle_wait(conn, timeout=0.3)
+        responder.join(timeout=1)
+        
+        assert has_new is False
+    
+    def test_stop_idle_ends_wait(self, agent, imap_pair):
+        """Test that stop_idle() interrupts a wait."""
+        conn, server = imap_pair
+        server.sendall(b'+ idling\r\n')
+        responder = _answer_done(server)
+        threading.Timer(0.2, agent.stop_idle).start()
+        
+        start = time.monotonic()
+        has_new = agent._idle_wait(conn, timeout=30)
+        responder.join(timeout=1)
+        
+        assert has_new is False
+        assert time.monotonic() - start < 5
+
+
+class TestProcessedTracking:
+    """Tests for remembering Message-IDs already delivered to a callback."""
+    
+    def _processed(self, message_id: str) -> ProcessedEmail:
+        return ProcessedEmail(
+            message_id=message_id,
+            subject="JOB - Engineer - APPLICATION",
+            sender="a@example.com",
+            job_title="Engineer",
+            attachments=[],
+            received_at=datetime.now(timezone.utc)
+        )
+    
+    def test_marked_email_is_processed(self, db):
+        """Test that a delivered email is skipped afterwards, through the store."""
+        agent = EmailIngestAgent("imap.example.com", "jobs@example.com", "secret", database=db)
+        
+        agent._mark_processed(self._processed("<m1@example.com>"))
+        
+        assert agent._is_processed("<m1@example.com>")
+        assert not agent._is_processed("<m2@example.com>")
+        assert "<m1@example.com>" in db._seen_message_ids
+    
+    def test_processed_shared_across_agents(self, db):
+        """Test that another agent on the same store sees delivered emails."""
+        first = EmailIngestAgent("imap.example.com", "jobs@example.com", "secret", database=db)
+        second = EmailIngestAgent("imap.example.com", "jobs@example.com", "secret", database=db)
+        
+        first._mark_processed(self._processed("<m1@example.com>"))
+        
+        assert second._is_processed("<m1@example.com>")
+    
+    def test_missing_message_id_never_processed(self, db):
+        """Test that emails without a Message-ID are not deduplicated."""
+        agent = EmailIngestAgent("imap.example.com", "jobs@example.com", "secret", database=db)
+        
+        assert not agent._is_processed(None)
+
+
+class TestParseFetchResponse:
+    """Tests for the IMAP FETCH response tokenizer/parser."""
+    
+    def test_bodystructure_and_header_literal(self):
+        """Test that items, nested lists and a spliced-in literal are parsed."""
+        data = [
+            (
+                b'1 (UID 42 BODYSTRUCTURE (' + _TEXT_PART + _pdf_part()
+                + b' "MIXED" ("BOUNDARY" "xyz") NIL NIL NIL)'
+                b' BODY[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)] {33}',
+                b'Subject: JOB - X - APPLICATION\r\n\r\n'
+            ),
+            b')'
+        ]
+        
+        [(seq, items)] = _parse_fetch_response(data)
+        
+        assert seq == '1'
+        assert items['UID'] == '42'
+        assert items['BODY[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)]'] == (
+            b'Subject: JOB - X - APPLICATION\r\n\r\n'
+        )
+        text, pdf = items['BODYSTRUCTURE'][:2]
+        assert text[:3] == [b'TEXT', b'PLAIN', [b'CHARSET', b'utf-8']]
+        assert pdf[8] == [b'ATTACHMENT', [b'FILENAME', b'resume.pdf']]
+        assert items['BODYSTRUCTURE'][2] == b'MIXED'
+    
+    def test_nil_and_escaped_strings(self):
+        """Test that NIL becomes None and quoted-string escapes are undone."""
+        [(_, items)] = _parse_fetch_response([b'3 (X-A NIL X-B "say \\"hi\\" \\\\ ok")'])
+        
+        assert items['X-A'] is None
+        assert items['X-B'] == b'say "hi" \\ ok'
+    
+    def test_several_messages(self):
+        """Test that each message in one response is returned in order."""
+        data = [b'1 (UID 10 FLAGS (\\Seen))', b'2 (UID 11 FLAGS ())']
+        
+        results = _parse_fetch_response(data)
+        
+        assert [(seq, items['UID']) for seq, items in results] == [('1', '10'), ('2', '11')]
+        assert results[0][1]['FLAGS'] == ['\\Seen']
+
+
+class TestFindPdfParts:
+    """Tests for locating PDF attachments in a BODYSTRUCTURE."""
+    
+    def test_attachment_in_multipart(self, agent):
+        """Test that the PDF is found with its part number and encoding."""
+        structure = _structure(b'(' + _TEXT_PART + _pdf_part() + b' "MIXED")')
+        
+        assert agent._find_pdf_parts(structure) == [
+            ('2', 'resume.pdf', 'application/pdf', 'base64')
+        ]
+    
+    def test_nested_multipart_numbering(self, agent):
+        """Test that parts of a nested multipart get dotted part numbers."""
+        inner = b'(' + _TEXT_PART + _pdf_part() + b' "MIXED")'
+        structure = _structure(b'(' + _TEXT_PART + inner + b' "MIXED")')
+        
+        assert [p[0] for p in agent._find_pdf_parts(structure)] == ['2.2']
+    
+    def test_single_part_pdf(self, agent):
+        """Test that a message that is only a PDF is part 1."""
+        structure = _structure(_pdf_part())
+        
+        assert agent._find_pdf_parts(structure)[0][0] == '1'
+    
+    def test_rfc2231_filename(self, agent):
+        """Test that an RFC 2231 encoded filename* is decoded."""
+        structure = _structure(_pdf_part(
+            b'("ATTACHMENT" ("FILENAME*" "utf-8\'\'r%C3%A9sum%C3%A9.pdf"))'
+        ))
+        
+        assert agent._find_pdf_parts(structure)[0][1] == 'r\u00e9sum\u00e9.pdf'
+    
+    def test_non_pdf_attachment_skipped(self, agent):
+        """Test that attachments without a .pdf name are ignored."""
+        structure = _structure(b'(' + _TEXT_PART + _pdf_part(
+            b'("ATTACHMENT" ("FILENAME" "photo.png"))'
+        ) + b' "MIXED")')
+        
+        assert agent._find_pdf_parts(structure) == []
@@ -0,0 +1,154 @@
+"""Tests for the ranking API routes."""
+import asyncio
+import time
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_ranking
+from app.api.routes_ranking import _ranking_etag
+from app.dependencies import get_ranking_workflow
+from app.models.score_report import RankingReport, ScoreReport
+
+
+def _reports():
+    return [
+        ScoreReport(id="S1", candidate_id="c1", job_id="j1", overall_score=90),
+        ScoreReport(id="S2", candidate_id="c2", job_id="j1", overall_score=70),
+    ]
+
+
+@pytest.fixture
+def workflow():
+    workflow = Mock()
+    workflow.get_stored_rankings.return_value = _reports()
+    workflow.rank_all_candidates.return_value = RankingReport(
+        job_id="j1", job_title="Engineer", total_candidates=2, rankings=_reports()
+    )
+    return workflow
+
+
+@pytest.fixture
+def app(workflow):
+    app = FastAPI()
+    app.include_router(routes_ranking.router)
+    app.dependency_overrides[get_ranking_workflow] = lambda: workflow
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def slow_ranking(workflow):
+    """Make a ranking run take long enough for requests to overlap."""
+    def rank(*args, **kwargs):
+        time.sleep(0.2)
+        return RankingReport(job_id="j1", job_title="Engineer", total_candidates=2, rankings=_reports())
+    
+    workflow.rank_all_candidates.side_effect = rank
+    return workflow
+
+
+class TestRankingEtag:
+    """Tests for ranking ETags and conditional requests."""
+    
+    def test_etag_ignores_report_order(self):
+        """Test that tied reports ordered differently give the same ETag."""
+        reports = _reports()
+        
+        assert _ranking_etag("j1", reports) == _ranking_etag("j1", reports[::-1])
+    
+    def test_etag_changes_with_scores(self):
+        """Test that a regenerated report changes the ETag."""
+        reports = _reports()
+        changed = _reports()
+        changed[0].overall_score = 50
+        
+        assert _ranking_etag("j1", reports) != _ranking_etag("j1", changed)
+    
+    def test_not_modified_before_pipeline(self, client, workflow):
+        """Test that a matching If-None-Match is answered from the stored rankings."""
+        etag = _ranking_etag("j1", _reports())
+        
+        response = client.get("/ranking/j1", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        workflow.rank_all_candidates.assert_not_called()
+    
+    def test_stale_etag_runs_pipeline(self, client, workflow):
+        """Test that a non-matching If-None-Match gets the full ranking."""
+        response = client.get("/ranking/j1", headers={"If-None-Match": '"stale"'})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] == _ranking_etag("j1", _reports())
+        assert [r["id"] for r in response.json()["rankings"]] == ["S1", "S2"]
+        workflow.rank_all_candidates.assert_called_once()
+    
+    def test_unscored_applicants_run_pipeline(self, client, workflow):
+        """Test that the pipeline runs while an applicant still needs scoring."""
+        workflow.get_stored_rankings.return_value = None
+        etag = _ranking_etag("j1", _reports())
+        
+        response = client.get("/ranking/j1", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        workflow.rank_all_candidates.assert_called_once()
+    
+    def test_force_refresh_skips_stored_check(self, client, workflow):
+        """Test that force_refresh always re-ranks."""
+        etag = _ranking_etag("j1", _reports())
+        
+        client.get("/ranking/j1?force_refresh=true", headers={"If-None-Match": etag})
+        
+        workflow.get_stored_rankings.assert_not_called()
+        workflow.rank_all_candidates.assert_called_once()
+
+
+class TestRefreshCoalescing:
+    """Tests for sharing one full re-ranking between overlapping requests."""
+    
+    async def test_concurrent_refreshes_share_one_run(self, app, slow_ranking):
+        """Test that overlapping force_refresh requests wait on a single run."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = await asyncio.gather(*(
+                client.get("/ranking/j1?force_refresh=true") for _ in range(3)
+            ))
+        await asyncio.sleep(0)
+        
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        slow_ranking.rank_all_candidates.assert_called_once_with("j1", None, True)
+        assert routes_ranking._refresh_tasks == {}
+    
+    async def test_top_k_refresh_not_shared(self, app, slow_ranking):
+        """Test that a top_k refresh runs on its own rather than joining a full one."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await asyncio.gather(
+                client.get("/ranking/j1?force_refresh=true"),
+                client.get("/ranking/j1?force_refresh=true&top_k=1")
+            )
+        
+        assert slow_ranking.rank_all_candidates.call_count == 2
+    
+    async def test_background_refresh_not_restarted(self, app, slow_ranking):
+        """Test that POST /refresh doesn't start a second run while one is going."""
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/ranking/j1/refresh")
+            second = await client.post("/ranking/j1/refresh")
+            await routes_ranking._refresh_tasks["j1"]
+        await asyncio.sleep(0)
+        
+        assert first.json()["status"] == "started"
+        assert second.json()["status"] == "already_running"
+        slow_ranking.rank_all_candidates.assert_called_once()
+        assert routes_ranking._refresh_tasks == {}
@@ -0,0 +1,58 @@
+"""Tests for the resume API routes."""
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes_resume
+from app.dependencies import get_resume_ingestion_workflow
+from app.models.candidate import Candidate
+
+
+@pytest.fixture
+def workflow(tmp_path):
+    resume = tmp_path / "resume.pdf"
+    resume.write_bytes(b"%PDF-1.4 test")
+    workflow = Mock()
+    workflow.get_candidate.return_value = Candidate(
+        id="c1", name="Ada Lovelace", resume_file_path=str(resume)
+    )
+    return workflow
+
+
+@pytest.fixture
+def client(workflow):
+    app = FastAPI()
+    app.include_router(routes_resume.router)
+    app.dependency_overrides[get_resume_ingestion_workflow] = lambda: workflow
+    with TestClient(app) as client:
+        yield client
+
+
+class TestDownloadResume:
+    """Tests for conditional resume downloads."""
+    
+    def test_download_sends_etag(self, client):
+        response = client.get("/resume/c1/download")
+        
+        assert response.status_code == 200
+        assert response.content == b"%PDF-1.4 test"
+        assert response.headers["ETag"]
+    
+    @pytest.mark.parametrize("header", ["{etag}", 'W/{etag}', '"other", {etag}', "*"])
+    def test_not_modified(self, client, header):
+        """Test that a matching If-None-Match (list, weak tag or *) gets a 304."""
+        etag = client.get("/resume/c1/download").headers["ETag"]
+        
+        response = client.get(
+            "/resume/c1/download", headers={"If-None-Match": header.format(etag=etag)}
+        )
+        
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+    
+    def test_stale_etag_downloads(self, client):
+        response = client.get("/resume/c1/download", headers={"If-None-Match": '"stale"'})
+        
+        assert response.status_code == 200
@@ -4,6 +4,14 @@ from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import tempfile
 import os
 
+from app.database.store import DatabaseStore
+from app.models.candidate import Candidate
+from app.models.job_context import JobContext
+from app.models.score_report import ScoreReport
+from app.services.chroma_db import ChromaStore
+from app.services.evaluation_cache import EvaluationCache, hash_key
+from app.services.score_report_cache import ScoreReportCache
+
 
 class TestGeminiLLM:
     """Tests for GeminiLLM service."""
@@ -64,6 +72,68 @@ class TestChromaStore:
     def test_query_similar_candidates(self, temp_dir):
         """Test querying similar candidates."""
         pass
+    
+    @staticmethod
+    def _stored(store: ChromaStore, name: str) -> int:
+        """Embeddings actually written to a collection (bypassing the buffer)."""
+        return store.get_or_create_collection(name).count()
+    
+    def test_writes_buffered_until_batch_full(self, temp_dir):
+        """Test that buffered embeddings are written once the batch fills."""
+        store = ChromaStore(temp_dir, write_batch_size=3, max_write_delay_seconds=60)
+        
+        store.add_embedding("jobs", "j1", [1.0, 0.0])
+        store.add_embedding("jobs", "j2", [0.0, 1.0], metadata={"title": "Engineer"})
+        assert self._stored(store, "jobs") == 0
+        
+        store.add_embedding("jobs", "j3", [1.0, 1.0], document="text")
+        assert self._stored(store, "jobs") == 3
+        assert store.get_by_id("jobs", "j2")["metadata"] == {"title": "Engineer"}
+    
+    def test_reads_flush_buffer_first(self, temp_dir):
+        """Test that a read sees embeddings still waiting in the buffer."""
+        store = ChromaStore(temp_dir, write_batch_size=10, max_write_delay_seconds=60)
+        store.add_embedding("jobs", "j1", [1.0, 0.0])
+        
+        assert store.get_by_id("jobs", "j1", include=["embeddings"]) is not None
+        assert self._stored(store, "jobs") == 1
+    
+    def test_flush_due_waits_for_delay(self, temp_dir):
+        """Test that flush_due only writes batches older than the delay."""
+        store = ChromaStore(temp_dir, write_batch_size=10, max_write_delay_seconds=60)
+        store.add_embedding("jobs", "j1", [1.0, 0.0])
+        
+        assert store.flush_due() == 0
+        store.max_write_delay_seconds = 0
+        assert store.flush_due() == 1
+        assert self._stored(store, "jobs") == 1
+    
+    def test_failed_flush_keeps_buffer(self, temp_dir):
+        """Test that a failed write leaves the embeddings buffered for a retry."""
+        store = ChromaStore(temp_dir, write_batch_size=10, max_write_delay_seconds=60)
+        store.add_embedding("jobs", "j1", [1.0, 0.0])
+        
+        with patch.object(store, "add_embeddings", side_effect=RuntimeError("down")):
+            with pytest.raises(RuntimeError):
+                store.flush("jobs")
+        
+        assert store.flush_all() == 1
+        assert self._stored(store, "jobs") == 1
+    
+    def test_get_by_ids_chunks_requests(self, temp_dir, monkeypatch):
+        """Test that get_by_ids fetches GET_BATCH_SIZE IDs per request."""
+        monkeypatch.setattr("app.services.chroma_db.GET_BATCH_SIZE", 2)
+        store = ChromaStore(temp_dir)
+        ids = [f"c{i}" for i in range(5)]
+        store.add_embeddings("candidates", ids, [[float(i), 1.0] for i in range(5)])
+        collection = store.get_or_create_collection("candidates")
+        store._collections["candidates"] = Mock(wraps=collection)
+        
+        records = store.get_by_ids("candidates", ids + ["missing"], include=["embeddings"])
+        
+        assert store._collections["candidates"].get.call_count == 3
+        assert set(records) == set(ids)
+        assert list(records["c3"]["embedding"]) == [3.0, 1.0]
 
 
 class TestPDFParser:
@@ -120,3 +190,144 @@ class TestScoringUtils:
     def test_weights_sum_to_one(self):
         """Test that default weights sum to 1."""
         pass
+
+
+class TestEvaluationCache:
+    """Tests for EvaluationCache."""
+    
+    @pytest.fixture
+    def cache(self):
+        return EvaluationCache(max_entries=4, similarity_threshold=0.95, max_score_delta=2.0)
+    
+    def test_hash_key_ignores_formatting(self):
+        """Test that whitespace and case differences give the same key."""
+        assert hash_key("Senior  Python\nDev", "m") == hash_key("senior python dev", "m")
+        assert hash_key("a", "b") != hash_key("ab", "")
+    
+    def test_exact_hit(self, cache):
+        """Test that a stored key is returned regardless of embeddings."""
+        cache.put("k1", 60.0, "eval-1")
+        
+        assert cache.get("k1", 10.0) == "eval-1"
+        assert cache.get("k2", 60.0) is None
+    
+    def test_semantic_hit_same_candidate(self, cache):
+        """Test that near-identical embeddings reuse the same candidate's evaluation."""
+        cache.put("k1", 60.0, "eval-1", [1.0, 0.0, 0.0], [0.0, 1.0], owner="c1")
+        
+        assert cache.get("k2", 61.0, [1.0, 0.01, 0.0], [0.0, 1.0], owner="c1") == "eval-1"
+    
+    def test_semantic_never_crosses_candidates(self, cache):
+        """Test that another candidate's evaluation is never reused."""
+        cache.put("k1", 60.0, "eval-1", [1.0, 0.0, 0.0], [0.0, 1.0], owner="c1")
+        
+        assert cache.get("k2", 60.0, [1.0, 0.0, 0.0], [0.0, 1.0], owner="c2") is None
+        assert cache.get("k2", 60.0, [1.0, 0.0, 0.0], [0.0, 1.0]) is None
+    
+    def test_semantic_miss_on_score_or_similarity(self, cache):
+        """Test that a distant score or a dissimilar embedding misses."""
+        cache.put("k1", 60.0, "eval-1", [1.0, 0.0, 0.0], [0.0, 1.0], owner="c1")
+        
+        assert cache.get("k2", 65.0, [1.0, 0.0, 0.0], [0.0, 1.0], owner="c1") is None
+        assert cache.get("k2", 60.0, [0.0, 1.0, 0.0], [0.0, 1.0], owner="c1") is None
+        assert cache.get("k2", 60.0, [1.0, 0.0, 0.0], [1.0, 0.0], owner="c1") is None
+    
+    def test_oldest_evicted_and_slot_freed(self, cache):
+        """Test LRU eviction, including the evicted entry's semantic slot."""
+        cache.put("k0", 60.0, "eval-0", [1.0, 0.0, 0.0], [0.0, 1.0], owner="c0")
+        for i in range(1, 5):
+            cache.put(f"k{i}", 60.0, f"eval-{i}", [0.0, 0.0, 1.0], [1.0, 0.0], owner=f"c{i}")
+        
+        assert cache.get("k0", 60.0) is None
+        assert cache.get("k9", 60.0, [1.0, 0.0, 0.0], [0.0, 1.0], owner="c0") is None
+        assert cache.get("k1", 60.0) == "eval-1"
+    
+    def test_clear(self, cache):
+        """Test that clear drops both tiers."""
+        cache.put("k1", 60.0, "eval-1", [1.0, 0.0], [0.0, 1.0], owner="c1")
+        cache.clear()
+        
+        assert cache.get("k1", 60.0) is None
+        assert cache.get("k2", 60.0, [1.0, 0.0], [0.0, 1.0], owner="c1") is None
+
+
+class TestScoreReportCache:
+    """Tests for ScoreReportCache."""
+    
+    @pytest.fixture
+    def db(self, tmp_path):
+        store = DatabaseStore(str(tmp_path / "test.db"))
+        yield store
+        store.close()
+    
+    @pytest.fixture
+    def cache(self, db):
+        return ScoreReportCache(db, model_version="m1", weights={"skills": 0.5, "experience": 0.5})
+    
+    @pytest.fixture
+    def job(self):
+        return JobContext(id="JOB-1", job_title="Engineer", required_skills=["Python"])
+    
+    @staticmethod
+    def _candidate(candidate_id: str, name: str = "Ada", **fields) -> Candidate:
+        fields.setdefault("skills", ["Python"])
+        return Candidate(id=candidate_id, name=name, **fields)
+    
+    @staticmethod
+    def _report(candidate_id: str, score: float) -> ScoreReport:
+        return ScoreReport(id="S-OLD", candidate_id=candidate_id, job_id="JOB-1", overall_score=score)
+    
+    def test_put_then_lookup(self, cache, job):
+        """Test that batched puts are found by a batched lookup, rebound to the caller."""
+        first = self._candidate("c1", "Ada")
+        second = self._candidate("c2", "Grace")
+        third = self._candidate("c3", "Alan")
+        cache.put(job, [(first, self._report("c1", 80)), (second, self._report("c2", 60))])
+        
+        found = cache.lookup([first, second, third], job)
+        
+        assert set(found) == {"c1", "c2"}
+        assert found["c1"].overall_score == 80
+        assert found["c1"].id is None
+        assert found["c2"].candidate_name == "Grace"
+    
+    def test_same_content_shares_entry(self, cache, job):
+        """Test that a re-uploaded resume with the same content hits the cache."""
+        cache.put(job, [(self._candidate("c1"), self._report("c1", 80))])
+        
+        found = cache.lookup([self._candidate("c9")], job)
+        
+        assert found["c9"].candidate_id == "c9"
+        assert found["c9"].overall_score == 80
+    
+    def test_key_changes_invalidate(self, cache, db, job):
+        """Test that changed candidate, job, model or weights miss the cache."""
+        candidate = self._candidate("c1")
+        cache.put(job, [(candidate, self._report("c1", 80))])
+        
+        changed_job = job.model_copy(update={"required_skills": ["Python", "Go"]})
+        other_model = ScoreReportCache(db, model_version="m2", weights={"skills": 0.5, "experience": 0.5})
+        other_weights = ScoreReportCache(db, model_version="m1", weights={"skills": 1.0})
+        
+        assert cache.lookup([self._candidate("c1", skills=["Java"])], job) == {}
+        assert cache.lookup([candidate], changed_job) == {}
+        assert other_model.lookup([candidate], job) == {}
+        assert other_weights.lookup([candidate], job) == {}
+    
+    def test_key_ignores_formatting_and_unscored_fields(self, cache, job):
+        """Test that fields outside the key don't cause a miss."""
+        cache.put(job, [(self._candidate("c1"), self._report("c1", 80))])
+        
+        assert cache.lookup([self._candidate("c1", phone="555-0100")], job)
+    
+    def test_get_or_compute(self, cache, job):
+        """Test that a hit skips compute and force_refresh recomputes."""
+        candidate = self._candidate("c1")
+        compute = Mock(return_value=self._report("c1", 70))
+        
+        cache.get_or_compute(candidate, job, compute)
+        cached = cache.get_or_compute(candidate, job, compute)
+        cache.get_or_compute(candidate, job, compute, force_refresh=True)
+        
+        assert cached.overall_score == 70
+        assert compute.call_count == 2
@@ -0,0 +1,25 @@
+"""Tests for the shared utilities."""
+from app.utils.http_cache import etag_matches
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match parsing."""
+    
+    def test_single_tag(self):
+        assert etag_matches('"abc"', '"abc"')
+    
+    def test_tag_in_list(self):
+        assert etag_matches('"x", "abc" ,"y"', '"abc"')
+    
+    def test_weak_tag(self):
+        assert etag_matches('W/"abc"', '"abc"')
+    
+    def test_wildcard(self):
+        assert etag_matches(' * ', '"abc"')
+    
+    def test_substring_does_not_match(self):
+        assert not etag_matches('"abcd"', '"abc"')
+        assert not etag_matches('"xabc"', '"abc"')
+    
+    def test_empty_header(self):
+        assert not etag_matches('', '"abc"')
@@ -2,6 +2,13 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 
+from app.database.store import DatabaseStore
+from app.models.candidate import Candidate
+from app.models.job_context import JobContext
+from app.models.score_report import ScoreReport
+from app.services.score_report_cache import ScoreReportCache
+from app.workflows.assessment_workflow import AssessmentWorkflow
+
 
 class TestJobContextWorkflow:
     """Tests for JobContextWorkflow."""
@@ -76,6 +83,95 @@ class TestAssessmentWorkflow:
         pass
 
 
+
+class TestBatchAssess:
+    """Tests for AssessmentWorkflow.batch_assess."""
+    
+    @pytest.fixture
+    def db(self, tmp_path):
+        store = DatabaseStore(str(tmp_path / "test.db"))
+        yield store
+        store.close()
+    
+    @pytest.fixture
+    def job_id(self, db):
+        return db.create_job(JobContext(job_title="Python Developer", required_skills=["Python"]))
+    
+    @pytest.fixture
+    def candidate_ids(self, db):
+        return [db.create_candidate(Candidate(name=f"Candidate {i}", skills=["Python"])) for i in range(3)]
+    
+    @pytest.fixture
+    def ranking_agent(self):
+        def rank(candidates, job, candidate_embeddings=None, job_embedding=None, top_k=None):
+            return [
+                ScoreReport(candidate_id=c.id, job_id=job.id, candidate_name=c.name, overall_score=50 + i)
+                for i, c in enumerate(candidates)
+            ]
+        
+        agent = Mock()
+        agent.rank_candidates = Mock(side_effect=rank)
+        agent.generate_candidate_rank = Mock(
+            side_effect=lambda candidate, job, **kwargs: ScoreReport(
+                candidate_id=candidate.id, job_id=job.id, overall_score=40
+            )
+        )
+        return agent
+    
+    @pytest.fixture
+    def workflow(self, ranking_agent, db):
+        chroma = Mock()
+        chroma.get_by_ids = Mock(return_value={})
+        chroma.get_by_id = Mock(return_value=None)
+        return AssessmentWorkflow(ranking_agent, chroma, db)
+    
+    def test_pending_candidates_ranked_in_one_batch(self, workflow, ranking_agent, candidate_ids, job_id):
+        """Test that candidates without reports are scored with one rank_candidates call."""
+        reports = workflow.batch_assess(candidate_ids, job_id)
+        
+        assert ranking_agent.rank_candidates.call_count == 1
+        assert ranking_agent.generate_candidate_rank.call_count == 0
+        assert sorted(r.candidate_id for r in reports) == sorted(candidate_ids)
+        assert all(r.id for r in reports)
+    
+    def test_stored_reports_reused(self, workflow, ranking_agent, candidate_ids, job_id):
+        """Test that a second run returns the stored reports without scoring."""
+        workflow.batch_assess(candidate_ids, job_id)
+        reports = workflow.batch_assess(candidate_ids, job_id)
+        
+        assert ranking_agent.rank_candidates.call_count == 1
+        assert len(reports) == len(candidate_ids)
+    
+    def test_falls_back_to_single_assessments(self, workflow, ranking_agent, candidate_ids, job_id):
+        """Test that a failed batch is retried one candidate at a time."""
+        ranking_agent.rank_candidates.side_effect = RuntimeError("boom")
+        
+        reports = workflow.batch_assess(candidate_ids, job_id)
+        
+        assert ranking_agent.generate_candidate_rank.call_count == len(candidate_ids)
+        assert len(reports) == len(candidate_ids)
+    
+    def test_force_refresh_bypasses_score_cache(self, ranking_agent, db, candidate_ids, job_id):
+        """Test that force_refresh regenerates cached reports and replaces the cache entries."""
+        score_cache = ScoreReportCache(db, "test-model", {"skills": 1.0})
+        chroma = Mock()
+        chroma.get_by_ids = Mock(return_value={})
+        chroma.get_by_id = Mock(return_value=None)
+        workflow = AssessmentWorkflow(ranking_agent, chroma, db, score_cache=score_cache)
+        workflow.batch_assess(candidate_ids, job_id)
+        
+        rank = ranking_agent.rank_candidates.side_effect
+        ranking_agent.rank_candidates.side_effect = lambda candidates, job, *args, **kwargs: [
+            report.model_copy(update={"overall_score": 90}) for report in rank(candidates, job)
+        ]
+        reports = workflow.batch_assess(candidate_ids, job_id, force_refresh=True)
+        
+        assert ranking_agent.rank_candidates.call_count == 2
+        assert all(r.overall_score == 90 for r in reports)
+        cached = score_cache.lookup([db.get_candidate(c) for c in candidate_ids], db.get_job(job_id))
+        assert all(r.overall_score == 90 for r in cached.values())
+
+
 class TestRankingWorkflow:
     """Tests for RankingWorkflow."""
     